@@ -0,0 +1,40 @@
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.db.mongodb import get_database
+from app.services.auth_tokens import token_signer, revocations, user_cache, InvalidToken
+
+bearer = HTTPBearer(auto_error=False)
+
+def unauthorized(detail):
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+async def token_claims(credentials: HTTPAuthorizationCredentials = Depends(bearer)):
+    """Claims of a valid, unrevoked bearer token; checked entirely in memory."""
+    if credentials is None:
+        raise unauthorized("Not authenticated")
+    try:
+        claims = token_signer.verify(credentials.credentials)
+    except InvalidToken as e:
+        raise unauthorized(str(e))
+    revocations.maybe_refresh(get_database())
+    if revocations.is_revoked(claims):
+        raise unauthorized("Token revoked")
+    return claims
+
+async def current_user(claims: dict = Depends(token_claims)):
+    """The token's user record; Mongo is only read on a user-cache miss."""
+    role, email = claims['role'], claims['sub']
+    user = user_cache.get(role, email)
+    if user is None:
+        collection = get_database()['admins' if role == 'admin' else 'students']
+        user = await collection.find_one({'email': email}, {'_id': 0, 'password': 0})
+        if user is None:
+            raise unauthorized("Account no longer exists")
+        user['role'] = role
+        user_cache.put(role, email, user)
+    return user
+
+async def require_admin(user: dict = Depends(current_user)):
+    if user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
@@ -1,25 +1,185 @@
-from fastapi import APIRouter
+import asyncio
+import base64
+import json
+import logging
+import re
+from typing import Optional
+from bson.objectid import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.api.deps import require_admin
 from app.db.mongodb import get_database
+from app.services.cohort_scoring import cohort_scorer, SCORE_FIELD
+from app.services.ml_service import ml_service
 
 router = APIRouter()
 
-@router.get("/admin/students")
-async def get_all_students():
-    db = get_database()
-    students = await db['students'].find({}, {'password': 0, '_id': 0}).sort('created_at', -1).to_list(None)
-    
-    formatted_students = []
-    for i, s in enumerate(students):
-        formatted_students.append({
-            "id": i + 1,
-            "name": s.get('full_name'),
-            "email": s.get('email'),
-            "dept": s.get('department'),
-            "idNumber": s.get('id_number'),
-            "joined": s.get('created_at', '').split('T')[0] if 'T' in s.get('created_at', '') else s.get('created_at'),
-            "tenth_percentage": s.get('tenth_percentage', ''),
-            "twelfth_percentage": s.get('twelfth_percentage', ''),
-            "college_cgpa": s.get('college_cgpa', ''),
-            "amcat_score": s.get('amcat_score', '')
-        })
-    return formatted_students
+# Sortable columns of the student table; each has a (field, _id) index in app/db/indexes.py
+STUDENT_SORTS = {
+    'created_at': 'created_at',
+    'name': 'full_name',
+    'college_cgpa': 'college_cgpa',
+    'amcat_score': 'amcat_score',
+    'tenth_percentage': 'tenth_percentage',
+    'twelfth_percentage': 'twelfth_percentage'
+}
+STUDENT_PROJECTION = {field: 1 for field in (
+    'full_name', 'email', 'department', 'id_number', 'created_at',
+    'tenth_percentage', 'twelfth_percentage', 'college_cgpa', 'amcat_score'
+)}
+
+def encode_cursor(value, last_id):
+    return base64.urlsafe_b64encode(json.dumps([value, str(last_id)]).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return value, ObjectId(last_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def after_cursor(field, direction, value, last_id):
+    """Filter for the rows after (value, last_id) in (field, _id) order.
+
+    Mongo sorts missing/null below every number and string, so nulls come first
+    ascending and last descending; a plain $gt/$lt never matches them.
+    """
+    id_op = '$gt' if direction == 1 else '$lt'
+    if value is None:
+        tie = {field: None, '_id': {id_op: last_id}}
+        return {'$or': [tie, {field: {'$ne': None}}]} if direction == 1 else tie
+    clauses = [{field: {id_op: value}}, {field: value, '_id': {id_op: last_id}}]
+    if direction == -1:
+        clauses.append({field: None})
+    return {'$or': clauses}
+
+def format_student(s):
+    created = s.get('created_at') or ''
+    return {
+        "id": str(s['_id']),
+        "name": s.get('full_name'),
+        "email": s.get('email'),
+        "dept": s.get('department'),
+        "idNumber": s.get('id_number'),
+        "joined": created.split('T')[0] if isinstance(created, str) and 'T' in created else created,
+        "tenth_percentage": s.get('tenth_percentage', ''),
+        "twelfth_percentage": s.get('twelfth_percentage', ''),
+        "college_cgpa": s.get('college_cgpa', ''),
+        "amcat_score": s.get('amcat_score', '')
+    }
+
+@router.get("/admin/students", dependencies=[Depends(require_admin)])
+async def get_all_students(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    sort: str = Query('created_at', pattern=f"^({'|'.join(STUDENT_SORTS)})$"),
+    order: str = Query('desc', pattern="^(asc|desc)$"),
+    dept: Optional[str] = None,
+    min_cgpa: Optional[float] = Query(None, ge=0, le=10),
+    max_cgpa: Optional[float] = Query(None, ge=0, le=10),
+    min_amcat: Optional[float] = Query(None, ge=0),
+    max_amcat: Optional[float] = Query(None, ge=0),
+    q: Optional[str] = Query(None, max_length=100)
+):
+    """One page of students in (sort, _id) order; pass back `next_cursor` for the next page.
+
+    `total` (matching students) is only computed for the first page.
+    """
+    field, direction = STUDENT_SORTS[sort], 1 if order == 'asc' else -1
+    conditions = []
+    if dept:
+        conditions.append({'department': dept})
+    for name, lo, hi in (('college_cgpa', min_cgpa, max_cgpa), ('amcat_score', min_amcat, max_amcat)):
+        bounds = {op: v for op, v in (('$gte', lo), ('$lte', hi)) if v is not None}
+        if bounds: conditions.append({name: bounds})
+    if q and q.strip():
+        # Anchored prefix match; case-insensitive, so Mongo walks the index rather than seeking in it
+        prefix = {'$regex': '^' + re.escape(q.strip()), '$options': 'i'}
+        conditions.append({'$or': [{'full_name': prefix}, {'email': prefix}]})
+    filters = {'$and': conditions} if conditions else {}
+
+    page_query = filters
+    if cursor:
+        page_query = {'$and': conditions + [after_cursor(field, direction, *decode_cursor(cursor))]}
+
+    students_coll = get_database()['students']
+    docs = await (students_coll.find(page_query, STUDENT_PROJECTION)
+                  .sort([(field, direction), ('_id', direction)])
+                  .limit(limit + 1).to_list(limit + 1))
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1].get(field), docs[-1]['_id'])
+
+    total = None
+    if not cursor:
+        # Unfiltered totals come from collection metadata instead of counting documents
+        total = await (students_coll.count_documents(filters) if filters else students_coll.estimated_document_count())
+    return {
+        "students": [format_student(s) for s in docs],
+        "next_cursor": next_cursor,
+        "total": total,
+        "limit": limit
+    }
+
+def _log_scoring_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"Cohort scoring failed: {task.exception()}")
+
+@router.post("/admin/predictions/score", status_code=202, dependencies=[Depends(require_admin)])
+async def score_students():
+    # Same job as score_students.py; runs in the background and reports through GET /admin/predictions
+    if cohort_scorer.running:
+        raise HTTPException(status_code=409, detail="Cohort scoring is already running")
+    if not ml_service.model:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    task = asyncio.create_task(cohort_scorer.run(get_database()))
+    task.add_done_callback(_log_scoring_failure)
+    return {"message": "Cohort scoring started"}
+
+@router.get("/admin/predictions", dependencies=[Depends(require_admin)])
+async def list_predictions(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    max_probability: Optional[float] = Query(None, ge=0, le=1)
+):
+    """Scored students in (probability, _id) order, lowest first by default: the at-risk list.
+
+    Paged like /admin/students: pass back `next_cursor`; `total` is only computed for the first page.
+    """
+    field, direction = f'{SCORE_FIELD}.probability', 1 if order == "asc" else -1
+    conditions = [{field: {'$exists': True}}]
+    if max_probability is not None:
+        conditions.append({field: {'$lte': max_probability}})
+    page_conditions = conditions
+    if cursor:
+        page_conditions = conditions + [after_cursor(field, direction, *decode_cursor(cursor))]
+
+    students_coll = get_database()['students']
+    projection = {'full_name': 1, 'email': 1, 'department': 1, 'id_number': 1, SCORE_FIELD: 1}
+    docs = await (students_coll.find({'$and': page_conditions}, projection)
+                  .sort([(field, direction), ('_id', direction)])
+                  .limit(limit + 1).to_list(limit + 1))
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1][SCORE_FIELD].get('probability'), docs[-1]['_id'])
+
+    return {
+        "students": [
+            {
+                "id": str(s['_id']),
+                "name": s.get('full_name'),
+                "email": s.get('email'),
+                "dept": s.get('department'),
+                "idNumber": s.get('id_number'),
+                **s[SCORE_FIELD]
+            }
+            for s in docs
+        ],
+        "next_cursor": next_cursor,
+        "total": None if cursor else await students_coll.count_documents({'$and': conditions}),
+        "limit": limit,
+        "running": cohort_scorer.running,
+        "last_run": cohort_scorer.last_run
+    }
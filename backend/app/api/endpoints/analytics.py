@@ -0,0 +1,31 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from app.db.mongodb import get_database
+from app.services.placement_store import placement_store
+from app.services.placement_cube import placement_analytics
+
+router = APIRouter()
+
+@router.get("/analytics/placements")
+async def query_placements(
+    years: Optional[List[str]] = Query(None),
+    year_from: Optional[str] = None,
+    year_to: Optional[str] = None,
+    branches: Optional[List[str]] = Query(None),
+    categories: Optional[List[str]] = Query(None),
+    min_salary: Optional[float] = None,
+    max_salary: Optional[float] = None,
+    group_by: Optional[List[str]] = Query(None),
+    histogram: bool = False
+):
+    # e.g. ?branches=E%26TC&categories=Group I&year_from=2022-23&year_to=2024-25&min_salary=10&group_by=academic_year
+    await placement_store.get(get_database())
+    try:
+        return placement_analytics.cube.query(
+            years=years, year_from=year_from, year_to=year_to,
+            branches=branches, categories=categories,
+            min_salary=min_salary, max_salary=max_salary,
+            group_by=group_by or (), histogram=histogram
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,25 +1,41 @@
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
+from pymongo.errors import DuplicateKeyError
 from app.schemas.auth import UserSignup, UserLogin, ChangePassword
 from app.db.mongodb import get_database
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.db.indexes import unique_enforced
+from app.api.deps import token_claims, require_admin
+from app.services.auth_tokens import token_signer, revocations, user_cache
+from app.services.password_hasher import password_hasher, HasherBusy
 import pandas as pd
 
 router = APIRouter()
 
+def busy(e: HasherBusy):
+    return HTTPException(status_code=503, detail="Server busy, please retry shortly.",
+                         headers={"Retry-After": str(e.retry_after)})
+
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def signup(user: UserSignup):
     db = get_database()
     students_coll = db['students']
     admins_coll = db['admins']
-    
-    # Check if email exists
-    if await students_coll.find_one({'email': user.email}) or await admins_coll.find_one({'email': user.email}):
+
+    # Student emails and ID numbers are unique indexes, so normally only the admin email needs a lookup.
+    # Fields whose unique index is missing are looked up too. The lookups run while the password hashes.
+    lookups = [admins_coll.find_one({'email': user.email}, {'_id': 1})]
+    if ('students', 'email') not in unique_enforced:
+        lookups.append(students_coll.find_one({'email': user.email}, {'_id': 1}))
+    try:
+        *found, hashed_password = await asyncio.gather(*lookups, password_hasher.hash(user.password))
+    except HasherBusy as e:
+        raise busy(e)
+    if any(found):
         raise HTTPException(status_code=400, detail="An account with this email already exists.")
-    
-    if await students_coll.find_one({'id_number': user.idNumber}):
+    if ('students', 'id_number') not in unique_enforced and user.idNumber and \
+            await students_coll.find_one({'id_number': user.idNumber}, {'_id': 1}):
         raise HTTPException(status_code=400, detail="The ID Number is already registered.")
-    
-    hashed_password = generate_password_hash(user.password)
+
     user_record = {
         "full_name": user.fullName,
         "email": user.email,
@@ -29,8 +45,12 @@ async def signup(user: UserSignup):
         "role": "student",
         "created_at": pd.Timestamp.now().isoformat()
     }
-    
-    await students_coll.insert_one(user_record)
+    try:
+        await students_coll.insert_one(user_record)
+    except DuplicateKeyError as e:
+        if 'id_number' in (e.details or {}).get('keyPattern', {}):
+            raise HTTPException(status_code=400, detail="The ID Number is already registered.")
+        raise HTTPException(status_code=400, detail="An account with this email already exists.")
     return {"message": "Success"}
 
 @router.post("/login")
@@ -39,16 +59,30 @@ async def login(credentials: UserLogin):
     collection = db['admins'] if credentials.role == 'admin' else db['students']
     
     user = await collection.find_one({'email': credentials.email})
-    
-    if not user or not check_password_hash(user['password'], credentials.password):
+    if not user:
+        raise HTTPException(status_code=401, detail=f"Invalid {credentials.role} credentials")
+    try:
+        ok, upgraded = await password_hasher.verify(user.get('password'), credentials.password)
+    except HasherBusy as e:
+        raise busy(e)
+    if not ok:
         raise HTTPException(status_code=401, detail=f"Invalid {credentials.role} credentials")
-        
+    if upgraded:
+        # Only swap the hash if nobody changed the password in the meantime
+        await collection.update_one({'_id': user['_id'], 'password': user['password']}, {'$set': {'password': upgraded}})
+
+    role = user.get('role', credentials.role)
+    token, claims = token_signer.issue(user['email'], role)
+
     return {
         "message": "Login successful",
+        "token": token,
+        "token_type": "bearer",
+        "expires_at": claims['exp'],
         "user": {
             "email": user['email'],
             "fullName": user.get('full_name'),
-            "role": user.get('role', credentials.role),
+            "role": role,
             "department": user.get('department'),
             "idNumber": user.get('id_number')
         }
@@ -60,9 +94,25 @@ async def change_password(data: ChangePassword):
     collection = db['admins'] if data.role == 'admin' else db['students']
     
     user = await collection.find_one({'email': data.email})
-    if not user or not check_password_hash(user['password'], data.currentPassword):
-        raise HTTPException(status_code=401, detail="Incorrect current password")
-    
-    hashed_password = generate_password_hash(data.newPassword)
+    try:
+        ok = user is not None and (await password_hasher.verify(user.get('password'), data.currentPassword))[0]
+        if not ok:
+            raise HTTPException(status_code=401, detail="Incorrect current password")
+        hashed_password = await password_hasher.hash(data.newPassword)
+    except HasherBusy as e:
+        raise busy(e)
     await collection.update_one({'email': data.email}, {'$set': {'password': hashed_password}})
-    return {"message": "Password changed successfully"}
+    # Sessions opened with the old password stop working; this one continues with a fresh token
+    await revocations.revoke_user(db, data.email)
+    user_cache.invalidate(data.email)
+    token, claims = token_signer.issue(data.email, user.get('role', data.role))
+    return {"message": "Password changed successfully", "token": token, "expires_at": claims['exp']}
+
+@router.post("/logout")
+async def logout(claims: dict = Depends(token_claims)):
+    await revocations.revoke_token(get_database(), claims)
+    return {"message": "Logged out"}
+
+@router.get("/auth/metrics", dependencies=[Depends(require_admin)])
+async def auth_metrics():
+    return {"hashing": password_hasher.stats(), "user_cache": user_cache.stats()}
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import StreamingResponse
+from app.api.deps import require_admin
 from app.services.chatbot_service import chatbot_service
 from app.db.mongodb import get_database
-import re
+from app.services.placement_store import placement_store
+from app.services.company_matcher import company_matcher
+from app.services.chat_cache import chat_cache
+from app.services.chat_coalescer import chat_coalescer
+from app.services.chat_admission import chat_admission, ChatRejected
+from app.services.retrieval_index import retrieval_index, estimate_tokens
+from app.services.chat_intent import parse_intent, intent_context
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -13,28 +21,55 @@ async def chat(request: Request):
     if not query:
         raise HTTPException(status_code=400, detail="No query provided")
 
-    db = get_database()
-    collection = db['placement_records']
+    table = await placement_store.get(get_database())
     
-    # Retrieval logic (simplified for now, matching Flask)
-    # In a real app, this should be in a separate repository/service
-    query_lower = query.lower()
-    companies = await collection.distinct("company_name")
-    
-    found_companies = [c for c in companies if re.search(rf"\b{re.escape(c.lower())}\b", query_lower)]
-    found_years = re.findall(r"20\d{2}", query)
-    
-    context_parts = []
-    if found_companies:
-        docs = await collection.find({"company_name": {"$in": found_companies}}).sort("academic_year", -1).to_list(10)
-        for d in docs:
-            hires = d['selections']['CE'] + d['selections']['IT'] + d['selections']['E&TC']
-            context_parts.append(f"Company: {d['company_name']} ({d['academic_year']}) | Salary: {d['salary_lpa']} LPA | Total Hired: {hires}")
+    # Years, branches, salary bounds and superlatives become one exact aggregation over the table;
+    # retrieval fills whatever is left of the token budget with the closest records and write-ups
+    found_companies = company_matcher.find(query)
+    intent = parse_intent(query, table.years, found_companies)
+    context_parts = intent_context(table, intent) if intent.structured else []
+    budget = settings.RETRIEVAL_TOKEN_BUDGET - sum(estimate_tokens(p) for p in context_parts)
+    context_parts += retrieval_index.context(query, boost_terms=found_companies, token_budget=budget)
     
     context_string = "\n".join(context_parts) if context_parts else "PICT has excellent placements with top recruiters."
     
+    cache_key = chat_cache.key(query, context_string)
+    cached = chat_cache.get(cache_key)
+    if cached is not None:
+        stream, source = chat_cache.replay(cached), "HIT"
+    elif chat_coalescer.in_flight(cache_key):
+        # Identical questions arriving together share one Gemini stream
+        stream, _ = chat_coalescer.subscribe(cache_key, None)
+        source = "COALESCED"
+    else:
+        # Only a new upstream stream needs a slot; hits and joiners above never queue
+        user = str(data.get('user') or (request.client.host if request.client else 'anonymous'))
+        try:
+            granted_at = await chat_admission.acquire(user)
+        except ChatRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.reason, headers={"Retry-After": str(e.retry_after)})
+        stream, joined = chat_coalescer.subscribe(
+            cache_key,
+            lambda: chatbot_service.get_chat_response_stream(query, context_string),
+            on_done=lambda: chat_admission.release(granted_at)
+        )
+        if joined:
+            # Someone else started the same answer while this request was queued
+            chat_admission.release(granted_at)
+        source = "COALESCED" if joined else "MISS"
+    
     return StreamingResponse(
-        chatbot_service.get_chat_response_stream(query, context_string),
-        media_type="text/plain"
+        stream,
+        media_type="text/plain",
+        headers={"X-Cache": source}
     )
     # Note: Flask had some headers like X-Accel-Buffering, which can be added if needed via custom response
+
+@router.get("/chat/metrics", dependencies=[Depends(require_admin)])
+async def chat_metrics():
+    return {
+        "active_streams": chatbot_service.active_streams,
+        "cache": chat_cache.stats(),
+        "coalescing": chat_coalescer.stats(),
+        "admission": chat_admission.stats()
+    }
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Request, Query
 from app.db.mongodb import get_database
 from bson.objectid import ObjectId
+from app.services.retrieval_index import retrieval_index, experience_doc, feedback_doc
 import pandas as pd
 
 router = APIRouter()
@@ -20,6 +21,7 @@ async def add_interview_experience(request: Request):
         "date": pd.Timestamp.now().isoformat()
     }
     result = await db['interview_experience'].insert_one(experience_record)
+    retrieval_index.add(experience_doc(experience_record))
     return {"message": "Experience added successfully", "id": str(result.inserted_id)}
 
 @router.get("/interview-experience")
@@ -45,6 +47,7 @@ async def add_company_feedback(request: Request):
         "date": data.get('date') or pd.Timestamp.now().isoformat()
     }
     result = await db['company_feedback'].insert_one(feedback_record)
+    retrieval_index.add(feedback_doc(feedback_record))
     return {"message": "Feedback published successfully", "id": str(result.inserted_id)}
 
 @router.get("/company-feedback")
@@ -1,12 +1,70 @@
-from fastapi import APIRouter, HTTPException, Request
-from app.services.ml_service import ml_service
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.api.deps import require_admin
+from app.core.config import settings
+from app.services import model_registry
+from app.services.ml_service import ml_service, FeatureValidationError
+from app.services.inference_batcher import inference_batcher
 
 router = APIRouter()
 
 @router.post("/predict_placement")
 async def predict_placement(request: Request):
     data = await request.json()
-    result = ml_service.predict(data)
+    ml_service.check_for_new_version()
+    try:
+        result = await inference_batcher.predict(data)
+    except FeatureValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
     if result is None:
         raise HTTPException(status_code=500, detail="Model not loaded")
     return result
+
+@router.post("/predict_placement/batch", dependencies=[Depends(require_admin)])
+async def predict_placement_batch(request: Request):
+    # Accepts a bare list of feature dicts or {"students": [...]}; results come back in input order
+    data = await request.json()
+    students = data.get('students') if isinstance(data, dict) else data
+    if not isinstance(students, list) or not students:
+        raise HTTPException(status_code=400, detail="Provide a non-empty list of students")
+    if len(students) > settings.ML_BATCH_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.ML_BATCH_MAX_ROWS} students per batch")
+    ml_service.check_for_new_version()
+    try:
+        results = await inference_batcher.predict_batch(students)
+    except FeatureValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    if results is None:
+        raise HTTPException(status_code=500, detail="Model not loaded")
+    # Echo caller-supplied identifiers so rows can be matched up without relying on position alone
+    for student, result in zip(students, results):
+        for key in ('id', 'email', 'id_number'):
+            if key in student: result[key] = student[key]
+    return {"count": len(results), "results": results}
+
+@router.get("/predict_placement/metrics", dependencies=[Depends(require_admin)])
+async def predict_placement_metrics():
+    return {**inference_batcher.stats(), "cache": ml_service.cache.stats()}
+
+@router.get("/admin/models", dependencies=[Depends(require_admin)])
+async def list_models():
+    return {"active": ml_service.version, "versions": model_registry.list_versions()}
+
+@router.post("/admin/models/activate", dependencies=[Depends(require_admin)])
+async def activate_model(request: Request):
+    # Swaps this worker right away; other workers follow within ML_MODEL_CHECK_SECONDS
+    data = await request.json()
+    version = data.get('version')
+    if not model_registry.is_version(version) or version not in {m['version'] for m in model_registry.list_versions()}:
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version!r}")
+    # Load here first, so CURRENT never points other workers at a model that cannot load
+    if not await asyncio.to_thread(ml_service.load_model, version):
+        raise HTTPException(status_code=500, detail=f"Model {version} could not be loaded")
+    model_registry.activate(version)
+    return {"message": "Model activated", "version": ml_service.version}
+
+@router.post("/admin/models/reload", dependencies=[Depends(require_admin)])
+async def reload_model():
+    if not await asyncio.to_thread(ml_service.load_model):
+        raise HTTPException(status_code=500, detail="Model could not be loaded")
+    return {"message": "Model reloaded", "version": ml_service.version}
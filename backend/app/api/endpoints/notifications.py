@@ -1,11 +1,12 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.api.deps import require_admin
 from app.db.mongodb import get_database
 from bson.objectid import ObjectId
 import datetime
 
 router = APIRouter()
 
-@router.post("/admin/broadcast", status_code=201)
+@router.post("/admin/broadcast", status_code=201, dependencies=[Depends(require_admin)])
 async def broadcast_notification(request: Request):
     data = await request.json()
     message = data.get('message')
@@ -40,7 +41,7 @@ async def get_all_notifications():
         n['_id'] = str(n['_id'])
     return notifications
 
-@router.put("/notifications/{id}")
+@router.put("/notifications/{id}", dependencies=[Depends(require_admin)])
 async def update_notification(id: str, request: Request):
     data = await request.json()
     message = data.get('message')
@@ -52,7 +53,7 @@ async def update_notification(id: str, request: Request):
         raise HTTPException(status_code=404, detail="Notification not found")
     return {"message": "Notification updated successfully"}
 
-@router.delete("/notifications/{id}")
+@router.delete("/notifications/{id}", dependencies=[Depends(require_admin)])
 async def delete_notification(id: str):
     db = get_database()
     result = await db['notifications'].delete_one({'_id': ObjectId(id)})
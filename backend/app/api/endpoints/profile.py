@@ -1,14 +1,23 @@
-from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.schemas.auth import ProfileUpdate
 from app.db.mongodb import get_database
+from app.api.deps import current_user
+from app.services.auth_tokens import user_cache
 
 router = APIRouter()
 
+def profile_email(user, email):
+    # Students may only touch their own profile; admins may name any student
+    if email and email != user['email'] and user['role'] != 'admin':
+        raise HTTPException(status_code=403, detail="You can only access your own profile")
+    return email or user['email']
+
 @router.get("/profile")
-async def get_profile(email: str = Query(...)):
+async def get_profile(email: Optional[str] = Query(None), user: dict = Depends(current_user)):
     db = get_database()
     student = await db['students'].find_one(
-        {'email': email},
+        {'email': profile_email(user, email)},
         {'_id': 0, 'tenth_percentage': 1, 'twelfth_percentage': 1, 'college_cgpa': 1, 'amcat_score': 1}
     )
     if not student:
@@ -16,14 +25,16 @@ async def get_profile(email: str = Query(...)):
     return student
 
 @router.put("/profile")
-async def update_profile(data: ProfileUpdate):
+async def update_profile(data: ProfileUpdate, user: dict = Depends(current_user)):
+    email = profile_email(user, data.email)
     db = get_database()
     update_fields = {k: v for k, v in data.dict(exclude={'email'}).items() if v is not None}
     
     if not update_fields:
         raise HTTPException(status_code=400, detail="No valid fields to update")
         
-    result = await db['students'].update_one({'email': data.email}, {'$set': update_fields})
+    result = await db['students'].update_one({'email': email}, {'$set': update_fields})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Student not found")
+    user_cache.invalidate(email)
     return {"message": "Profile updated successfully"}
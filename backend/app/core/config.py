@@ -18,7 +18,67 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "SAARTHI NEXUS API"
     MONGODB_URL: str = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
     DATABASE_NAME: str = "saarthi_nexus"
+    # Create the indexes declared in app/db/indexes.py on startup (check them with check_indexes.py)
+    DB_ENSURE_INDEXES: bool = True
     GEMINI_API_KEY: str = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY") or ""
     PORT: int = int(os.environ.get("PORT", 5000))
+    # HMAC key for access tokens. Without it, workers share a key generated once into AUTH_SECRET_FILE,
+    # which only covers one host: set it whenever the API runs on more than one machine
+    AUTH_SECRET_KEY: str = os.getenv("AUTH_SECRET_KEY", "")
+    AUTH_SECRET_FILE: str = os.path.join(os.path.dirname(BASE_DIR), '.auth_secret')
+    AUTH_TOKEN_TTL_SECONDS: int = 12 * 3600
+    # Verified users are served from memory for this long; revocations are re-read from Mongo this often
+    AUTH_USER_CACHE_TTL_SECONDS: int = 300
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_REVOCATION_CHECK_SECONDS: int = 30
+    # werkzeug hash method for new and upgraded passwords (e.g. "scrypt", "pbkdf2:sha256:1000000")
+    PASSWORD_HASH_METHOD: str = "scrypt"
+    # Hashes run on this many threads (hashlib releases the GIL); beyond the queue limit logins get a 503
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    PASSWORD_HASH_MAX_QUEUED: int = 64
+    # How often a worker checks whether placement records were rewritten elsewhere (ingest scripts, other workers)
+    PLACEMENT_VERSION_CHECK_SECONDS: int = 30
+    # "gemini", or "simulator" for offline benchmarks (deterministic text, tunable latency and failures)
+    CHAT_BACKEND: str = os.getenv("CHAT_BACKEND", "gemini")
+    CHAT_SIM_TTFT_MS: int = 300
+    CHAT_SIM_TOKEN_DELAY_MS: int = 30
+    CHAT_SIM_TOKENS: int = 80
+    CHAT_SIM_FAILURE_RATE: float = 0.0
+    CHAT_SIM_SEED: int = 0
+    # Pin a Gemini model (e.g. "gemini-1.5-flash") to skip discovery; otherwise the pick is cached on disk
+    GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "")
+    GEMINI_MODEL_CACHE_FILE: str = os.path.join(os.path.dirname(BASE_DIR), '.gemini_model.json')
+    GEMINI_MODEL_CACHE_TTL_SECONDS: int = 86400
+    CHAT_MAX_CONCURRENT_STREAMS: int = 8
+    CHAT_STREAM_TIMEOUT_SECONDS: int = 60
+    # Chats beyond the stream cap wait this long at most (per-user round-robin) before a 503
+    CHAT_QUEUE_MAX_WAITING: int = 32
+    CHAT_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    CHAT_QUEUE_MAX_PER_USER: int = 2
+    CHAT_CACHE_MAX_ENTRIES: int = 512
+    CHAT_CACHE_TTL_SECONDS: int = 3600
+    CHAT_CACHE_REPLAY_CHUNK_CHARS: int = 64
+    ML_REGISTRY_DIR: str = os.path.join(os.path.dirname(BASE_DIR), 'model', 'registry')
+    # How often a worker checks the registry's CURRENT pointer for a newly activated model
+    ML_MODEL_CHECK_SECONDS: int = 30
+    # Serve predictions from a flattened copy of the forest (checked against sklearn at load)
+    ML_COMPILED_FOREST: bool = True
+    ML_COMPILED_MAX_ROWS: int = 256
+    ML_BATCH_MAX_ROWS: int = 5000
+    # Concurrent /predict_placement calls are scored together: up to this many rows, or after this long
+    ML_BATCH_MAX_SIZE: int = 32
+    ML_BATCH_MAX_WAIT_MS: float = 5.0
+    ML_INFERENCE_WORKERS: int = 1
+    # Repeat /predict_placement inputs are answered from an LRU keyed on the rounded features and model version
+    ML_PREDICT_CACHE_SIZE: int = 4096
+    ML_FEATURE_DECIMALS: int = 2
+    # Students read, scored and written back per step of the cohort scoring job
+    COHORT_SCORING_BATCH_SIZE: int = 1000
+    RETRIEVAL_INDEX_DIR: str = os.path.join(os.path.dirname(BASE_DIR), 'retrieval_index')
+    RETRIEVAL_TOP_K: int = 8
+    RETRIEVAL_TOKEN_BUDGET: int = 600
+    # Optional sentence-transformers model name; empty keeps retrieval BM25-only
+    RETRIEVAL_EMBEDDING_MODEL: str = ""
+    RETRIEVAL_VECTOR_WEIGHT: float = 0.5
 
 settings = Settings()
@@ -0,0 +1,119 @@
+import datetime
+import logging
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+# Every index the API relies on, per collection. create_indexes is a no-op for
+# indexes that already exist, so this runs on every startup.
+INDEXES = {
+    'students': [
+        IndexModel([('email', ASCENDING)], name='email_unique', unique=True),
+        # Sparse: older seeded students have no id_number and must not collide on null
+        IndexModel([('id_number', ASCENDING)], name='id_number_unique', unique=True, sparse=True),
+        # Keyset pagination of /admin/students: one (sort field, _id) index per sortable column
+        IndexModel([('created_at', DESCENDING), ('_id', DESCENDING)], name='created_at_id'),
+        IndexModel([('department', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)], name='department_created_at_id'),
+        IndexModel([('full_name', ASCENDING), ('_id', ASCENDING)], name='full_name_id'),
+        IndexModel([('college_cgpa', ASCENDING), ('_id', ASCENDING)], name='college_cgpa_id'),
+        IndexModel([('amcat_score', ASCENDING), ('_id', ASCENDING)], name='amcat_score_id'),
+        IndexModel([('tenth_percentage', ASCENDING), ('_id', ASCENDING)], name='tenth_percentage_id'),
+        IndexModel([('twelfth_percentage', ASCENDING), ('_id', ASCENDING)], name='twelfth_percentage_id'),
+        IndexModel([('placement_score.probability', ASCENDING), ('_id', ASCENDING)], name='placement_score_id'),
+    ],
+    'admins': [
+        IndexModel([('email', ASCENDING)], name='email_unique', unique=True),
+    ],
+    'placement_records': [
+        IndexModel([('company_name', ASCENDING)], name='company_name'),
+        IndexModel([('academic_year', ASCENDING)], name='academic_year'),
+    ],
+    'notifications': [
+        IndexModel([('created_at', DESCENDING)], name='created_at'),
+    ],
+    'interview_experience': [
+        IndexModel([('company_name', ASCENDING), ('date', DESCENDING)], name='company_name_date'),
+        IndexModel([('date', DESCENDING)], name='date'),
+    ],
+    'company_feedback': [
+        IndexModel([('date', DESCENDING)], name='date'),
+    ],
+    'revoked_tokens': [
+        # Mongo drops revocations once the tokens they cover have expired anyway
+        IndexModel([('expires_at', ASCENDING)], name='expires_at_ttl', expireAfterSeconds=0),
+    ],
+}
+
+# The filter/sort shape of each hot query, for check_indexes.py. Whole-collection
+# loads (placement_store, retrieval index rebuilds) are deliberate scans and not listed.
+QUERY_SHAPES = [
+    ("login / signup / profile", 'students', {'email': 'x@example.edu'}, None),
+    ("signup id number", 'students', {'id_number': 'X'}, None),
+    ("admin students", 'students', {}, [('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ("admin students by department", 'students', {'department': 'CS'}, [('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ("admin students by CGPA", 'students', {'college_cgpa': {'$gte': 7.0}}, [('college_cgpa', ASCENDING), ('_id', ASCENDING)]),
+    ("admin students next page", 'students',
+     {'$or': [{'amcat_score': {'$lt': 70}}, {'amcat_score': 70, '_id': {'$lt': ObjectId('0' * 24)}}, {'amcat_score': None}]},
+     [('amcat_score', DESCENDING), ('_id', DESCENDING)]),
+    ("admin students by name", 'students', {'full_name': {'$regex': '^ab', '$options': 'i'}}, [('full_name', ASCENDING), ('_id', ASCENDING)]),
+    ("admin at-risk list", 'students', {'placement_score.probability': {'$exists': True}},
+     [('placement_score.probability', ASCENDING), ('_id', ASCENDING)]),
+    ("admin login", 'admins', {'email': 'x@example.edu'}, None),
+    ("stats rebuild by year", 'placement_records', {'academic_year': {'$in': ['2024-25']}}, None),
+    ("placements by company", 'placement_records', {'company_name': 'X'}, None),
+    ("notifications", 'notifications', {}, [('created_at', DESCENDING)]),
+    ("experiences", 'interview_experience', {}, [('date', DESCENDING)]),
+    ("experiences by company", 'interview_experience', {'company_name': 'X'}, [('date', DESCENDING)]),
+    ("company feedback", 'company_feedback', {}, [('date', DESCENDING)]),
+    ("token revocations", 'revoked_tokens', {'expires_at': {'$gt': datetime.datetime(2000, 1, 1)}}, None),
+]
+
+# Uniqueness that signup relies on, as (collection, field) -> index name in INDEXES
+UNIQUE_FIELDS = {
+    ('students', 'email'): 'email_unique',
+    ('students', 'id_number'): 'id_number_unique',
+}
+# The UNIQUE_FIELDS an index actually enforces on this database, filled in by check_unique_indexes
+unique_enforced = set()
+
+async def ensure_indexes(db):
+    """Creates any missing indexes, one at a time, so a failure (e.g. duplicate emails
+    blocking a unique index) costs only that index and not the rest of its collection."""
+    created = {}
+    for collection, models in INDEXES.items():
+        # Unique indexes first: they guard signup, the others only speed up reads
+        for model in sorted(models, key=lambda m: not m.document.get('unique')):
+            try:
+                created.setdefault(collection, []).extend(await db[collection].create_indexes([model]))
+            except OperationFailure as e:
+                logging.error(f"Could not create index {model.document['name']} on {collection}: {e}")
+    return created
+
+async def check_unique_indexes(db):
+    """Records which UNIQUE_FIELDS are backed by a unique index and returns the ones that are not.
+
+    Signup looks the missing ones up before inserting, so duplicates are still refused
+    when DB_ENSURE_INDEXES is off or an index could not be built.
+    """
+    unique_enforced.clear()
+    for collection in {c for c, _ in UNIQUE_FIELDS}:
+        info = await db[collection].index_information()
+        for (c, field), name in UNIQUE_FIELDS.items():
+            if c == collection and info.get(name, {}).get('unique'):
+                unique_enforced.add((c, field))
+    missing = [f"{c}.{field}" for c, field in UNIQUE_FIELDS if (c, field) not in unique_enforced]
+    if missing:
+        logging.error(f"No unique index on {', '.join(missing)}; signup checks these with lookups "
+                      "until the duplicates are removed and the indexes are created")
+    return missing
+
+def plan_stages(plan):
+    """Every stage name in an explain() plan tree, whichever explain format the server uses."""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
@@ -1,5 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.db.indexes import ensure_indexes, check_unique_indexes
 import logging
 
 class Database:
@@ -16,6 +17,16 @@ async def connect_to_mongo():
         logging.info("Connected to MongoDB")
     except Exception as e:
         logging.error(f"Could not connect to MongoDB: {e}")
+        return
+    if settings.DB_ENSURE_INDEXES:
+        try:
+            await ensure_indexes(db.db)
+        except Exception as e:
+            logging.error(f"Could not ensure indexes: {e}")
+    try:
+        await check_unique_indexes(db.db)
+    except Exception as e:
+        logging.error(f"Could not check unique indexes: {e}")
 
 async def close_mongo_connection():
     db.client.close()
@@ -2,7 +2,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router
 from app.core.config import settings
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_database
+from app.services.placement_store import placement_store
+from app.services.retrieval_index import retrieval_index
+from app.services.chatbot_service import chatbot_service
+from app.services.ml_service import ml_service
+from app.services.auth_tokens import revocations
+import asyncio
+import logging
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -13,11 +20,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "X-Cache"],
 )
 
 @app.on_event("startup")
 async def startup_db_client():
+    # Model discovery talks to the provider, so it runs in the background instead of holding up startup
+    app.state.chat_init = asyncio.create_task(chatbot_service.ensure_ready())
     await connect_to_mongo()
+    try:
+        await placement_store.load(get_database())
+    except Exception as e:
+        logging.error(f"Could not load placement records: {e}")
+    try:
+        await retrieval_index.load_or_build(get_database())
+    except Exception as e:
+        logging.error(f"Could not load retrieval index: {e}")
+    try:
+        await revocations.refresh(get_database())
+    except Exception as e:
+        logging.error(f"Could not load token revocations: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
@@ -28,7 +50,20 @@ app.include_router(api_router, prefix="/api")
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "chat": {
+            "backend": chatbot_service.backend.name,
+            "status": chatbot_service.status,
+            "ready": chatbot_service.ready,
+            "model": chatbot_service.model_name
+        },
+        "model": {
+            "version": ml_service.version,
+            "loaded": ml_service.model is not None,
+            "compiled": ml_service.compiled is not None
+        }
+    }
 
 @app.get("/")
 async def root():
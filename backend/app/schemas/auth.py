@@ -20,7 +20,7 @@ class ChangePassword(BaseModel):
     role: str = "student"
 
 class ProfileUpdate(BaseModel):
-    email: str
+    email: Optional[str] = None
     tenth_percentage: Optional[float] = Field(None, ge=0, le=100)
     twelfth_percentage: Optional[float] = Field(None, ge=0, le=100)
     college_cgpa: Optional[float] = Field(None, ge=0, le=10)
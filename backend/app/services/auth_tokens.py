@@ -0,0 +1,190 @@
+import asyncio
+import base64
+import datetime
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from app.core.config import settings
+
+REVOCATIONS = 'revoked_tokens'
+
+class InvalidToken(Exception):
+    pass
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def shared_secret(path):
+    """The key stored in `path`, generated by whichever worker gets there first.
+
+    The key is written to a temporary file and hard-linked into place, so workers
+    racing at startup all end up reading the same complete key.
+    """
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp)
+    with open(path) as f:
+        secret = f.read().strip()
+    if not secret:
+        raise RuntimeError(f"{path} is empty; delete it or set AUTH_SECRET_KEY")
+    return secret
+
+class TokenSigner:
+    """Stateless access tokens: base64url(JSON claims) + "." + base64url(HMAC-SHA256 of that part).
+
+    Verifying is one HMAC and a JSON parse, so no database is involved. Claims
+    are sub (email), role, iat, exp and jti (a random id used for revocation).
+    """
+
+    def __init__(self, secret, ttl_seconds, secret_file=None):
+        if not secret:
+            if not secret_file:
+                raise RuntimeError("AUTH_SECRET_KEY is not set")
+            # Never a per-process key: a token issued by one worker would be rejected by the others
+            secret = shared_secret(secret_file)
+            logging.warning(f"AUTH_SECRET_KEY is not set; using the key in {secret_file}, shared by workers on this host only")
+        self._key = secret.encode('utf-8')
+        self.ttl_seconds = ttl_seconds
+
+    def _sign(self, payload):
+        return _b64encode(hmac.new(self._key, payload.encode('ascii'), hashlib.sha256).digest())
+
+    def issue(self, email, role):
+        now = int(time.time())
+        claims = {"sub": email, "role": role, "iat": now, "exp": now + self.ttl_seconds, "jti": secrets.token_urlsafe(12)}
+        payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode('utf-8'))
+        return f"{payload}.{self._sign(payload)}", claims
+
+    def verify(self, token):
+        payload, _, signature = token.partition('.')
+        try:
+            if not signature or not hmac.compare_digest(signature.encode('ascii'), self._sign(payload).encode('ascii')):
+                raise InvalidToken("Invalid token signature")
+            claims = json.loads(_b64decode(payload))
+        except ValueError:  # UnicodeError, binascii.Error and JSONDecodeError are all ValueErrors
+            raise InvalidToken("Malformed token")
+        if not isinstance(claims, dict):
+            raise InvalidToken("Malformed token")
+        if claims.get('exp', 0) < time.time():
+            raise InvalidToken("Token expired")
+        return claims
+
+class RevocationList:
+    """Revoked token ids and per-user "not before" times, held in memory.
+
+    Revocations are written to Mongo so every worker sees them; each worker
+    re-reads the (small) collection at most every `check_seconds`, in the
+    background, so checking a token never waits on the database.
+    """
+
+    def __init__(self, check_seconds):
+        self.check_seconds = check_seconds
+        self._jtis = {}          # jti -> exp
+        self._not_before = {}    # email -> issued-at cutoff
+        self._last_checked = 0.0
+        self._refresh_task = None
+
+    def is_revoked(self, claims):
+        return claims.get('jti') in self._jtis or claims.get('iat', 0) < self._not_before.get(claims.get('sub'), 0)
+
+    async def revoke_token(self, db, claims):
+        self._jtis[claims['jti']] = claims['exp']
+        await db[REVOCATIONS].update_one(
+            {'_id': claims['jti']},
+            {'$set': {'kind': 'token', 'email': claims['sub'],
+                      'expires_at': datetime.datetime.fromtimestamp(claims['exp'], datetime.timezone.utc)}},
+            upsert=True
+        )
+
+    async def revoke_user(self, db, email):
+        """Invalidates every token issued to `email` before now (e.g. after a password change)."""
+        cutoff = int(time.time())
+        self._not_before[email] = cutoff
+        await db[REVOCATIONS].update_one(
+            {'_id': f"user:{email}"},
+            {'$set': {'kind': 'user', 'email': email, 'not_before': cutoff,
+                      'expires_at': datetime.datetime.fromtimestamp(cutoff + settings.AUTH_TOKEN_TTL_SECONDS, datetime.timezone.utc)}},
+            upsert=True
+        )
+        return cutoff
+
+    async def refresh(self, db):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        jtis, not_before = {}, {}
+        async for doc in db[REVOCATIONS].find({'expires_at': {'$gt': now}}):
+            if doc.get('kind') == 'user':
+                not_before[doc['email']] = doc['not_before']
+            else:
+                jtis[doc['_id']] = doc['expires_at']
+        self._jtis, self._not_before = jtis, not_before
+
+    def maybe_refresh(self, db):
+        now = time.monotonic()
+        if now - self._last_checked < self.check_seconds or db is None: return
+        self._last_checked = now
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._safe_refresh(db))
+
+    async def _safe_refresh(self, db):
+        try:
+            await self.refresh(db)
+        except Exception as e:
+            logging.error(f"Could not refresh token revocations: {e}")
+
+class UserCache:
+    """LRU + TTL cache of user records (without password) for verified tokens, keyed on (role, email)."""
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, role, email):
+        entry = self._entries.get((role, email))
+        if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((role, email))
+        self.hits += 1
+        return entry[0]
+
+    def put(self, role, email, user):
+        self._entries[(role, email)] = (user, time.monotonic())
+        self._entries.move_to_end((role, email))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, email):
+        for key in [k for k in self._entries if k[1] == email]:
+            del self._entries[key]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+token_signer = TokenSigner(settings.AUTH_SECRET_KEY, settings.AUTH_TOKEN_TTL_SECONDS, settings.AUTH_SECRET_FILE)
+revocations = RevocationList(settings.AUTH_REVOCATION_CHECK_SECONDS)
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL_SECONDS)
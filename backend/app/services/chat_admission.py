@@ -0,0 +1,123 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from app.core.config import settings
+
+class ChatRejected(Exception):
+    """Raised when a chat cannot start in time; carries the HTTP status and a Retry-After hint."""
+
+    def __init__(self, status_code, reason, retry_after):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+class ChatAdmission:
+    """Admission control for new Gemini streams.
+
+    At most `max_active` streams run at once. Others wait in a short queue for at
+    most `max_wait` seconds. Waiters are grouped per user and served round-robin,
+    so one student resending a question cannot crowd out everyone else. Anything
+    that cannot start in time is shed straight away with a Retry-After hint.
+    """
+
+    def __init__(self, max_active, max_waiting, max_wait, max_per_user):
+        self.max_active = max_active
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self.max_per_user = max_per_user
+        self.active = 0
+        self._queues = OrderedDict()   # user -> deque of waiter futures, in round-robin order
+        self._waiting = 0
+        self._avg_hold = 5.0           # EWMA of stream duration, for Retry-After
+        self._waits = deque(maxlen=1000)
+        self.admitted = 0
+        self.shed = {"queue_full": 0, "timeout": 0, "per_user": 0}
+
+    def _retry_after(self):
+        backlog = self._waiting + 1
+        return max(1, min(60, math.ceil(self._avg_hold * backlog / self.max_active)))
+
+    def _reject(self, kind, status_code, reason):
+        self.shed[kind] += 1
+        raise ChatRejected(status_code, reason, self._retry_after())
+
+    def _remove(self, user, fut):
+        queue = self._queues.get(user)
+        if queue is None or fut not in queue: return
+        queue.remove(fut)
+        self._waiting -= 1
+        if not queue: del self._queues[user]
+
+    async def acquire(self, user):
+        """Waits for a stream slot; returns the time it was granted (pass it to release)."""
+        start = time.monotonic()
+        if self.active < self.max_active and not self._waiting:
+            self.active += 1
+            self.admitted += 1
+            self._waits.append(0.0)
+            return start
+        if len(self._queues.get(user, ())) >= self.max_per_user:
+            self._reject("per_user", 429, "You already have chats waiting; please wait for them to finish.")
+        if self._waiting >= self.max_waiting:
+            self._reject("queue_full", 503, "Saarthi is busy right now; please try again shortly.")
+
+        fut = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(user, deque()).append(fut)
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self._remove(user, fut)
+            if fut.done() and not fut.cancelled():
+                self.release(time.monotonic())  # granted at the last moment; hand it on
+            self._reject("timeout", 503, "Saarthi is busy right now; please try again shortly.")
+        except asyncio.CancelledError:
+            # Client went away while queued
+            self._remove(user, fut)
+            if fut.done() and not fut.cancelled():
+                self.release(time.monotonic())
+            raise
+        granted = time.monotonic()
+        self.admitted += 1
+        self._waits.append(granted - start)
+        return granted
+
+    def release(self, granted_at=None):
+        if granted_at is not None:
+            self._avg_hold = 0.9 * self._avg_hold + 0.1 * (time.monotonic() - granted_at)
+        self.active -= 1
+        while self.active < self.max_active and self._queues:
+            # Next user in turn gets one slot, then moves to the back of the line
+            user, queue = next(iter(self._queues.items()))
+            fut = queue.popleft()
+            self._waiting -= 1
+            if queue:
+                self._queues.move_to_end(user)
+            else:
+                del self._queues[user]
+            if fut.done(): continue
+            self.active += 1
+            fut.set_result(True)
+
+    def stats(self):
+        waits = sorted(self._waits)
+        pct = lambda p: round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 1) if waits else 0.0
+        return {
+            "active": self.active,
+            "max_active": self.max_active,
+            "queue_depth": self._waiting,
+            "queued_users": len(self._queues),
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "wait_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+            "avg_stream_seconds": round(self._avg_hold, 2)
+        }
+
+chat_admission = ChatAdmission(
+    settings.CHAT_MAX_CONCURRENT_STREAMS,
+    settings.CHAT_QUEUE_MAX_WAITING,
+    settings.CHAT_QUEUE_TIMEOUT_SECONDS,
+    settings.CHAT_QUEUE_MAX_PER_USER
+)
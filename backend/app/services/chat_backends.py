@@ -0,0 +1,161 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from app.core.config import settings
+
+class ChatBackend:
+    """Something that turns a prompt into a stream of text chunks.
+
+    `stream(prompt)` is a blocking iterator; ChatbotService drains it on a worker
+    thread, so implementations are free to block between chunks.
+    """
+
+    name = "base"
+    model_name = None
+
+    @property
+    def ready(self):
+        return True
+
+    @property
+    def status(self):
+        return "ready" if self.ready else "pending"
+
+    async def ensure_ready(self):
+        return self.ready
+
+    def stream(self, prompt):
+        raise NotImplementedError
+
+class GeminiBackend(ChatBackend):
+    name = "gemini"
+    PREFERRED_MODELS = ['models/gemini-1.5-flash', 'models/gemini-1.5-pro', 'models/gemini-pro']
+    RETRY_AFTER_SECONDS = 60
+
+    def __init__(self):
+        self.model_gen = None
+        self.model_name = None
+        self._status = "pending" if settings.GEMINI_API_KEY else "not_configured"
+        self._init_lock = threading.Lock()
+        self._last_attempt = None
+
+    @property
+    def ready(self):
+        return self.model_gen is not None
+
+    @property
+    def status(self):
+        # not_configured | pending | ready | error; reported by /health
+        return self._status
+
+    def _cached_model(self):
+        try:
+            with open(settings.GEMINI_MODEL_CACHE_FILE) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - cached.get('chosen_at', 0) > settings.GEMINI_MODEL_CACHE_TTL_SECONDS: return None
+        return cached.get('model')
+
+    def _discover_model(self):
+        import google.generativeai as genai
+        available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+        chosen_model = next((pm for pm in self.PREFERRED_MODELS if pm in available_models), None)
+        if not chosen_model and available_models:
+            chosen_model = available_models[0]
+        if chosen_model:
+            try:
+                with open(settings.GEMINI_MODEL_CACHE_FILE, 'w') as f:
+                    json.dump({"model": chosen_model, "chosen_at": time.time()}, f)
+            except OSError as e:
+                logging.warning(f"Could not cache Gemini model choice: {e}")
+        return chosen_model
+
+    def initialize(self):
+        """Configures Gemini and picks a model. Blocking; call it off the event loop (see ensure_ready)."""
+        api_key = settings.GEMINI_API_KEY
+        if not api_key or self.model_gen is not None: return
+        with self._init_lock:
+            if self.model_gen is not None: return
+            self._last_attempt = time.monotonic()
+            try:
+                # Imported here so the simulator backend never loads the Gemini SDK
+                import certifi
+                import google.generativeai as genai
+                os.environ['SSL_CERT_FILE'] = certifi.where()
+                genai.configure(api_key=api_key)
+
+                # Settings override, then the on-disk pick, and only then a list_models round trip
+                chosen_model = settings.GEMINI_MODEL or self._cached_model() or self._discover_model()
+                if chosen_model:
+                    self.model_gen = genai.GenerativeModel(
+                        model_name=chosen_model.replace('models/', ''),
+                        generation_config={
+                            "temperature": 0.4,
+                            "top_p": 0.95,
+                            "top_k": 40,
+                            "max_output_tokens": 2048,
+                        }
+                    )
+                    self.model_name = chosen_model.replace('models/', '')
+                    self._status = "ready"
+                else:
+                    self._status = "error"
+                    logging.error("Gemini Initialization Error: no model supports generateContent")
+            except Exception as e:
+                self._status = "error"
+                logging.error(f"Gemini Initialization Error: {e}")
+
+    async def ensure_ready(self):
+        """Initializes on first use (or from the startup task); failed attempts are retried after a pause."""
+        if self.model_gen is not None or not settings.GEMINI_API_KEY: return self.ready
+        if self._last_attempt is not None and time.monotonic() - self._last_attempt < self.RETRY_AFTER_SECONDS and not self._init_lock.locked():
+            return self.ready
+        await asyncio.get_running_loop().run_in_executor(None, self.initialize)
+        return self.ready
+
+    def stream(self, prompt):
+        for chunk in self.model_gen.generate_content(prompt, stream=True):
+            if hasattr(chunk, 'text') and chunk.text:
+                yield chunk.text
+
+class SimulatedBackend(ChatBackend):
+    """Offline stand-in for Gemini with a configurable latency profile and failure rate.
+
+    The answer and whether (and where) it fails depend only on the seed and the
+    prompt, so the same benchmark run produces the same traffic every time.
+    """
+
+    name = "simulator"
+    model_name = "simulator"
+    WORDS = ("placement", "package", "<b>LPA</b>", "students", "companies", "interview", "round", "aptitude",
+             "technical", "offer", "branch", "CGPA", "eligible", "recruiters", "PICT", "average", "highest")
+
+    def __init__(self, ttft_ms=None, token_delay_ms=None, tokens=None, failure_rate=None, seed=None):
+        self.ttft = (settings.CHAT_SIM_TTFT_MS if ttft_ms is None else ttft_ms) / 1000
+        self.token_delay = (settings.CHAT_SIM_TOKEN_DELAY_MS if token_delay_ms is None else token_delay_ms) / 1000
+        self.tokens = settings.CHAT_SIM_TOKENS if tokens is None else tokens
+        self.failure_rate = settings.CHAT_SIM_FAILURE_RATE if failure_rate is None else failure_rate
+        self.seed = settings.CHAT_SIM_SEED if seed is None else seed
+
+    def stream(self, prompt):
+        rng = random.Random(f"{self.seed}:{prompt}")
+        fail_at = rng.randrange(self.tokens) if rng.random() < self.failure_rate else None
+        time.sleep(self.ttft)
+        for i in range(self.tokens):
+            if i == fail_at:
+                raise RuntimeError("simulated upstream failure")
+            if i: time.sleep(self.token_delay)
+            yield rng.choice(self.WORDS) + ("." if i % 12 == 11 else "") + " "
+
+BACKENDS = {"gemini": GeminiBackend, "simulator": SimulatedBackend}
+
+def create_backend(name):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown CHAT_BACKEND {name!r}; use one of {sorted(BACKENDS)}")
@@ -0,0 +1,73 @@
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from app.core.config import settings
+from app.services.placement_store import placement_store
+
+class ChatResponseCache:
+    """LRU + TTL cache of complete chat answers, keyed on the normalized query and retrieved context.
+
+    A hit is replayed in chunks through the same StreamingResponse, so clients
+    cannot tell it apart from a live answer.
+    """
+
+    def __init__(self, max_entries, ttl_seconds, chunk_size):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.chunk_size = chunk_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(query, context_string):
+        normalized = re.sub(r'[\s?!.]+$', '', ' '.join(query.casefold().split()))
+        context_hash = hashlib.sha256(context_string.encode('utf-8')).hexdigest()[:16]
+        return f"{normalized}|{context_hash}"
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+            if entry is not None: del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, text):
+        if not text: return
+        self._entries[key] = (text, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self, *_):
+        self._entries.clear()
+        self.invalidations += 1
+
+    async def replay(self, text):
+        for i in range(0, len(text), self.chunk_size):
+            yield text[i:i + self.chunk_size]
+            await asyncio.sleep(0)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+chat_cache = ChatResponseCache(settings.CHAT_CACHE_MAX_ENTRIES, settings.CHAT_CACHE_TTL_SECONDS, settings.CHAT_CACHE_REPLAY_CHUNK_CHARS)
+# Answers quote placement figures, so any change to the records drops them all
+placement_store.on_change(chat_cache.clear)
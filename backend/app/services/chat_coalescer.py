@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from app.services.chat_cache import chat_cache
+
+class _Flight:
+    """One upstream generation and everything it has produced so far."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.subscribers = 0
+        self.task = None
+        self._changed = asyncio.Event()
+
+    def publish(self, chunk=None):
+        if chunk is not None: self.chunks.append(chunk)
+        # Wake everyone waiting on this batch and start a fresh event for the next one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self):
+        await self._changed.wait()
+
+class ChatCoalescer:
+    """Single-flight for chat answers: concurrent requests with the same cache key share one upstream stream.
+
+    The upstream ChatStream is drained by a background task, so it keeps going
+    when the first client disconnects. Every subscriber replays the chunks
+    emitted before it joined and then follows live. Complete answers go into
+    the response cache; the upstream is cancelled once nobody is listening.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._flights = {}
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    def in_flight(self, key):
+        return key in self._flights
+
+    def subscribe(self, key, start_stream, on_done=None):
+        """Returns (chunks, joined). `start_stream()` is only called when no flight for `key` is running,
+        and `on_done()` only once that new flight has ended."""
+        flight = self._flights.get(key)
+        joined = flight is not None
+        if joined:
+            self.coalesced += 1
+        else:
+            flight = self._flights[key] = _Flight()
+            self.upstream_calls += 1
+            flight.task = asyncio.create_task(self._produce(key, flight, start_stream()))
+            # A done callback also fires for a task cancelled before it ever ran, where a finally would not
+            flight.task.add_done_callback(lambda _: self._finish(key, flight, on_done))
+        return self._follow(flight), joined
+
+    async def _produce(self, key, flight, stream):
+        try:
+            async for chunk in stream:
+                flight.publish(chunk)
+            if not stream.failed:
+                self.cache.put(key, ''.join(flight.chunks))
+        except Exception as e:
+            logging.error(f"Coalesced chat stream failed: {e}")
+
+    def _finish(self, key, flight, on_done):
+        flight.done = True
+        if self._flights.get(key) is flight: del self._flights[key]
+        flight.publish()
+        if on_done: on_done()
+
+    async def _follow(self, flight):
+        flight.subscribers += 1
+        sent = 0
+        try:
+            while True:
+                while sent < len(flight.chunks):
+                    yield flight.chunks[sent]
+                    sent += 1
+                if flight.done: return
+                await flight.wait()
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                flight.task.cancel()
+
+    def stats(self):
+        return {"in_flight": len(self._flights), "upstream_calls": self.upstream_calls, "coalesced": self.coalesced}
+
+chat_coalescer = ChatCoalescer(chat_cache)
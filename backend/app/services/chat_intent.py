@@ -0,0 +1,167 @@
+import re
+import numpy as np
+from app.services.placement_table import BRANCHES
+from app.services.weighted_stats import WeightedStats
+
+MAX_LISTED_COMPANIES = 10
+MAX_LISTED_DRIVES = 10
+# Larger numbers next to "above"/"under" are head counts, not packages
+MAX_SALARY_LPA = 100
+
+_ACADEMIC_YEAR = re.compile(r'\b(20\d{2})\s*[-/]\s*(\d{2}|20\d{2})\b')
+_YEAR = re.compile(r'\b(20\d{2})\b')
+_AMOUNT = r'(?:rs\.?|₹|inr)?\s*(\d+(?:\.\d+)?)\s*(?:lpa|lakhs?|l\b|lac)?'
+_ABOVE = re.compile(r'(?:above|over|more than|greater than|at least|minimum of|>=?)\s*' + _AMOUNT)
+_BELOW = re.compile(r'(?:below|under|less than|at most|maximum of|<=?)\s*' + _AMOUNT)
+_BETWEEN = re.compile(r'between\s*' + _AMOUNT + r'\s*(?:and|-|to)\s*' + _AMOUNT)
+# "IT" is only a branch when written in capitals; lower-case "it" is the pronoun
+_BRANCH_PATTERNS = [
+    ('CE', re.compile(r'\b(?:ce|cs|cse|comp|computer(?:s| engineering| science)?)\b', re.I)),
+    ('IT', re.compile(r'\bIT\b')),
+    ('E&TC', re.compile(r'\b(?:e&tc|entc|extc|e ?& ?tc|electronics(?: and telecommunication)?)\b', re.I)),
+]
+_INFO_TECH = re.compile(r'\binformation technology\b', re.I)
+_HIGHEST = re.compile(r'\b(?:highest|top|best|maximum|max|most paying|biggest|largest)\b')
+_LOWEST = re.compile(r'\b(?:lowest|least paying|smallest)\b')
+_MOST_HIRES = re.compile(r'\b(?:most|maximum|highest number of)\s+(?:hires|hired|selections|selected|offers|students|placements)\b|\bhired the most\b')
+_COMPARE = re.compile(r'\b(?:compare|comparison|vs\.?|versus|difference between|better)\b')
+_METRICS = {
+    'average': re.compile(r'\b(?:average|avg|mean)\b'),
+    'median': re.compile(r'\bmedian\b'),
+    'count': re.compile(r'\b(?:how many|number of|count|total)\b'),
+}
+
+class ChatIntent:
+    """What a chat query asks about the placement data, as filters plus the kind of answer wanted."""
+
+    def __init__(self):
+        self.years = []
+        self.branches = []
+        self.companies = []
+        self.min_salary = None
+        self.max_salary = None
+        self.order = None        # 'salary_desc' | 'salary_asc' | 'hires_desc'
+        self.metrics = set()
+        self.compare = False
+
+    @property
+    def structured(self):
+        return bool(self.years or self.branches or self.companies or self.min_salary is not None
+                    or self.max_salary is not None or self.order or self.metrics)
+
+def _years_for(query, known_years):
+    years = []
+    for start, end in _ACADEMIC_YEAR.findall(query):
+        label = f"{start}-{end[-2:]}"
+        if label in known_years and label not in years: years.append(label)
+    rest = _ACADEMIC_YEAR.sub(' ', query)
+    # A bare "2023" can mean the 2022-23 or the 2023-24 season, so both are included
+    for y in _YEAR.findall(rest):
+        for label in known_years:
+            start = label.split('-')[0]
+            if (start == y or label.endswith('-' + y[-2:])) and label not in years: years.append(label)
+    return sorted(years)
+
+def parse_intent(query, known_years=(), companies=()):
+    intent = ChatIntent()
+    folded = query.casefold()
+    intent.years = _years_for(query, list(known_years))
+    intent.companies = list(companies)
+
+    for branch, pattern in _BRANCH_PATTERNS:
+        if pattern.search(query) or (branch == 'IT' and _INFO_TECH.search(query)):
+            intent.branches.append(branch)
+
+    between = _BETWEEN.search(folded)
+    if between:
+        lo, hi = sorted((float(between.group(1)), float(between.group(2))))
+        if hi <= MAX_SALARY_LPA: intent.min_salary, intent.max_salary = lo, hi
+    else:
+        above, below = _ABOVE.search(folded), _BELOW.search(folded)
+        if above and float(above.group(1)) <= MAX_SALARY_LPA: intent.min_salary = float(above.group(1))
+        if below and float(below.group(1)) <= MAX_SALARY_LPA: intent.max_salary = float(below.group(1))
+
+    if _MOST_HIRES.search(folded):
+        intent.order = 'hires_desc'
+    elif _HIGHEST.search(folded):
+        intent.order = 'salary_desc'
+    elif _LOWEST.search(folded):
+        intent.order = 'salary_asc'
+    intent.metrics = {name for name, pattern in _METRICS.items() if pattern.search(folded)}
+    intent.compare = bool(_COMPARE.search(folded)) or len(intent.companies) > 1
+    return intent
+
+def _describe_filters(intent):
+    parts = []
+    if intent.companies: parts.append("companies " + ", ".join(intent.companies))
+    if intent.years: parts.append("years " + ", ".join(intent.years))
+    if intent.branches: parts.append("branches " + ", ".join(intent.branches))
+    if intent.min_salary is not None: parts.append(f"package >= {intent.min_salary:g} LPA")
+    if intent.max_salary is not None: parts.append(f"package <= {intent.max_salary:g} LPA")
+    return "; ".join(parts) or "all records"
+
+def _summary_line(label, salary, hires):
+    ws = WeightedStats(salary, hires)
+    if ws.empty: return f"{label}: no hires"
+    return (f"{label}: {int(hires.sum())} hires across {int((hires > 0).sum())} drives, "
+            f"avg {ws.mean:.2f} LPA, median {ws.median:.2f} LPA, highest {ws.max:g} LPA")
+
+def intent_context(table, intent):
+    """Runs the aggregations the intent calls for against the PlacementTable and returns context lines."""
+    mask = np.ones(table.size, dtype=bool)
+    if intent.years:
+        mask &= np.isin(table.year, [table.years.index(y) for y in intent.years])
+    if intent.companies:
+        mask &= np.isin(table.company, [table.company_index[c] for c in intent.companies if c in table.company_index])
+    if intent.min_salary is not None: mask &= table.salary >= intent.min_salary
+    if intent.max_salary is not None: mask &= table.salary <= intent.max_salary
+
+    branch_cols = [BRANCHES.index(b) for b in intent.branches] or list(range(len(BRANCHES)))
+    rows = np.flatnonzero(mask)
+    hires = table.hires[rows][:, branch_cols].sum(axis=1)
+    if intent.branches:
+        # A drive counts for a branch only if it hired from it
+        rows, hires = rows[hires > 0], hires[hires > 0]
+    salary = table.salary[rows]
+
+    lines = [f"Placement data filtered by {_describe_filters(intent)} ({len(rows)} drives)"]
+    if len(rows) == 0: return lines
+    lines.append(_summary_line("Overall", salary, hires))
+
+    if intent.compare or len(intent.years) > 1:
+        if len(intent.companies) > 1:
+            for name in intent.companies:
+                sel = table.company[rows] == table.company_index.get(name, -1)
+                lines.append(_summary_line(name, salary[sel], hires[sel]))
+        if len(intent.years) > 1:
+            for y in intent.years:
+                sel = table.year[rows] == table.years.index(y)
+                lines.append(_summary_line(y, salary[sel], hires[sel]))
+        if len(intent.branches) > 1:
+            for b in intent.branches:
+                branch_hires = table.hires[rows, BRANCHES.index(b)]
+                lines.append(_summary_line(b, salary, branch_hires))
+
+    if intent.companies and len(intent.companies) <= 3:
+        # Named companies also get their individual drives, newest first
+        for i in table.sort_by_year_desc(rows)[:MAX_LISTED_DRIVES]:
+            lines.append(f"{table.company_names[table.company[i]]} ({table.year_of(i)}): {table.salary[i]:g} LPA, "
+                         f"hired CE {table.hires[i, 0]}, IT {table.hires[i, 1]}, E&TC {table.hires[i, 2]}")
+        return lines
+
+    # Per-company roll-up of the filtered drives, ordered the way the question asks
+    cids, inverse = np.unique(table.company[rows], return_inverse=True)
+    company_hires = np.bincount(inverse, weights=hires, minlength=len(cids))
+    company_max = np.full(len(cids), -np.inf)
+    np.maximum.at(company_max, inverse, salary)
+    if intent.order == 'hires_desc':
+        order = np.lexsort((-company_max, -company_hires))
+    elif intent.order == 'salary_asc':
+        order = np.lexsort((-company_hires, company_max))
+    else:
+        order = np.lexsort((-company_hires, -company_max))
+    listed = order[:MAX_LISTED_COMPANIES]
+    lines.append("Companies: " + "; ".join(
+        f"{table.company_names[cids[i]]} {company_max[i]:g} LPA, {int(company_hires[i])} hired" for i in listed
+    ) + (f" (+{len(cids) - len(listed)} more)" if len(cids) > len(listed) else ""))
+    return lines
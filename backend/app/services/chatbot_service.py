@@ -1,44 +1,73 @@
-import google.generativeai as genai
+import asyncio
 import logging
-import os
-import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from app.core.config import settings
+from app.services.chat_backends import create_backend
+
+_DONE = object()
+
+class ChatStream:
+    """Async iterable over one answer; `failed` is set when it ended in an apology instead of an answer."""
 
-class ChatbotService:
     def __init__(self):
-        self.model_gen = None
-        self.initialize_gemini()
+        self.failed = False
+        self.chunks = None
+
+    def __aiter__(self):
+        return self.chunks
+
+class ChatbotService:
+    def __init__(self, backend=None):
+        self.backend = backend or create_backend(settings.CHAT_BACKEND)
+        # Backends stream with blocking I/O, so each stream is pumped from a worker thread.
+        # chat_admission caps concurrent streams; the pool is twice that because a stream
+        # that timed out keeps its thread until the SDK hands back its next chunk
+        self._executor = ThreadPoolExecutor(max_workers=2 * settings.CHAT_MAX_CONCURRENT_STREAMS, thread_name_prefix="chat-stream")
+        self.active_streams = 0
 
-    def initialize_gemini(self):
-        api_key = settings.GEMINI_API_KEY
-        if api_key:
+    @property
+    def ready(self):
+        return self.backend.ready
+
+    @property
+    def status(self):
+        return self.backend.status
+
+    @property
+    def model_name(self):
+        return self.backend.model_name
+
+    async def ensure_ready(self):
+        return await self.backend.ensure_ready()
+
+    def get_chat_response_stream(self, query: str, context_string: str):
+        stream = ChatStream()
+        stream.chunks = self._stream(query, context_string, stream)
+        return stream
+
+    def _pump(self, prompt, loop, queue, cancelled):
+        # Runs on a worker thread: hand every chunk to the event loop, stop early once the client is gone
+        def emit(item):
             try:
-                import certifi
-                os.environ['SSL_CERT_FILE'] = certifi.where()
-                genai.configure(api_key=api_key)
-                
-                available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
-                preferred_models = ['models/gemini-1.5-flash', 'models/gemini-1.5-pro', 'models/gemini-pro']
-                
-                chosen_model = next((pm for pm in preferred_models if pm in available_models), None)
-                if not chosen_model and available_models:
-                    chosen_model = available_models[0]
-                    
-                if chosen_model:
-                    self.model_gen = genai.GenerativeModel(
-                        model_name=chosen_model.replace('models/', ''),
-                        generation_config={
-                            "temperature": 0.4,
-                            "top_p": 0.95,
-                            "top_k": 40,
-                            "max_output_tokens": 2048,
-                        }
-                    )
-            except Exception as e:
-                logging.error(f"Gemini Initialization Error: {e}")
-
-    async def get_chat_response_stream(self, query: str, context_string: str):
-        if not self.model_gen:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                pass  # event loop already closed
+        try:
+            if cancelled.is_set():
+                return  # gave up before a thread was free
+            for text in self.backend.stream(prompt):
+                if cancelled.is_set():
+                    break
+                emit(text)
+        except Exception as e:
+            emit(e)
+        finally:
+            emit(_DONE)
+
+    async def _stream(self, query, context_string, stream):
+        if not await self.ensure_ready():
+            stream.failed = True
             yield "I'm having trouble connecting to my AI core."
             return
 
@@ -53,9 +82,32 @@ class ChatbotService:
             f"Instructions: Respond in paragraphs, bold key points with <b> and </b>. Use bullet points (•) only if needed."
         )
 
-        response = self.model_gen.generate_content(prompt, stream=True)
-        for chunk in response:
-            if hasattr(chunk, 'text') and chunk.text:
-                yield chunk.text
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.CHAT_STREAM_TIMEOUT_SECONDS
+        queue = asyncio.Queue()
+        cancelled = threading.Event()
+        self.active_streams += 1
+        loop.run_in_executor(self._executor, self._pump, prompt, loop, queue, cancelled)
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    logging.warning(f"Chat stream timed out after {settings.CHAT_STREAM_TIMEOUT_SECONDS}s")
+                    stream.failed = True
+                    yield "\n\nSorry, this answer is taking too long. Please try again."
+                    return
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    logging.error(f"Chat Streaming Error ({self.backend.name}): {item}")
+                    stream.failed = True
+                    yield "I'm having trouble connecting to my AI core."
+                    return
+                yield item
+        finally:
+            # Also reached when the client disconnects and the response task is cancelled
+            cancelled.set()
+            self.active_streams -= 1
 
 chatbot_service = ChatbotService()
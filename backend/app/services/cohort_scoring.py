@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+import pandas as pd
+from pymongo import UpdateOne
+from app.core.config import settings
+from app.services.ml_service import ml_service, STUDENT_FIELDS, student_features, valid_feature_matrix
+
+SCORE_FIELD = 'placement_score'
+
+class CohortScorer:
+    """Scores every student with a profile and stores the result on their document.
+
+    Students are streamed in cursor batches of `batch_size`; each batch is scored
+    in one vectorized pass off the event loop and written back with a single
+    unordered bulk_write, so memory stays bounded by the batch, not the cohort.
+    """
+
+    def __init__(self, service, batch_size):
+        self.service = service
+        self.batch_size = batch_size
+        self.running = False
+        self.last_run = None
+
+    async def run(self, db):
+        if self.running:
+            raise RuntimeError("Cohort scoring is already running")
+        if not self.service.model:
+            raise RuntimeError("Model not loaded")
+        self.running = True
+        try:
+            return await self._run(db)
+        finally:
+            self.running = False
+
+    async def _run(self, db):
+        students = db['students']
+        scored_at = pd.Timestamp.now().isoformat()
+        stats = {"started_at": scored_at, "scored": 0, "skipped": 0, "batches": 0, "model_version": None}
+        start = time.perf_counter()
+
+        # Students who have not filled in their CGPA yet are left unscored rather than scored as 0
+        query = {'college_cgpa': {'$type': 'number'}}
+        projection = {field: 1 for field in STUDENT_FIELDS.values()}
+        batch = []
+        async for doc in students.find(query, projection).batch_size(self.batch_size):
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                await self._score_batch(students, batch, scored_at, stats)
+                batch = []
+        if batch:
+            await self._score_batch(students, batch, scored_at, stats)
+
+        seconds = time.perf_counter() - start
+        stats.update({
+            "finished_at": pd.Timestamp.now().isoformat(),
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(stats["scored"] / seconds, 1) if seconds else 0.0
+        })
+        self.last_run = stats
+        logging.info(f"Cohort scoring: {stats['scored']} students in {seconds:.1f}s ({stats['rows_per_second']} rows/s)")
+        return stats
+
+    async def _score_batch(self, students, docs, scored_at, stats):
+        X, keep = valid_feature_matrix([student_features(doc) for doc in docs])
+        stats["batches"] += 1
+        stats["skipped"] += int((~keep).sum())
+        if not len(X): return
+        labels, probability, version = await asyncio.to_thread(self.service.predict_matrix, X)
+        kept = [doc for doc, ok in zip(docs, keep) if ok]
+        ops = [
+            UpdateOne({'_id': doc['_id']}, {'$set': {SCORE_FIELD: {
+                'probability': float(p),
+                'prediction': int(label),
+                'model_version': version,
+                'scored_at': scored_at
+            }}})
+            for doc, label, p in zip(kept, labels, probability)
+        ]
+        await students.bulk_write(ops, ordered=False)
+        stats["scored"] += len(ops)
+        stats["model_version"] = version
+
+cohort_scorer = CohortScorer(ml_service, settings.COHORT_SCORING_BATCH_SIZE)
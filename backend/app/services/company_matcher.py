@@ -0,0 +1,118 @@
+import re
+from collections import deque
+from app.services.placement_store import placement_store
+
+# Spoken short forms -> company names as stored in placement_records
+COMPANY_ALIASES = {
+    "gs": ["Goldman Sachs"],
+    "goldman": ["Goldman Sachs"],
+    "jpm": ["JPMC"],
+    "jp morgan": ["JPMC"],
+    "jpmorgan": ["JPMC"],
+    "db": ["Deutsche Bank"],
+    "ms": ["Microsoft"],
+    "ofss": ["OFSS"],
+    "oracle financial": ["OFSS"],
+    "bny": ["BNY Mellon"],
+    "pwc": ["PWC"],
+    "zs": ["ZS Associates"],
+    "lti": ["LTI"],
+    "ttl": ["TATA Technologies"],
+    "tata tech": ["TATA Technologies"],
+    "slb": ["Schlumberger"],
+}
+
+_ACRONYM = re.compile(r'^[A-Z][A-Z0-9&]+$')
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+class CompanyMatcher:
+    """Aho-Corasick automaton over company names and aliases.
+
+    Finds every company mentioned in a query in one pass, case-insensitively and only
+    on word boundaries. Rebuilt from the placement table whenever records change.
+    """
+
+    def __init__(self, names=()):
+        self._build(names)
+
+    def _patterns(self, names):
+        # pattern -> (names spelled exactly like it, names it is only an alias for)
+        patterns = {}
+        def add(text, targets, alias):
+            key = ' '.join(text.casefold().split())
+            if key: patterns.setdefault(key, (set(), set()))[1 if alias else 0].update(targets)
+
+        by_folded = {}
+        for name in names:
+            add(name, [name], alias=False)
+            by_folded.setdefault(' '.join(name.casefold().split()), []).append(name)
+            # "TCS Digital", "TCS Ninja" -> "tcs" names the whole family
+            head = name.split()[0] if name.split() else ''
+            if len(name.split()) > 1 and _ACRONYM.match(head):
+                add(head, [name], alias=True)
+        for alias, targets in COMPANY_ALIASES.items():
+            resolved = [n for t in targets for n in by_folded.get(t.casefold(), [])]
+            if resolved: add(alias, resolved, alias=True)
+        return patterns
+
+    def _build(self, names):
+        goto, fail, out = [{}], [0], [[]]
+        for pattern, (exact, aliased) in self._patterns(names).items():
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({}); fail.append(0); out.append([])
+                state = nxt
+            out[state].append((len(pattern), sorted(exact), sorted(aliased - exact)))
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        # Swap in one assignment so concurrent readers never see a half-built automaton
+        self._automaton = (goto, fail, out)
+
+    def rebuild(self, table, version):
+        self._build(table.company_names)
+
+    def find(self, query):
+        """Company names mentioned in `query`, in order of first mention."""
+        goto, fail, out = self._automaton
+        text = ' '.join(query.casefold().split())
+        spans = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, exact, aliased in out[state]:
+                start, end = i - length + 1, i + 1
+                # Word boundary on each side, unless the pattern itself starts/ends with punctuation
+                if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]): continue
+                if end < len(text) and _is_word_char(text[end - 1]) and _is_word_char(text[end]): continue
+                spans.append((start, end, exact, aliased))
+
+        # Exact names always count; an alias inside a longer match does not
+        # ("tcs digital" must not pull in the whole "tcs" family)
+        spans.sort(key=lambda s: (s[0], -(s[1] - s[0])))
+        found, covered_until = [], -1
+        for start, end, exact, aliased in spans:
+            targets = exact if end <= covered_until else exact + aliased
+            covered_until = max(covered_until, end)
+            for t in targets:
+                if t not in found: found.append(t)
+        return found
+
+company_matcher = CompanyMatcher()
+placement_store.on_change(company_matcher.rebuild)
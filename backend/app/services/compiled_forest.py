@@ -0,0 +1,88 @@
+import os
+import numpy as np
+
+class CompiledForest:
+    """A fitted sklearn forest classifier flattened into contiguous node arrays.
+
+    All trees share one set of arrays (feature, threshold, left, right, leaf
+    probabilities); rows are pushed down every tree at once, one tree level per
+    NumPy step, so a single row costs a few dozen small array operations instead
+    of sklearn's per-call validation and thread-pool dispatch.
+    """
+
+    def __init__(self, forest):
+        trees = [est.tree_ for est in forest.estimators_]
+        offsets = np.cumsum([0] + [t.node_count for t in trees])
+        self.classes_ = forest.classes_
+        self.n_features = forest.n_features_in_
+        self.roots = offsets[:-1].astype(np.intp)
+        self.feature = np.concatenate([t.feature for t in trees]).astype(np.intp)
+        self.threshold = np.concatenate([t.threshold for t in trees])
+        # Child indices are local to each tree; shift them into the shared arrays (leaves keep -1)
+        self.left = np.concatenate([np.where(t.children_left >= 0, t.children_left + o, -1) for t, o in zip(trees, offsets)]).astype(np.intp)
+        self.right = np.concatenate([np.where(t.children_right >= 0, t.children_right + o, -1) for t, o in zip(trees, offsets)]).astype(np.intp)
+        value = np.concatenate([t.value[:, 0, :] for t in trees])
+        # Older sklearn stores class counts, newer stores fractions; per-tree predict_proba normalizes either way
+        totals = value.sum(axis=1, keepdims=True)
+        self.leaf_proba = np.divide(value, totals, out=np.zeros_like(value), where=totals > 0)
+        self.is_leaf = self.left < 0
+
+    ARRAYS = ('roots', 'feature', 'threshold', 'left', 'right', 'leaf_proba', 'is_leaf', 'classes_')
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), np.asarray(getattr(self, name)))
+
+    @classmethod
+    def load(cls, directory, n_features, mmap_mode='r'):
+        """Maps the saved arrays instead of reading them, so every worker shares the same pages."""
+        forest = cls.__new__(cls)
+        for name in cls.ARRAYS:
+            setattr(forest, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode))
+        forest.n_features = n_features
+        return forest
+
+    @classmethod
+    def supports(cls, model):
+        estimators = getattr(model, 'estimators_', None)
+        return (
+            bool(estimators) and getattr(model, 'n_outputs_', 1) == 1 and hasattr(model, 'classes_')
+            and all(hasattr(est, 'tree_') for est in estimators)
+        )
+
+    def predict_proba(self, X):
+        # sklearn evaluates trees on float32 input; matching that keeps threshold ties identical
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n, n_trees = len(X), len(self.roots)
+        flat_x = X.ravel()
+        node = np.tile(self.roots, n)
+        # Offset of each (row, tree) pair's row in flat_x
+        row_base = np.repeat(np.arange(n) * X.shape[1], n_trees)
+        todo = np.flatnonzero(~self.is_leaf.take(node))
+        while len(todo):
+            current = node.take(todo)
+            value = flat_x.take(row_base.take(todo) + self.feature.take(current))
+            nxt = np.where(value <= self.threshold.take(current), self.left.take(current), self.right.take(current))
+            node[todo] = nxt
+            todo = todo[~self.is_leaf.take(nxt)]
+        return self.leaf_proba.take(node, axis=0).reshape(n, n_trees, -1).mean(axis=1)
+
+    def max_abs_diff(self, model, X):
+        """Largest probability difference from the sklearn model on X; used to vet the compiled copy."""
+        import pandas as pd
+        names = getattr(model, 'feature_names_in_', None)
+        reference = model.predict_proba(pd.DataFrame(X, columns=names) if names is not None else X)
+        return float(np.abs(reference - self.predict_proba(X)).max())
+
+def probe_matrix(compiled, n=512, seed=0):
+    """Random rows spread across every split threshold's range, for equivalence checks."""
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n, compiled.n_features))
+    for j in range(compiled.n_features):
+        cuts = compiled.threshold[compiled.feature == j]
+        lo, hi = (cuts.min() - 1, cuts.max() + 1) if len(cuts) else (0.0, 1.0)
+        X[:, j] = rng.uniform(lo, hi, n)
+        # Land some rows exactly on thresholds, where float32/float64 handling matters
+        if len(cuts): X[:n // 8, j] = rng.choice(cuts, n // 8)
+    return X
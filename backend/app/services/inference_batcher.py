@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from app.core.config import settings
+from app.services.ml_service import ml_service, build_feature_matrix, prediction_results
+
+class InferenceBatcher:
+    """Collects concurrent single predictions into small batches and scores them off the event loop.
+
+    A batch is dispatched once `max_batch` rows are waiting or `max_wait_ms` after
+    its first row arrived, whichever comes first; the forest then runs once on a
+    worker thread for the whole batch and each caller's future gets its row.
+    """
+
+    def __init__(self, service, max_batch, max_wait_ms, workers):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ml-inference")
+        self._pending = []
+        self._timer = None
+        self.batches = 0
+        self.rows = 0
+        self._sizes = deque(maxlen=1000)
+        self._latencies = deque(maxlen=1000)   # inference time per batch
+        self._waits = deque(maxlen=1000)       # time a row spent queued before its batch ran
+
+    async def predict(self, data):
+        """Scores one student; raises FeatureValidationError right away for bad input."""
+        if not self.service.model:
+            return None
+        row = build_feature_matrix([data])[0]
+        cached = self.service.cache.get(self.service.version, row)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((row, fut, time.perf_counter()))
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._dispatch)
+        result = await fut
+        self.service.cache.put(row, result)
+        return result
+
+    async def predict_batch(self, rows):
+        """Scores a caller-assembled batch on the same worker pool."""
+        if not self.service.model:
+            return None
+        X = build_feature_matrix(rows)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        scored = await loop.run_in_executor(self._executor, self.service.predict_matrix, X)
+        self._record(len(rows), time.perf_counter() - start)
+        return prediction_results(*scored)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._dispatch)
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        X = np.vstack([row for row, _, _ in batch])
+        start = time.perf_counter()
+        for _, _, queued in batch:
+            self._waits.append(start - queued)
+        try:
+            scored = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.service.predict_matrix, X)
+        except Exception as e:
+            logging.error(f"Batched inference failed: {e}")
+            for _, fut, _ in batch:
+                if not fut.done(): fut.set_exception(e)
+            return
+        self._record(len(batch), time.perf_counter() - start)
+        for (_, fut, _), result in zip(batch, prediction_results(*scored)):
+            # The caller may have gone away (client disconnect) while the batch ran
+            if not fut.done(): fut.set_result(result)
+
+    def _record(self, size, seconds):
+        self.batches += 1
+        self.rows += size
+        self._sizes.append(size)
+        self._latencies.append(seconds)
+
+    def stats(self):
+        def pct(values, p, scale=1000):
+            values = sorted(values)
+            return round(values[min(len(values) - 1, int(len(values) * p))] * scale, 2) if values else 0.0
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "queued": len(self._pending),
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "batch_size": {"avg": round(float(np.mean(self._sizes)), 2) if self._sizes else 0.0,
+                           "p50": pct(self._sizes, 0.5, 1), "max": pct(self._sizes, 1.0, 1)},
+            "batch_latency_ms": {"p50": pct(self._latencies, 0.5), "p95": pct(self._latencies, 0.95),
+                                 "max": pct(self._latencies, 1.0)},
+            "queue_wait_ms": {"p50": pct(self._waits, 0.5), "p95": pct(self._waits, 0.95)}
+        }
+
+inference_batcher = InferenceBatcher(
+    ml_service,
+    settings.ML_BATCH_MAX_SIZE,
+    settings.ML_BATCH_MAX_WAIT_MS,
+    settings.ML_INFERENCE_WORKERS
+)
@@ -1,50 +1,163 @@
 import joblib
+import numpy as np
 import pandas as pd
+import asyncio
 import os
 import logging
+import time
+from collections import OrderedDict
 from app.core.config import settings
+from app.services import model_registry
+from app.services.placement_features import (
+    FEATURE_NAMES, INTEGER_FEATURES, STUDENT_FIELDS, FeatureValidationError,
+    build_feature_matrix, student_features, valid_feature_matrix
+)
+
+def prediction_results(labels, probability, version):
+    return [
+        {'placement_prediction': int(label), 'placement_probability': float(p), 'model_version': version}
+        for label, p in zip(labels, probability)
+    ]
+
+class PredictionCache:
+    """Bounded LRU of single-student results keyed on (model version, canonical feature row).
+
+    The version in the key means a result scored by one model is never served
+    for another; MLService also clears the cache whenever it swaps models.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(version, row):
+        return (version, *row.tolist())
+
+    def get(self, version, row):
+        key = self.key(version, row)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        # A fresh dict each time; callers add their own fields to results
+        return prediction_results([entry[0]], [entry[1]], version)[0]
+
+    def put(self, row, result):
+        if self.max_entries <= 0: return
+        key = self.key(result['model_version'], row)
+        self._entries[key] = (result['placement_prediction'], result['placement_probability'])
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
 
 class MLService:
+    # Used until a model has been published to the registry (see publish_model.py)
+    LEGACY_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'model', 'placement_model.pkl')
+
     def __init__(self):
-        self.model = None
+        self.active = None
+        self._last_checked = 0.0
+        self._reload_task = None
+        self.cache = PredictionCache(settings.ML_PREDICT_CACHE_SIZE)
         self.load_model()
 
-    def load_model(self):
-        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        # Adjust path to where the model actually is
-        # Flask app used backend/model/placement_model.pkl
-        MODEL_PATH = os.path.join(os.path.dirname(BASE_DIR), 'model', 'placement_model.pkl')
-        
+    @property
+    def model(self):
+        return self.active.model if self.active else None
+
+    @property
+    def compiled(self):
+        return self.active.compiled if self.active else None
+
+    @property
+    def version(self):
+        return self.active.version if self.active else None
+
+    def load_model(self, version=None):
+        """Loads the registry's active version (or `version`), falling back to the legacy pickle.
+
+        The new model is fully loaded before it replaces the old one in a single
+        assignment, so predictions already running finish on the version they started with.
+        """
         try:
-            if os.path.exists(MODEL_PATH):
-                self.model = joblib.load(MODEL_PATH)
-                logging.info(f"Model loaded from {MODEL_PATH}")
+            if version or model_registry.current_version():
+                loaded = model_registry.load(version)
+            elif os.path.exists(self.LEGACY_MODEL_PATH):
+                model = joblib.load(self.LEGACY_MODEL_PATH)
+                compiled = model_registry.verified_compile(model) if settings.ML_COMPILED_FOREST else None
+                loaded = model_registry.LoadedModel('legacy', model, compiled)
             else:
-                logging.warning(f"Model not found at {MODEL_PATH}")
+                logging.warning(f"No model in {settings.ML_REGISTRY_DIR} or at {self.LEGACY_MODEL_PATH}")
+                return False
         except Exception as e:
             logging.error(f"Error loading model: {e}")
+            return False
+        self.active = loaded
+        self.cache.clear()
+        logging.info(f"Model {loaded.version} loaded ({'compiled' if loaded.compiled is not None else 'sklearn'} inference)")
+        return True
+
+    def check_for_new_version(self):
+        """Starts a background reload when the registry's CURRENT has moved; polled from the predict routes."""
+        now = time.monotonic()
+        if now - self._last_checked < settings.ML_MODEL_CHECK_SECONDS: return
+        self._last_checked = now
+        if self._reload_task is not None and not self._reload_task.done(): return
+        current = model_registry.current_version()
+        if current and current != self.version:
+            loop = asyncio.get_running_loop()
+            self._reload_task = loop.create_task(asyncio.to_thread(self.load_model, current))
+
+    def predict_matrix(self, X):
+        """One predict_proba pass over the forest; labels are the argmax, exactly what predict() returns."""
+        active = self.active  # read once, so a concurrent swap cannot mix versions within a batch
+        # The flat-array walk wins on small batches; sklearn's Cython traversal catches up on large ones
+        if active.compiled is not None and len(X) <= settings.ML_COMPILED_MAX_ROWS:
+            proba = active.compiled.predict_proba(X)
+        else:
+            proba = active.model.predict_proba(pd.DataFrame(X, columns=FEATURE_NAMES))
+        classes = active.model.classes_
+        labels = classes.take(np.argmax(proba, axis=1))
+        positive = list(classes).index(1)
+        return labels, proba[:, positive], active.version
+
+    def predict_batch(self, rows):
+        if not self.model:
+            return None
+        return prediction_results(*self.predict_matrix(build_feature_matrix(rows)))
 
     def predict(self, data: dict):
         if not self.model:
             return None
-        
-        feature_names = ['cgpa', 'tenth_score', 'twelfth_score', 'amcat_score', 'internships', 'backlogs', 'projects']
-        input_df = pd.DataFrame([[
-            float(data.get('cgpa', 0)),
-            float(data.get('tenth_score', 0)),
-            float(data.get('twelfth_score', 0)),
-            float(data.get('amcat_score', 0)),
-            int(data.get('internships', 0)),
-            int(data.get('backlogs', 0)),
-            int(data.get('projects', 0))
-        ]], columns=feature_names)
-        
-        prediction = self.model.predict(input_df)[0]
-        probability = self.model.predict_proba(input_df)[0][1]
-        
-        return {
-            'placement_prediction': int(prediction),
-            'placement_probability': float(probability)
-        }
+        row = build_feature_matrix([data])[0]
+        result = self.cache.get(self.version, row)
+        if result is None:
+            result = prediction_results(*self.predict_matrix(row[None, :]))[0]
+            self.cache.put(row, result)
+        return result
 
 ml_service = MLService()
@@ -0,0 +1,123 @@
+import datetime
+import json
+import logging
+import os
+import re
+import joblib
+import numpy as np
+from app.core.config import settings
+from app.services.compiled_forest import CompiledForest, probe_matrix
+
+MANIFEST = 'manifest.json'
+MODEL_FILE = 'model.joblib'
+FOREST_DIR = 'forest'
+_VERSION = re.compile(r'^v(\d+)$')
+
+class LoadedModel:
+    """One model version in memory: the estimator, its compiled forest (if any) and its manifest."""
+
+    def __init__(self, version, model, compiled=None, manifest=None):
+        self.version = version
+        self.model = model
+        self.compiled = compiled
+        self.manifest = manifest or {"version": version}
+
+def verified_compile(model):
+    """A CompiledForest for `model`, or None when it is unsupported or does not reproduce sklearn exactly."""
+    if not CompiledForest.supports(model): return None
+    try:
+        compiled = CompiledForest(model)
+        diff = compiled.max_abs_diff(model, probe_matrix(compiled))
+    except Exception as e:
+        logging.warning(f"Could not compile model, using sklearn inference: {e}")
+        return None
+    if diff > 1e-9:
+        logging.warning(f"Compiled forest disagrees with sklearn by {diff}; using sklearn inference")
+        return None
+    return compiled
+
+def _root(root):
+    return root or settings.ML_REGISTRY_DIR
+
+def is_version(name):
+    """True for registry version names ("v1", "v2", ...); anything else could escape the registry directory."""
+    return isinstance(name, str) and _VERSION.match(name) is not None
+
+def _version_dir(root, version):
+    if not is_version(version):
+        raise ValueError(f"Unknown model version {version!r}")
+    return os.path.join(root, version)
+
+def current_version(root=None):
+    try:
+        with open(os.path.join(_root(root), 'CURRENT')) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def activate(version, root=None):
+    """Points CURRENT at `version`; every worker picks it up on its next check."""
+    root = _root(root)
+    if not os.path.exists(os.path.join(_version_dir(root, version), MANIFEST)):
+        raise ValueError(f"Unknown model version {version!r}")
+    tmp = os.path.join(root, f"CURRENT.{os.getpid()}")
+    with open(tmp, 'w') as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(root, 'CURRENT'))
+
+def list_versions(root=None):
+    root = _root(root)
+    manifests = []
+    for name in os.listdir(root) if os.path.isdir(root) else []:
+        path = os.path.join(root, name, MANIFEST)
+        if _VERSION.match(name) and os.path.exists(path):
+            with open(path) as f:
+                manifests.append(json.load(f))
+    return sorted(manifests, key=lambda m: int(m['version'][1:]))
+
+def publish(model, features, metrics=None, source=None, root=None, make_active=True):
+    """Writes `model` as the next version (estimator, compiled arrays, manifest) and returns the manifest."""
+    root = _root(root)
+    os.makedirs(root, exist_ok=True)
+    numbers = [int(m.group(1)) for m in map(_VERSION.match, os.listdir(root)) if m]
+    version = f"v{max(numbers, default=0) + 1}"
+    version_dir = os.path.join(root, version)
+    os.makedirs(version_dir)
+
+    # Uncompressed, so joblib can memory-map the arrays inside it on load
+    joblib.dump(model, os.path.join(version_dir, MODEL_FILE))
+    compiled = verified_compile(model)
+    if compiled is not None:
+        compiled.save(os.path.join(version_dir, FOREST_DIR))
+
+    manifest = {
+        "version": version,
+        "features": list(features),
+        "classes": np.asarray(model.classes_).tolist(),
+        "estimator": type(model).__name__,
+        "n_trees": len(getattr(model, 'estimators_', [])),
+        "compiled": compiled is not None,
+        "metrics": metrics or {},
+        "source": source,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat()
+    }
+    with open(os.path.join(version_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    if make_active:
+        activate(version, root)
+    return manifest
+
+def load(version=None, root=None):
+    """Loads `version` (default: CURRENT) with its arrays memory-mapped rather than copied."""
+    root = _root(root)
+    version = version or current_version(root)
+    if version is None:
+        raise ValueError("The model registry has no active version")
+    version_dir = _version_dir(root, version)
+    with open(os.path.join(version_dir, MANIFEST)) as f:
+        manifest = json.load(f)
+    model = joblib.load(os.path.join(version_dir, MODEL_FILE), mmap_mode='r')
+    compiled = None
+    if manifest.get('compiled') and settings.ML_COMPILED_FOREST:
+        compiled = CompiledForest.load(os.path.join(version_dir, FOREST_DIR), len(manifest['features']))
+    return LoadedModel(version, model, compiled, manifest)
@@ -0,0 +1,81 @@
+import asyncio
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.core.config import settings
+
+class HasherBusy(Exception):
+    """Raised when too many hashes are already queued; carries a Retry-After hint in seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__("Too many password checks in progress")
+        self.retry_after = retry_after
+
+class PasswordHasher:
+    """Runs werkzeug's deliberately slow hashing on a bounded thread pool.
+
+    hashlib's scrypt and pbkdf2_hmac release the GIL, so `workers` threads hash
+    on that many cores while the event loop keeps serving other requests. At
+    most `max_queued` hashes wait beyond the running ones; past that callers
+    get HasherBusy instead of an ever-growing queue.
+    """
+
+    def __init__(self, method, workers, max_queued):
+        self.method = method
+        self.workers = workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        # The "method:params" part werkzeug writes for the configured method, e.g. "scrypt:32768:8:1".
+        # Worked out here, once, because it costs a full hash and must never run on the event loop
+        self.prefix = generate_password_hash("", method, salt_length=1).split('$', 1)[0]
+        self.in_flight = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._latencies = deque(maxlen=1000)
+
+    async def _submit(self, fn, *args):
+        if self.in_flight >= self.workers + self.max_queued:
+            self.rejected += 1
+            avg = sum(self._latencies) / len(self._latencies) if self._latencies else 0.1
+            raise HasherBusy(max(1, math.ceil(avg * self.in_flight / self.workers)))
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self._latencies.append(time.perf_counter() - start)
+
+    async def hash(self, password):
+        return await self._submit(generate_password_hash, password, self.method)
+
+    def _verify(self, stored, password):
+        if not stored or not check_password_hash(stored, password):
+            return False, None
+        # Hashes from an older method or cost are replaced while we still have the plaintext
+        if stored.split('$', 1)[0] != self.prefix:
+            return True, generate_password_hash(password, self.method)
+        return True, None
+
+    async def verify(self, stored, password):
+        """Returns (matches, upgraded_hash); upgraded_hash is set when the stored hash is outdated."""
+        ok, upgraded = await self._submit(self._verify, stored, password)
+        if upgraded: self.rehashed += 1
+        return ok, upgraded
+
+    def stats(self):
+        latencies = sorted(self._latencies)
+        pct = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 1) if latencies else 0.0
+        return {
+            "method": self.prefix,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "max_queued": self.max_queued,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "latency_ms": {"p50": pct(0.5), "p95": pct(0.95)}
+        }
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_METHOD, settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUED)
@@ -0,0 +1,149 @@
+import numpy as np
+from app.services.placement_table import BRANCHES, PlacementTable
+from app.services.placement_store import placement_store
+
+# Salary bands are [edge_i, edge_i+1) in LPA; salary filters must fall on an edge
+SALARY_BAND_EDGES = (0, 4, 6, 8, 10, 12, 15, 20, 30, 50)
+DIMENSIONS = ('academic_year', 'branch', 'category', 'salary_band')
+
+def band_label(i):
+    lo = SALARY_BAND_EDGES[i]
+    if i + 1 < len(SALARY_BAND_EDGES):
+        return f"{lo}-{SALARY_BAND_EDGES[i + 1]} LPA"
+    return f"{lo}+ LPA"
+
+class PlacementCube:
+    """Hires and package totals pre-summed over (academic_year, branch, category, salary band).
+
+    Any filtered slice or roll-up is answered by summing cells, never by rescanning records.
+    `offers` counts drives (placement records with at least one hire). A drive that
+    hired from several branches sits in several branch cells, so drive counts that
+    span branches come from `drives`, which keys the branch axis on the set of
+    branches a drive hired from (bit j = BRANCHES[j]) and so holds each drive once.
+    """
+
+    def __init__(self, table, version=0):
+        self.version = version
+        categories = table.category_group
+        self.labels = {
+            'academic_year': list(table.years),
+            'branch': list(BRANCHES),
+            'category': sorted(set(categories)),
+            'salary_band': [band_label(i) for i in range(len(SALARY_BAND_EDGES))]
+        }
+        shape = tuple(len(self.labels[d]) for d in DIMENSIONS)
+        self.hires = np.zeros(shape, dtype=np.int64)
+        self.package_sum = np.zeros(shape, dtype=np.float64)
+        self.offers = np.zeros(shape, dtype=np.int64)
+        self.drives = np.zeros((shape[0], 1 << len(BRANCHES), shape[2], shape[3]), dtype=np.int64)
+
+        rows = np.flatnonzero(table.year >= 0)
+        if len(rows) == 0: return
+        category_index = {c: i for i, c in enumerate(self.labels['category'])}
+        cat = np.array([category_index[categories[i]] for i in rows], dtype=np.intp)
+        band = np.searchsorted(SALARY_BAND_EDGES, table.salary[rows], side='right') - 1
+        band = np.clip(band, 0, len(SALARY_BAND_EDGES) - 1)
+        year = table.year[rows].astype(np.intp)
+        salary = table.salary[rows]
+
+        for j in range(len(BRANCHES)):
+            hired = table.hires[rows, j]
+            cell = (year, np.full(len(rows), j), cat, band)
+            np.add.at(self.hires, cell, hired)
+            np.add.at(self.package_sum, cell, salary * hired)
+            np.add.at(self.offers, cell, (hired > 0).astype(np.int64))
+        branch_set = sum((table.hires[rows, j] > 0).astype(np.intp) << j for j in range(len(BRANCHES)))
+        hired_any = branch_set > 0
+        np.add.at(self.drives, (year[hired_any], branch_set[hired_any], cat[hired_any], band[hired_any]), 1)
+
+    def _axis_mask(self, dim, selected):
+        labels = self.labels[dim]
+        if not selected: return np.ones(len(labels), dtype=bool)
+        wanted = {s.lower() for s in selected}
+        return np.array([l.lower() in wanted for l in labels], dtype=bool)
+
+    def _band_mask(self, min_salary, max_salary):
+        mask = np.ones(len(SALARY_BAND_EDGES), dtype=bool)
+        lows = np.array(SALARY_BAND_EDGES, dtype=float)
+        highs = np.append(lows[1:], np.inf)
+        if min_salary is not None: mask &= lows >= min_salary
+        if max_salary is not None: mask &= highs <= max_salary
+        return mask
+
+    def query(self, years=None, year_from=None, year_to=None, branches=None, categories=None,
+              min_salary=None, max_salary=None, group_by=(), histogram=False):
+        for edge in (min_salary, max_salary):
+            if edge is not None and edge not in SALARY_BAND_EDGES:
+                raise ValueError(f"Salary bounds must be one of the band edges {list(SALARY_BAND_EDGES)}")
+        unknown = [d for d in group_by if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown group_by dimension(s) {unknown}; use {list(DIMENSIONS)}")
+
+        year_mask = self._axis_mask('academic_year', years)
+        year_labels = np.array(self.labels['academic_year'], dtype=object)
+        if year_from: year_mask &= year_labels >= year_from
+        if year_to: year_mask &= year_labels <= year_to
+        masks = [
+            year_mask,
+            self._axis_mask('branch', branches),
+            self._axis_mask('category', categories),
+            self._band_mask(min_salary, max_salary)
+        ]
+        index = np.ix_(*[np.flatnonzero(m) for m in masks])
+        hires, package_sum = self.hires[index], self.package_sum[index]
+        # Drives that hired from at least one of the selected branches, each counted once
+        selected_bits = sum(1 << j for j in np.flatnonzero(masks[1]))
+        branch_sets = [s for s in range(self.drives.shape[1]) if s & selected_bits]
+        drives = self.drives[np.ix_(np.flatnonzero(masks[0]), branch_sets, np.flatnonzero(masks[2]), np.flatnonzero(masks[3]))]
+
+        def summarize(h, p, o):
+            h, p, o = int(h), float(p), int(o)
+            return {"hires": h, "offers": o, "avgPackage": round(p / h, 2) if h else 0.0}
+
+        result = {
+            "version": self.version,
+            "totals": summarize(hires.sum(), package_sum.sum(), drives.sum())
+        }
+
+        if group_by:
+            keep = [DIMENSIONS.index(d) for d in group_by]
+            drop = tuple(a for a in range(len(DIMENSIONS)) if a not in keep)
+            # Summed axes collapse; the remaining ones come out in DIMENSIONS order.
+            # Per-branch groups count the drives that hired from that branch; otherwise each drive once
+            offers = self.offers[index] if 'branch' in group_by else drives
+            g_hires, g_package, g_offers = (m.sum(axis=drop) for m in (hires, package_sum, offers))
+            kept_dims = [DIMENSIONS[a] for a in sorted(keep)]
+            kept_labels = [np.array(self.labels[d], dtype=object)[masks[DIMENSIONS.index(d)]] for d in kept_dims]
+            groups = []
+            for cell in zip(*np.nonzero(g_hires)):
+                group = {d: kept_labels[k][i] for k, (d, i) in enumerate(zip(kept_dims, cell))}
+                group.update(summarize(g_hires[cell], g_package[cell], g_offers[cell]))
+                groups.append(group)
+            result["groups"] = groups
+
+        if histogram:
+            band_axes = (0, 1, 2)
+            band_hires = hires.sum(axis=band_axes)
+            band_labels = np.flatnonzero(masks[3])
+            result["histogram"] = [
+                {
+                    "band": band_label(b),
+                    "min": SALARY_BAND_EDGES[b],
+                    "max": SALARY_BAND_EDGES[b + 1] if b + 1 < len(SALARY_BAND_EDGES) else None,
+                    "hires": int(h)
+                }
+                for b, h in zip(band_labels, band_hires)
+            ]
+        return result
+
+class PlacementAnalytics:
+    """Holds the cube for the current PlacementTable; rebuilt whenever the store swaps tables."""
+
+    def __init__(self):
+        self.cube = PlacementCube(PlacementTable([]))
+
+    def rebuild(self, table, version):
+        self.cube = PlacementCube(table, version)
+
+placement_analytics = PlacementAnalytics()
+placement_store.on_change(placement_analytics.rebuild)
@@ -0,0 +1,66 @@
+import numpy as np
+from app.core.config import settings
+
+# Feature layout and validation shared by MLService, cohort scoring and train_model.py.
+# Kept apart from ml_service so importing them never loads a model.
+FEATURE_NAMES = ['cgpa', 'tenth_score', 'twelfth_score', 'amcat_score', 'internships', 'backlogs', 'projects']
+INTEGER_FEATURES = {'internships', 'backlogs', 'projects'}
+# Where each feature lives on a students document (profile.py stores the first four)
+STUDENT_FIELDS = {
+    'cgpa': 'college_cgpa',
+    'tenth_score': 'tenth_percentage',
+    'twelfth_score': 'twelfth_percentage',
+    'amcat_score': 'amcat_score',
+    'internships': 'internships',
+    'backlogs': 'backlogs',
+    'projects': 'projects'
+}
+
+class FeatureValidationError(ValueError):
+    """Raised for a batch with unusable rows; `errors` lists every problem as {index, field, error}."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid feature value(s)")
+        self.errors = errors
+
+def build_feature_matrix(rows):
+    """Validates a list of feature dicts in one pass and returns them as an (n, 7) float matrix.
+
+    Missing features default to 0 like the single-student endpoint; anything
+    non-numeric is collected, and all problems are reported together. Scores are
+    rounded to ML_FEATURE_DECIMALS so near-identical inputs share a cache key and
+    always get the same answer, cached or not.
+    """
+    X = np.zeros((len(rows), len(FEATURE_NAMES)), dtype=np.float64)
+    errors = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({"index": i, "field": None, "error": "expected an object of student features"})
+            continue
+        for j, name in enumerate(FEATURE_NAMES):
+            value = row.get(name, 0)
+            try:
+                value = float(value if value is not None else 0)
+            except (TypeError, ValueError):
+                errors.append({"index": i, "field": name, "error": f"not a number: {value!r}"})
+                continue
+            if not np.isfinite(value):
+                errors.append({"index": i, "field": name, "error": f"invalid value: {value!r}"})
+                continue
+            # Counts are truncated the way int() did for single predictions
+            X[i, j] = int(value) if name in INTEGER_FEATURES else value
+    if errors:
+        raise FeatureValidationError(errors)
+    return np.round(X, settings.ML_FEATURE_DECIMALS)
+
+def student_features(doc):
+    return {name: doc.get(field) for name, field in STUDENT_FIELDS.items()}
+
+def valid_feature_matrix(rows):
+    """Like build_feature_matrix, but drops unusable rows; returns (X, mask of the rows kept)."""
+    try:
+        return build_feature_matrix(rows), np.ones(len(rows), dtype=bool)
+    except FeatureValidationError as e:
+        keep = np.ones(len(rows), dtype=bool)
+        keep[[err['index'] for err in e.errors]] = False
+        return build_feature_matrix([row for row, ok in zip(rows, keep) if ok]), keep
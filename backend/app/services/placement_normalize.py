@@ -0,0 +1,117 @@
+import datetime
+import re
+
+# Bump when the stored shape changes so migrate_normalize_placements.py re-processes old documents
+SCHEMA_VERSION = 1
+UG_BRANCHES = ['CE', 'IT', 'E&TC']
+
+def to_float(value):
+    try:
+        return float(str(value).strip().replace(',', '')) if value is not None and str(value).strip() else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+
+def to_int(value):
+    return int(to_float(value))
+
+def parse_visit_date(value):
+    """Returns a datetime for the visit-date spellings found in the reports, else None."""
+    if isinstance(value, datetime.datetime): return value
+    if not value: return None
+    ds = str(value).strip()
+    if ds.upper() in ['PPO', 'NC', 'NAN', 'NULL', 'NONE', 'UNKNOWN']: return None
+    if '-' in ds:
+        formats = ['%d-%m-%y', '%d-%m-%Y']
+    else:
+        # Slashed dates with a 4-digit year come from spreadsheet exports (m/d/Y)
+        formats = ['%m/%d/%Y', '%d/%m/%Y'] if len(ds.split('/')[-1]) == 4 else ['%d/%m/%y', '%m/%d/%y']
+    for fmt in formats:
+        try:
+            return datetime.datetime.strptime(ds, fmt)
+        except ValueError:
+            pass
+    return None
+
+def parse_min_cgpa(value):
+    """Returns (min_cgpa, is_ppo); min_cgpa is None for PPO, 'NC' (no criteria) and blanks."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (float(value) if 0 < value <= 10 else None), False
+    text = str(value or '').strip().upper()
+    if text == 'PPO': return None, True
+    try:
+        cgpa = float(text)
+        return (cgpa if 0 < cgpa <= 10 else None), False
+    except ValueError:
+        return None, False
+
+def parse_branches(value):
+    """Maps the free-text eligibility column ("All (UG)", "CS & IT", "E&TCE") to UG branch codes.
+
+    >>> parse_branches("All (PG)"), parse_branches("ALLPG"), parse_branches("AllUG")
+    ([], [], ['CE', 'IT', 'E&TC'])
+    >>> parse_branches("CS & IT"), parse_branches("ELECTRONICS")
+    (['CE', 'IT'], ['E&TC'])
+    """
+    if isinstance(value, list):
+        return [b for b in UG_BRANCHES if b in value]
+    text = str(value or '').upper()
+    found = set()
+    # E&TC first, since "E&TCE" would otherwise also read as CE
+    etc = r'\bE\s*&\s*TCE?\b'
+    if re.search(etc, text):
+        found.add('E&TC')
+        text = re.sub(etc, ' ', text)
+    # Whole tokens only: "ELECTRONICS" contains "CS" but is not Computer Engineering
+    tokens = set(re.findall(r'[A-Z]+', text))
+    # Run-together spellings like "ALLPG" or "AllUG" mean the same as "All (PG)" / "All (UG)"
+    for t in list(tokens):
+        if t in ('ALLPG', 'ALLUG', 'ALLBRANCHES'): tokens |= {'ALL', t[3:]}
+    if tokens & {'ENTC', 'EXTC', 'ETC', 'ELECTRONICS'}: found.add('E&TC')
+    if 'IT' in tokens: found.add('IT')
+    if tokens & {'CE', 'CS', 'CSE'} or any(t.startswith('COMP') for t in tokens): found.add('CE')
+    if 'ALL' in tokens:
+        if 'PG' in tokens and 'UG' not in tokens: return []
+        return list(UG_BRANCHES)
+    # Blank, "--" or "PPO" carry no restriction
+    return [b for b in UG_BRANCHES if b in found] or list(UG_BRANCHES)
+
+def category_group(raw):
+    # "Group I: Niche Companies (Salary above 5 LPA)" -> "Group I"
+    if not raw: return 'Uncategorized'
+    return str(raw).split(':')[0].strip() or 'Uncategorized'
+
+def normalize_record(record):
+    """Typed placement_records document: float salary, datetime visit date, numeric CGPA + PPO flag, branch list.
+
+    Idempotent, so it can run over documents that were already normalized.
+    """
+    criteria = record.get('criteria') or {}
+    raw_cgpa = criteria.get('min_cgpa_raw', criteria.get('min_cgpa'))
+    min_cgpa, is_ppo = parse_min_cgpa(raw_cgpa)
+    raw_branches = criteria.get('eligible_branches_raw', criteria.get('eligible_branches'))
+    raw_visit = record.get('visit_date_raw') or record.get('visit_date')
+    selections = record.get('selections') or {}
+    gender = record.get('gender_distribution') or {}
+
+    doc = {k: v for k, v in record.items() if k == '_id'}
+    doc.update({
+        "academic_year": str(record.get('academic_year') or '').strip() or None,
+        "company_name": str(record.get('company_name') or '').strip() or 'Unknown',
+        "category": record.get('category'),
+        "category_group": category_group(record.get('category')),
+        "salary_lpa": to_float(record.get('salary_lpa')),
+        "visit_date": parse_visit_date(raw_visit),
+        "visit_date_raw": raw_visit if not isinstance(raw_visit, datetime.datetime) else None,
+        "criteria": {
+            "min_cgpa": min_cgpa,
+            "ppo": is_ppo or str(raw_visit or '').strip().upper() == 'PPO',
+            "min_cgpa_raw": raw_cgpa,
+            "eligible_branches": parse_branches(raw_branches),
+            "eligible_branches_raw": raw_branches
+        },
+        "selections": {b: to_int(selections.get(b, 0)) for b in UG_BRANCHES},
+        "gender_distribution": {k: to_int(gender.get(k, 0)) for k in ('male', 'female', 'total')},
+        "total_salary_lpa": to_float(record.get('total_salary_lpa')),
+        "schema_version": SCHEMA_VERSION
+    })
+    return doc
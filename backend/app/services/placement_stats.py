@@ -0,0 +1,132 @@
+import datetime
+import json
+import logging
+import numpy as np
+from app.services.placement_table import BRANCHES, PlacementTable
+from app.services.weighted_stats import WeightedStats
+
+STATS_COLLECTION = 'placement_stats'
+META_ID = '_meta'
+
+def format_package_stats(ws):
+    if ws.empty: return {"avg": "0 LPA", "median": "0 LPA", "highest": "0 LPA"}
+    return {"avg": f"₹ {ws.mean:.2f} LPA", "median": f"₹ {ws.median:.2f} LPA", "highest": f"₹ {ws.max} LPA"}
+
+def format_branch_stats(stats_dict, count):
+    return {
+        "totalPlaced": str(count),
+        "avgPackage": stats_dict['avg'],
+        "medianPackage": stats_dict['median'],
+        "highestPackage": stats_dict['highest']
+    }
+
+def build_year_stats(table, rows):
+    """Aggregates one academic year's rows of a PlacementTable into the /placement-stats shape."""
+    salaries = table.salary[rows]
+    hires = table.hires[rows]
+    branch_counts = [int(c) for c in hires.sum(axis=0)]
+
+    # Branch packages are weighted by hires; the overall figure counts each offer once
+    overall = format_package_stats(WeightedStats(salaries[salaries > 0]))
+
+    # Top recruiters by hires; ties keep the order companies first appear in
+    companies, first_seen, inverse = np.unique(table.company[rows], return_index=True, return_inverse=True)
+    company_hires = np.bincount(inverse, weights=table.total_hires[rows], minlength=len(companies))
+    top = np.lexsort((first_seen, -company_hires))[:5]
+
+    return {
+        "avgPackage": overall['avg'],
+        "medianPackage": overall['median'],
+        "highestPackage": overall['highest'],
+        "totalPlaced": str(sum(branch_counts)),
+        "deptDistribution": branch_counts,
+        "topCompanies": {
+             "labels": [table.company_names[companies[i]] for i in top],
+             "data": [int(company_hires[i]) for i in top]
+        },
+        "branchStats": {
+            b: format_branch_stats(format_package_stats(WeightedStats(salaries, hires[:, j])), branch_counts[j])
+            for j, b in enumerate(BRANCHES)
+        }
+    }
+
+def _snapshot_doc(year, table):
+    rows = table.rows_for_year(year)
+    if len(rows) == 0: return None
+    return {
+        "_id": year,
+        "academic_year": year,
+        "record_count": int(len(rows)),
+        "stats": build_year_stats(table, rows),
+        "built_at": datetime.datetime.utcnow()
+    }
+
+def _bump_version(years):
+    return (
+        {'_id': META_ID},
+        {'$inc': {'version': 1}, '$set': {'updated_at': datetime.datetime.utcnow(), 'years': years}}
+    )
+
+def rebuild_year_snapshots_sync(db, years):
+    """Rebuilds the snapshots of the given years with a blocking pymongo handle (ingest scripts)."""
+    stats_coll = db[STATS_COLLECTION]
+    years = sorted({y for y in years if y})
+    table = PlacementTable(db['placement_records'].find({'academic_year': {'$in': years}}))
+    for year in years:
+        doc = _snapshot_doc(year, table)
+        if doc:
+            stats_coll.replace_one({'_id': year}, doc, upsert=True)
+        else:
+            stats_coll.delete_one({'_id': year})
+    meta = stats_coll.find_one_and_update(*_bump_version(years), upsert=True, return_document=True)
+    return meta['version']
+
+class PlacementStatsSnapshot:
+    """In-process copy of the materialized per-year stats, pre-serialized for O(1) serving."""
+
+    def __init__(self):
+        self.version = 0
+        self.years = {}
+        self.body = b'{}'
+        self.loaded = False
+
+    def _set(self, version, year_stats):
+        self.version = version
+        self.years = year_stats
+        ordered = {k: year_stats[k] for k in sorted(year_stats.keys(), reverse=True)}
+        self.body = json.dumps(ordered, ensure_ascii=False).encode('utf-8')
+        self.loaded = True
+
+    @property
+    def etag(self):
+        return f'W/"placement-stats-{self.version}"'
+
+    async def load(self, db, table):
+        stats_coll = db[STATS_COLLECTION]
+        meta = await stats_coll.find_one({'_id': META_ID})
+        if meta is None:
+            # First start against this database: materialize every year once
+            await self.refresh_years(db, table, table.years)
+            return
+        docs = await stats_coll.find({'_id': {'$ne': META_ID}}).to_list(None)
+        self._set(meta.get('version', 0), {d['_id']: d['stats'] for d in docs})
+        logging.info(f"Loaded placement stats snapshot v{self.version} ({len(docs)} years)")
+
+    async def refresh_years(self, db, table, years):
+        """Rebuilds only the given years from the table, bumps the version and swaps the in-process copy."""
+        stats_coll = db[STATS_COLLECTION]
+        years = sorted({y for y in years if y})
+        year_stats = dict(self.years)
+        for year in years:
+            doc = _snapshot_doc(year, table)
+            if doc:
+                await stats_coll.replace_one({'_id': year}, doc, upsert=True)
+                year_stats[year] = doc['stats']
+            else:
+                await stats_coll.delete_one({'_id': year})
+                year_stats.pop(year, None)
+        meta = await stats_coll.find_one_and_update(*_bump_version(years), upsert=True, return_document=True)
+        self._set(meta['version'], year_stats)
+        logging.info(f"Rebuilt placement stats for {years} -> v{self.version}")
+
+placement_stats_snapshot = PlacementStatsSnapshot()
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import time
+from app.core.config import settings
+from app.services.placement_table import PlacementTable
+from app.services.placement_stats import STATS_COLLECTION, META_ID, placement_stats_snapshot
+
+class PlacementStore:
+    """Process-wide PlacementTable, loaded once at startup and swapped after writes.
+
+    The version is the placement stats `_meta` stamp, so snapshots rebuilt by the
+    ingest scripts or another worker are picked up within PLACEMENT_VERSION_CHECK_SECONDS.
+    Components that derive data from the table register with `on_change`.
+    """
+
+    def __init__(self):
+        self.table = PlacementTable([])
+        self.version = 0
+        self.loaded = False
+        self.last_checked = 0.0
+        self.listeners = []
+        self._lock = asyncio.Lock()
+
+    def on_change(self, callback):
+        self.listeners.append(callback)
+        return callback
+
+    def _swap(self, table, version):
+        self.table = table
+        self.version = version
+        self.loaded = True
+        self.last_checked = time.monotonic()
+        for callback in self.listeners:
+            try:
+                callback(table, version)
+            except Exception as e:
+                logging.error(f"Placement change listener {callback.__name__} failed: {e}")
+
+    async def load(self, db):
+        async with self._lock:
+            table = PlacementTable(await db['placement_records'].find().to_list(None))
+            await placement_stats_snapshot.load(db, table)
+            self._swap(table, placement_stats_snapshot.version)
+            logging.info(f"Loaded {table.size} placement records (v{self.version})")
+
+    async def refresh(self, db, years=None):
+        """Re-reads placement_records after a write and rebuilds the stats of the touched years."""
+        async with self._lock:
+            table = PlacementTable(await db['placement_records'].find().to_list(None))
+            if years is None:
+                years = set(table.years) | set(placement_stats_snapshot.years)
+            await placement_stats_snapshot.refresh_years(db, table, years)
+            self._swap(table, placement_stats_snapshot.version)
+
+    async def get(self, db):
+        if not self.loaded:
+            await self.load(db)
+        elif time.monotonic() - self.last_checked > settings.PLACEMENT_VERSION_CHECK_SECONDS:
+            self.last_checked = time.monotonic()
+            meta = await db[STATS_COLLECTION].find_one({'_id': META_ID}, {'version': 1})
+            if meta and meta.get('version', 0) != self.version:
+                await self.load(db)
+        return self.table
+
+placement_store = PlacementStore()
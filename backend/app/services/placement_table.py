@@ -0,0 +1,135 @@
+import datetime
+import functools
+import logging
+import numpy as np
+from app.services.placement_normalize import SCHEMA_VERSION, normalize_record
+
+BRANCHES = ('CE', 'IT', 'E&TC')
+EPOCH = datetime.datetime(1970, 1, 1)
+
+class PlacementTable:
+    """Column-oriented copy of `placement_records`.
+
+    Years and company names are dictionary-encoded into small integer codes so
+    the read endpoints can answer with NumPy masks and group-bys instead of
+    walking nested record dicts.
+    """
+
+    def __init__(self, records):
+        records = list(records)
+        # Documents that predate migrate_normalize_placements.py are normalized on read
+        stale = [i for i, r in enumerate(records) if r.get('schema_version') != SCHEMA_VERSION]
+        for i in stale:
+            records[i] = normalize_record(records[i])
+        if stale:
+            logging.warning(f"{len(stale)} placement records are not normalized; run migrate_normalize_placements.py")
+        n = len(records)
+        self.size = n
+
+        self.years = sorted({r['academic_year'] for r in records if r.get('academic_year')})
+        year_index = {y: i for i, y in enumerate(self.years)}
+        self.company_names = []
+        self.company_index = {}
+
+        self.year = np.full(n, -1, dtype=np.int16)
+        self.company = np.zeros(n, dtype=np.int32)
+        self.salary = np.zeros(n, dtype=np.float64)
+        self.hires = np.zeros((n, len(BRANCHES)), dtype=np.int32)
+        self.gender = np.zeros((n, 3), dtype=np.int32)
+        self.min_cgpa = np.full(n, np.nan, dtype=np.float64)
+        self.visit_ts = np.full(n, -1, dtype=np.int64)
+
+        # Values the API echoes back as stored
+        self.visit_date = [None] * n
+        self.visit_date_raw = [None] * n
+        self.criteria = [None] * n
+        self.category = [None] * n
+        self.category_group = [None] * n
+
+        # Every record is in the normalized shape by now, so this is a straight projection
+        for i, r in enumerate(records):
+            year = r.get('academic_year')
+            if year: self.year[i] = year_index[year]
+
+            name = r['company_name']
+            cid = self.company_index.get(name)
+            if cid is None:
+                cid = self.company_index[name] = len(self.company_names)
+                self.company_names.append(name)
+            self.company[i] = cid
+
+            self.salary[i] = r['salary_lpa']
+            selections = r['selections']
+            self.hires[i] = [selections[b] for b in BRANCHES]
+            gender = r['gender_distribution']
+            self.gender[i] = [gender['male'], gender['female'], gender['total']]
+
+            self.criteria[i] = r['criteria']
+            if r['criteria']['min_cgpa'] is not None:
+                self.min_cgpa[i] = r['criteria']['min_cgpa']
+
+            self.visit_date[i] = r.get('visit_date')
+            # Normalizing keeps the spelling from the source data; documents stored with a real date have none
+            self.visit_date_raw[i] = r.get('visit_date_raw') or self.visit_date[i]
+            if self.visit_date[i]:
+                self.visit_ts[i] = int((self.visit_date[i] - EPOCH).total_seconds())
+            self.category[i] = r.get('category')
+            self.category_group[i] = r['category_group']
+
+        self.total_hires = self.hires.sum(axis=1)
+
+    @property
+    def n_companies(self):
+        return len(self.company_names)
+
+    def year_of(self, row):
+        return self.years[self.year[row]] if self.year[row] >= 0 else None
+
+    def rows_for_year(self, year):
+        if year not in self.years: return np.zeros(0, dtype=np.intp)
+        return np.flatnonzero(self.year == self.years.index(year))
+
+    def rows_for_companies(self, names):
+        ids = [self.company_index[n] for n in names if n in self.company_index]
+        return np.flatnonzero(np.isin(self.company, ids))
+
+    def sort_by_year_desc(self, rows):
+        # Stable, so ties keep insertion order like a Mongo sort on academic_year
+        return rows[np.argsort(-self.year[rows].astype(np.int32), kind='stable')]
+
+    def visit_datetime(self, ts):
+        return EPOCH + datetime.timedelta(seconds=int(ts)) if ts >= 0 else None
+
+    @functools.cached_property
+    def company_summary(self):
+        """Per-company group-by: hires, years visited, max salary, min cgpa and latest visit.
+
+        Tables are never mutated after construction (a refresh builds a new one), so
+        the result is computed once per table.
+        """
+        nc = self.n_companies
+        total = np.bincount(self.company, weights=self.total_hires, minlength=nc).astype(np.int64)
+
+        max_salary = np.full(nc, -np.inf)
+        np.maximum.at(max_salary, self.company, self.salary)
+
+        min_cgpa = np.full(nc, np.nan)
+        np.fmin.at(min_cgpa, self.company, self.min_cgpa)
+
+        latest_visit = np.full(nc, -1, dtype=np.int64)
+        np.maximum.at(latest_visit, self.company, self.visit_ts)
+
+        with_year = self.year >= 0
+        pairs = np.unique(self.company[with_year].astype(np.int64) * max(len(self.years), 1) + self.year[with_year])
+        years_visited = [[] for _ in range(nc)]
+        for p in pairs:
+            cid, yid = divmod(int(p), max(len(self.years), 1))
+            years_visited[cid].append(self.years[yid])
+
+        return {
+            "total_hires": total,
+            "max_salary": max_salary,
+            "min_cgpa": [None if np.isnan(c) else float(c) for c in min_cgpa],
+            "latest_visit": latest_visit,
+            "years_visited": years_visited
+        }
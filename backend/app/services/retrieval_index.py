@@ -0,0 +1,351 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+import time
+import numpy as np
+from app.core.config import settings
+from app.services.placement_normalize import SCHEMA_VERSION, normalize_record
+from app.services.placement_store import placement_store
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[&.+][a-z0-9]+)*")
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "in", "on", "at", "to", "for", "is", "are", "was", "were",
+    "be", "by", "with", "what", "which", "who", "how", "did", "does", "do", "i", "me", "my", "it",
+    "this", "that", "about", "tell", "please", "can", "you", "from", "as"
+}
+K1, B = 1.2, 0.75
+# Built versions kept on disk (the new one included), so readers in other workers keep theirs
+KEEP_VERSIONS = 3
+# An unfinished version directory older than this is an abandoned build, not one in progress
+ABANDONED_BUILD_SECONDS = 3600
+_VERSION_DIR = re.compile(r'^v(\d+)-\d+$')
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(str(text).casefold()) if t not in STOPWORDS]
+
+def estimate_tokens(text):
+    # Rough tokens-per-word for English prose; only used to keep prompts under a budget
+    return int(len(str(text).split()) * 4 / 3) + 1
+
+def _flatten(value):
+    if isinstance(value, dict):
+        return "; ".join(f"{k.replace('_', ' ')}: {_flatten(v)}" for k, v in value.items() if v not in (None, ''))
+    return str(value)
+
+def placement_doc(r):
+    # Both callers pass raw find() results; unmigrated documents get the same treatment as in PlacementTable
+    if r.get('schema_version') != SCHEMA_VERSION: r = normalize_record(r)
+    sel = r['selections']
+    cgpa = "PPO" if r['criteria'].get('ppo') else (r['criteria'].get('min_cgpa') or "no cutoff")
+    text = (
+        f"{r['company_name']} placement {r.get('academic_year')}: {r.get('category_group')}, "
+        f"package {r['salary_lpa']} LPA, hired {sum(sel.values())} "
+        f"(CE {sel['CE']}, IT {sel['IT']}, E&TC {sel['E&TC']}), min CGPA {cgpa}, "
+        f"branches {', '.join(r['criteria'].get('eligible_branches') or [])}"
+    )
+    return {"id": f"placement:{r['_id']}", "source": "placement", "company": r['company_name'], "text": text}
+
+def experience_doc(r):
+    text = (
+        f"Interview experience at {r.get('company_name')} ({r.get('year')}) for {r.get('role')}, "
+        f"result {r.get('status')}: {r.get('experience', '')} Suggestions: {r.get('suggestions', '')}"
+    )
+    return {"id": f"experience:{r['_id']}", "source": "interview_experience", "company": r.get('company_name'), "text": text}
+
+def feedback_doc(r):
+    parts = [f"T&P feedback on {r.get('company_name')}"]
+    for key in ('students_appeared', 'overall_observation', 'training_suggestions', 'industry_institute_remarks'):
+        if r.get(key): parts.append(f"{key.replace('_', ' ')}: {_flatten(r[key])}")
+    return {"id": f"feedback:{r['_id']}", "source": "company_feedback", "company": r.get('company_name'), "text": ". ".join(parts)}
+
+def load_embedder(name):
+    """Optional local sentence embedder; BM25 alone is used when it is not configured or installed."""
+    if not name: return None
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logging.warning("sentence-transformers is not installed; retrieval uses BM25 only")
+        return None
+    return SentenceTransformer(name)
+
+def build_index(docs, root, placement_version=0, embedder=None):
+    """Writes a new index version under `root` and points CURRENT at it unless a newer build got there first.
+
+    Returns the version directory.
+    """
+    vocab = {}
+    postings = []
+    doc_len = np.zeros(len(docs), dtype=np.float32)
+    for i, doc in enumerate(docs):
+        counts = {}
+        for t in tokenize(doc['text']):
+            counts[t] = counts.get(t, 0) + 1
+        doc_len[i] = sum(counts.values())
+        for t, tf in counts.items():
+            postings.append((vocab.setdefault(t, len(vocab)), i, tf))
+
+    postings.sort()
+    term_ids = np.array([p[0] for p in postings], dtype=np.int64)
+    term_ptr = np.searchsorted(term_ids, np.arange(len(vocab) + 1)).astype(np.int64)
+
+    version_dir = os.path.join(root, f"v{int(time.time() * 1000)}-{os.getpid()}")
+    os.makedirs(version_dir)
+    np.save(os.path.join(version_dir, 'term_ptr.npy'), term_ptr)
+    np.save(os.path.join(version_dir, 'post_doc.npy'), np.array([p[1] for p in postings], dtype=np.int32))
+    np.save(os.path.join(version_dir, 'post_tf.npy'), np.array([p[2] for p in postings], dtype=np.float32))
+    np.save(os.path.join(version_dir, 'doc_len.npy'), doc_len)
+    if embedder is not None and docs:
+        vectors = embedder.encode([d['text'] for d in docs], normalize_embeddings=True)
+        np.save(os.path.join(version_dir, 'vectors.npy'), np.asarray(vectors, dtype=np.float32))
+    with open(os.path.join(version_dir, 'docs.jsonl'), 'w', encoding='utf-8') as f:
+        for doc in docs:
+            f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+    with open(os.path.join(version_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({"vocab": list(vocab), "placement_version": placement_version, "built_at": time.time()}, f)
+
+    # Swap the pointer atomically; readers keep using the version they have mapped.
+    # Another worker may have published a newer build meanwhile, and that one wins.
+    name = os.path.basename(version_dir)
+    current = _read_current(root)
+    if current is None or _built_at(current) <= _built_at(name):
+        tmp = os.path.join(root, f"CURRENT.{os.getpid()}")
+        with open(tmp, 'w') as f:
+            f.write(name)
+        os.replace(tmp, os.path.join(root, 'CURRENT'))
+    prune_versions(root, keep={name, _read_current(root)})
+    return version_dir
+
+def _built_at(name):
+    match = _VERSION_DIR.match(name or '')
+    return int(match.group(1)) if match else -1
+
+def _read_current(root):
+    try:
+        with open(os.path.join(root, 'CURRENT')) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def prune_versions(root, keep=()):
+    """Deletes complete versions beyond the newest KEEP_VERSIONS and abandoned half-written builds.
+
+    Every worker rebuilds on a data change, so versions still being written by
+    another worker (no meta.json yet) are left alone unless they are clearly abandoned.
+    """
+    complete, now_ms = [], time.time() * 1000
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if not _VERSION_DIR.match(name) or name in keep or not os.path.isdir(path): continue
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            complete.append(name)
+        elif now_ms - _built_at(name) > ABANDONED_BUILD_SECONDS * 1000:
+            shutil.rmtree(path, ignore_errors=True)
+    complete.sort(key=_built_at, reverse=True)
+    for name in complete[max(KEEP_VERSIONS - len(keep), 0):]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)  # mapped files on Windows stay until the next build
+
+class RetrievalIndex:
+    """BM25 (plus optional embedding) index over placements, interview experiences and company feedback.
+
+    The built segment is a set of memory-mapped .npy arrays; documents posted since
+    the last build live in a small in-memory delta segment that is also appended to
+    delta.jsonl, so they survive restarts until the next rebuild folds them in.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.embedder = None
+        self.placement_version = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._pending_version = None
+        self._set_base(None)
+        self._reset_delta()
+
+    def _set_base(self, version_dir):
+        if version_dir is None:
+            self.docs, self.vocab = [], {}
+            self.term_ptr = np.zeros(1, dtype=np.int64)
+            self.post_doc = np.zeros(0, dtype=np.int32)
+            self.post_tf = np.zeros(0, dtype=np.float32)
+            self.doc_len = np.zeros(0, dtype=np.float32)
+            self.vectors = None
+            return
+        load = lambda name: np.load(os.path.join(version_dir, name), mmap_mode='r')
+        with open(os.path.join(version_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(version_dir, 'docs.jsonl'), encoding='utf-8') as f:
+            docs = [json.loads(line) for line in f]
+        self.vocab = {t: i for i, t in enumerate(meta['vocab'])}
+        self.term_ptr, self.post_doc, self.post_tf, self.doc_len = (
+            load('term_ptr.npy'), load('post_doc.npy'), load('post_tf.npy'), load('doc_len.npy'))
+        vectors_path = os.path.join(version_dir, 'vectors.npy')
+        self.vectors = np.load(vectors_path, mmap_mode='r') if os.path.exists(vectors_path) else None
+        self.placement_version = meta.get('placement_version')
+        self.docs = docs
+
+    def _reset_delta(self):
+        self.delta_docs = []
+        self.delta_postings = {}
+        self.delta_len = []
+        self.delta_vectors = []
+
+    @property
+    def size(self):
+        return len(self.docs) + len(self.delta_docs)
+
+    def load(self):
+        current = os.path.join(self.root, 'CURRENT')
+        if not os.path.exists(current): return False
+        with open(current) as f:
+            version_dir = os.path.join(self.root, f.read().strip())
+        self.embedder = load_embedder(settings.RETRIEVAL_EMBEDDING_MODEL)
+        with self._lock:
+            self._set_base(version_dir)
+            self._reset_delta()
+            known = {d['id'] for d in self.docs}
+            delta_path = os.path.join(self.root, 'delta.jsonl')
+            if os.path.exists(delta_path):
+                with open(delta_path, encoding='utf-8') as f:
+                    for line in f:
+                        doc = json.loads(line)
+                        if doc['id'] not in known: self._add_delta(doc)
+        logging.info(f"Loaded retrieval index {os.path.basename(version_dir)} ({self.size} docs)")
+        return True
+
+    def _add_delta(self, doc):
+        local = len(self.docs) + len(self.delta_docs)
+        counts = {}
+        for t in tokenize(doc['text']):
+            counts[t] = counts.get(t, 0) + 1
+        for t, tf in counts.items():
+            self.delta_postings.setdefault(t, []).append((local, tf))
+        self.delta_len.append(sum(counts.values()))
+        self.delta_docs.append(doc)
+        if self.embedder is not None and self.vectors is not None:
+            self.delta_vectors.append(np.asarray(self.embedder.encode([doc['text']], normalize_embeddings=True)[0], dtype=np.float32))
+
+    def add(self, doc):
+        """Indexes a newly posted experience or feedback without a rebuild."""
+        with self._lock:
+            self._add_delta(doc)
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, 'delta.jsonl'), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+
+    def search(self, query, k=None, boost_terms=()):
+        k = k or settings.RETRIEVAL_TOP_K
+        terms = tokenize(query) + [t for term in boost_terms for t in tokenize(term)]
+        n = self.size
+        if not terms or n == 0: return []
+        doc_len = np.concatenate([self.doc_len, np.asarray(self.delta_len, dtype=np.float32)])
+        avgdl = float(doc_len.mean()) or 1.0
+        scores = np.zeros(n, dtype=np.float32)
+        for t in terms:
+            docs, tfs = [], []
+            tid = self.vocab.get(t)
+            if tid is not None:
+                lo, hi = self.term_ptr[tid], self.term_ptr[tid + 1]
+                docs.append(self.post_doc[lo:hi]); tfs.append(self.post_tf[lo:hi])
+            delta = self.delta_postings.get(t)
+            if delta:
+                docs.append(np.array([d for d, _ in delta], dtype=np.int32))
+                tfs.append(np.array([tf for _, tf in delta], dtype=np.float32))
+            if not docs: continue
+            docs, tfs = np.concatenate(docs), np.concatenate(tfs)
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (K1 + 1) / (tfs + K1 * (1 - B + B * doc_len[docs] / avgdl))
+
+        if self.embedder is not None and self.vectors is not None and scores.max() > 0:
+            query_vec = np.asarray(self.embedder.encode([query], normalize_embeddings=True)[0], dtype=np.float32)
+            vectors = np.vstack([self.vectors] + self.delta_vectors) if self.delta_vectors else self.vectors
+            cosine = np.zeros(n, dtype=np.float32)
+            cosine[:len(vectors)] = vectors @ query_vec
+            scores = scores / scores.max() + settings.RETRIEVAL_VECTOR_WEIGHT * cosine
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        all_docs = self.docs + self.delta_docs
+        return [(float(scores[i]), all_docs[i]) for i in top if scores[i] > 0]
+
+    def context(self, query, boost_terms=(), token_budget=None):
+        """Top-k document texts joined into a context block of at most ~token_budget tokens."""
+        budget = settings.RETRIEVAL_TOKEN_BUDGET if token_budget is None else token_budget
+        if budget <= 0: return []
+        parts, used = [], 0
+        for _, doc in self.search(query, boost_terms=boost_terms):
+            words = doc['text'].split()
+            cost = estimate_tokens(doc['text'])
+            if used + cost > budget:
+                remaining = int((budget - used) * 3 / 4)
+                if remaining < 20: break
+                words, cost = words[:remaining] + ["..."], budget - used
+            parts.append(" ".join(words))
+            used += cost
+        return parts
+
+    async def rebuild_from_db(self, db):
+        """Reads all three collections and builds a fresh version on a worker thread."""
+        placements = await db['placement_records'].find().to_list(None)
+        experiences = await db['interview_experience'].find().to_list(None)
+        feedback = await db['company_feedback'].find().to_list(None)
+        docs = [placement_doc(r) for r in placements] + [experience_doc(r) for r in experiences] + [feedback_doc(r) for r in feedback]
+        version = placement_store.version
+        loop = asyncio.get_running_loop()
+        embedder = load_embedder(settings.RETRIEVAL_EMBEDDING_MODEL)
+        version_dir = await loop.run_in_executor(None, build_index, docs, self.root, version, embedder)
+        with self._lock:
+            pending = list(self.delta_docs)
+            self.embedder = embedder
+            self._set_base(version_dir)
+            self._reset_delta()
+            built = {d['id'] for d in self.docs}
+            # Keep anything posted while the build was running
+            for doc in pending:
+                if doc['id'] not in built: self._add_delta(doc)
+            with open(os.path.join(self.root, 'delta.jsonl'), 'w', encoding='utf-8') as f:
+                for doc in self.delta_docs:
+                    f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+        logging.info(f"Built retrieval index {os.path.basename(version_dir)} ({self.size} docs)")
+
+    async def load_or_build(self, db):
+        # A saved index built against older placement records is rebuilt rather than served
+        if not self.load() or (placement_store.loaded and self.placement_version != placement_store.version):
+            os.makedirs(self.root, exist_ok=True)
+            await self.rebuild_from_db(db)
+
+    def on_placements_changed(self, table, version):
+        # Placement rows are part of the built segment, so a data change means a rebuild.
+        # Before the first load, load_or_build makes that decision instead.
+        if self.placement_version is None or version == self.placement_version: return
+        if self._rebuilding:
+            # Picked up by the running rebuild once it finishes
+            self._pending_version = version
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        async def rebuild():
+            from app.db.mongodb import get_database
+            self._rebuilding = True
+            try:
+                while True:
+                    self._pending_version = None
+                    try:
+                        await self.rebuild_from_db(get_database())
+                    except Exception as e:
+                        logging.error(f"Retrieval index rebuild failed: {e}")
+                    if self._pending_version in (None, self.placement_version): break
+            finally:
+                self._rebuilding = False
+        loop.create_task(rebuild())
+
+retrieval_index = RetrievalIndex(settings.RETRIEVAL_INDEX_DIR)
+placement_store.on_change(retrieval_index.on_placements_changed)
@@ -0,0 +1,61 @@
+import numpy as np
+
+class WeightedStats:
+    """Mean/median/percentiles over (value, weight) pairs without expanding them.
+
+    Weights act as repeat counts (e.g. a salary weighted by the number of hires), so
+    every result equals the one computed on the expanded list, while the cost is one
+    sort over the pairs instead of one over every hire.
+    """
+
+    def __init__(self, values, weights=None):
+        values = np.asarray(values, dtype=float)
+        weights = np.ones_like(values) if weights is None else np.asarray(weights, dtype=float)
+        keep = weights > 0
+        values, weights = values[keep], weights[keep]
+        order = np.argsort(values, kind='stable')
+        self.values = values[order]
+        self.weights = weights[order]
+        self.cum_weights = np.cumsum(self.weights)
+        self.total_weight = float(self.cum_weights[-1]) if len(self.cum_weights) else 0.0
+
+    @property
+    def empty(self):
+        return self.total_weight == 0
+
+    @property
+    def mean(self):
+        if self.empty: return 0.0
+        return float(np.dot(self.values, self.weights) / self.total_weight)
+
+    @property
+    def max(self):
+        if self.empty: return 0.0
+        return float(self.values[-1])
+
+    @property
+    def median(self):
+        return self.percentile(50)
+
+    def _values_at(self, ranks):
+        # Value sitting at 0-based position `rank` of the expanded, sorted list
+        idx = np.searchsorted(self.cum_weights, ranks, side='right')
+        return self.values[np.minimum(idx, len(self.values) - 1)]
+
+    def percentiles(self, ps):
+        """Linear-interpolated percentiles (numpy's default method) for each p in 0..100."""
+        ps = np.asarray(ps, dtype=float)
+        if self.empty: return np.zeros_like(ps)
+        pos = ps / 100.0 * (self.total_weight - 1)
+        lo, hi = np.floor(pos), np.ceil(pos)
+        frac = pos - lo
+        return self._values_at(lo) * (1 - frac) + self._values_at(hi) * frac
+
+    def percentile(self, p):
+        return float(self.percentiles([p])[0])
+
+    def summary(self, percentiles=()):
+        result = {"count": self.total_weight, "mean": self.mean, "median": self.median, "max": self.max}
+        for p, v in zip(percentiles, self.percentiles(percentiles)):
+            result[f"p{p:g}"] = float(v)
+        return result
@@ -0,0 +1,63 @@
+# Run from backend/: python -m benchmarks.bench_admin_students
+# Response size and latency of the admin student table: the old handler (every
+# student, sorted and formatted in Python) vs one keyset page of /api/admin/students,
+# first page and a deep page reached through next_cursor. Students live in an
+# in-memory mongomock-motor database, which sorts the whole collection for every
+# query; against MongoDB a page walks limit + 1 index entries, so compare KiB here
+# and treat the ms column as the mock's cost, not the server's.
+import asyncio
+import time
+import httpx
+from mongomock_motor import AsyncMongoMockClient
+from app.api.deps import require_admin
+from app.api.endpoints.admin import format_student
+from app.db import mongodb
+from app.main import app
+from benchmarks.bench_cohort_scoring import make_students
+
+COHORT_SIZES = (1000, 5000)
+PAGE = 50
+
+async def old_listing():
+    # Pre-change handler: the whole collection in one response
+    students = await mongodb.db.db['students'].find({}, {'password': 0}).sort('created_at', -1).to_list(None)
+    return [format_student(s) for s in students]
+
+async def timed(fn, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+async def main():
+    app.dependency_overrides[require_admin] = lambda: {"role": "admin"}
+    print(f"{'students':>9} {'mode':>12} {'KiB':>9} {'ms':>8}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for n in COHORT_SIZES:
+            mongodb.db.db = AsyncMongoMockClient()["bench_admin"]
+            students = make_students(n)
+            for i, s in enumerate(students):
+                s["created_at"] = f"2025-01-01T00:00:{i // 1000:02d}.{i % 1000:03d}"
+                s["department"] = ("CE", "IT", "E&TC")[i % 3]
+            await mongodb.db.db["students"].insert_many(students)
+
+            async def full():
+                return httpx.Response(200, json=await old_listing())
+            async def first():
+                return await client.get("/api/admin/students", params={"limit": PAGE})
+            cursor = None
+            for _ in range(n // PAGE // 2):
+                cursor = (await client.get("/api/admin/students", params={"limit": PAGE, "cursor": cursor} if cursor else {"limit": PAGE})).json()["next_cursor"]
+            async def deep():
+                return await client.get("/api/admin/students", params={"limit": PAGE, "cursor": cursor})
+            async def filtered():
+                return await client.get("/api/admin/students", params={"limit": PAGE, "dept": "IT", "min_cgpa": 8, "sort": "amcat_score"})
+
+            for mode, fn in (("all (old)", full), ("first page", first), ("middle page", deep), ("filtered", filtered)):
+                response, ms = await timed(fn)
+                print(f"{n:>9} {mode:>12} {len(response.content) / 1024:>9.1f} {ms:>8.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+# Run from backend/: python -m benchmarks.bench_auth_tokens
+# Cost of authenticating a request: signing and verifying an access token, and the
+# full current_user dependency with a warm user cache (no database) vs a cold one
+# (one find_one per request, against an in-memory mongomock-motor database here, so
+# a real Mongo round trip would cost more).
+import asyncio
+import time
+from fastapi.security import HTTPAuthorizationCredentials
+from mongomock_motor import AsyncMongoMockClient
+from app.api.deps import token_claims, current_user
+from app.db import mongodb
+from app.services.auth_tokens import token_signer, user_cache
+
+def per_call_us(fn, min_seconds=0.5):
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        fn()
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+async def async_per_call_us(fn, min_seconds=0.5):
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        await fn()
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1e6
+
+async def main():
+    mongodb.db.db = AsyncMongoMockClient()["bench_auth"]
+    await mongodb.db.db["students"].insert_many(
+        [{"email": f"student{i}@example.edu", "full_name": f"Student {i}", "role": "student"} for i in range(1000)])
+    token, _ = token_signer.issue("student500@example.edu", "student")
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def authenticate():
+        return await current_user(await token_claims(credentials))
+
+    async def cold():
+        user_cache.invalidate("student500@example.edu")
+        return await authenticate()
+
+    print(f"{'step':>28} {'us/call':>9}")
+    print(f"{'issue token':>28} {per_call_us(lambda: token_signer.issue('a@example.edu', 'student')):>9.1f}")
+    print(f"{'verify token':>28} {per_call_us(lambda: token_signer.verify(token)):>9.1f}")
+    print(f"{'current_user, cached user':>28} {await async_per_call_us(authenticate):>9.1f}")
+    print(f"{'current_user, user lookup':>28} {await async_per_call_us(cold):>9.1f}")
+    print("user cache:", user_cache.stats())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+# Run from backend/: python -m benchmarks.bench_chat_coalescing
+# A burst of students asking the same few questions through /api/chat, against the
+# simulator backend, counting how many generations it is asked for. Arrivals are
+# spread over the generation time, so most requests join a stream that is already
+# under way and need the emitted prefix replayed. "independent" gives every
+# request its own upstream stream, so admission control sheds what cannot start in
+# time; "coalesced" is ChatCoalescer.
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+import httpx
+from app.core.config import settings
+from app.main import app
+from app.services.chat_backends import SimulatedBackend
+from app.services.chat_cache import chat_cache
+from app.services.chat_coalescer import chat_coalescer
+from app.services.chatbot_service import chatbot_service
+from app.services.placement_store import placement_store
+from app.services.placement_table import PlacementTable
+
+QUESTIONS = [
+    "what is the highest package this year",
+    "which companies are visiting next week",
+    "how many students got placed in IT",
+    "tell me about the Barclays interview",
+    "average package for CE",
+]
+REQUESTS = 200
+ARRIVAL_WINDOW = 0.3
+CHUNKS = 20
+CHUNK_DELAY = 0.02
+
+class CountingBackend(SimulatedBackend):
+    def __init__(self):
+        delay_ms = CHUNK_DELAY * 1000
+        super().__init__(ttft_ms=delay_ms, token_delay_ms=delay_ms, tokens=CHUNKS, failure_rate=0)
+        self.calls = Counter()
+
+    def stream(self, prompt):
+        self.calls[next(q for q in QUESTIONS if q in prompt)] += 1
+        return super().stream(prompt)
+
+def independent(key, start_stream, on_done=None):
+    async def chunks():
+        try:
+            async for chunk in start_stream():
+                yield chunk
+        finally:
+            if on_done: on_done()
+    return chunks(), False
+
+async def run(mode):
+    backend = chatbot_service.backend = CountingBackend()
+    chat_cache.clear()
+    subscribe = chat_coalescer.subscribe
+    if mode == "independent":
+        chat_coalescer.subscribe = independent
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            rng = random.Random(7)
+            async def one(student, question, delay):
+                await asyncio.sleep(delay)
+                start = time.perf_counter()
+                response = await client.post("/api/chat", json={"query": question, "user": f"student{student}"})
+                return question, response.status_code, response.text, (time.perf_counter() - start) * 1000
+            results = await asyncio.gather(*[
+                one(i, rng.choice(QUESTIONS), rng.uniform(0, ARRIVAL_WINDOW)) for i in range(REQUESTS)
+            ])
+    finally:
+        chat_coalescer.subscribe = subscribe
+
+    # The simulator's answer depends only on the prompt, so every copy must match word for word
+    answers = {}
+    for q, status, text, _ in results:
+        if status == 200: answers.setdefault(q, Counter())[text] += 1
+    complete = sum(c for q, texts in answers.items() for text, c in texts.items()
+                   if len(texts) == 1 and len(text.split()) == CHUNKS)
+    shed = sum(status != 200 for _, status, _, _ in results)
+    latencies = sorted(ms for _, status, _, ms in results if status == 200)
+    return sum(backend.calls.values()), max(backend.calls.values()), complete, shed, statistics.median(latencies), latencies[-1]
+
+async def main():
+    settings.PLACEMENT_VERSION_CHECK_SECONDS = 10**6
+    placement_store._swap(PlacementTable([]), 0)
+    print(f"{REQUESTS} requests over {ARRIVAL_WINDOW * 1000:.0f} ms, {len(QUESTIONS)} unique questions; "
+          f"each answer {CHUNKS} chunks x {CHUNK_DELAY * 1000:.0f} ms; stream cap {settings.CHAT_MAX_CONCURRENT_STREAMS}")
+    print(f"{'mode':>12} {'upstream':>9} {'max/question':>13} {'complete':>9} {'shed':>5} {'p50 ms':>9} {'max ms':>9}")
+    for mode in ("independent", "coalesced"):
+        upstream, per_question, complete, shed, p50, worst = await run(mode)
+        print(f"{mode:>12} {upstream:>9} {per_question:>13} {complete:>9} {shed:>5} {p50:>9.1f} {worst:>9.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
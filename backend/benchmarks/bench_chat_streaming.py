@@ -0,0 +1,67 @@
+# Run from backend/: python -m benchmarks.bench_chat_streaming
+# Streams N chats through /api/chat against the simulator backend, whose chunks block
+# the calling thread (like the Gemini SDK), while timing /health on the same event loop.
+# "inline" iterates the blocking stream on the event loop (the old behaviour),
+# "threaded" is ChatbotService's worker-thread bridge.
+import asyncio
+import statistics
+import time
+import httpx
+from app.core.config import settings
+from app.main import app
+from app.services.chat_backends import SimulatedBackend
+from app.services.chatbot_service import chatbot_service, ChatStream
+from app.services.placement_store import placement_store
+from app.services.placement_table import PlacementTable
+
+CHUNKS = 20
+CHUNK_DELAY = 0.02
+HEALTH_PROBES = 40
+PROBE_INTERVAL = 0.01
+
+def inline_stream(query, context_string):
+    # Pre-change ChatbotService: the blocking iterator runs on the event loop
+    async def chunks():
+        for text in chatbot_service.backend.stream(query):
+            yield text
+    stream = ChatStream()
+    stream.chunks = chunks()
+    return stream
+
+async def run(n_chats, mode):
+    threaded = chatbot_service.get_chat_response_stream
+    if mode == "inline":
+        chatbot_service.get_chat_response_stream = inline_stream
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            chats = [asyncio.create_task(client.post("/api/chat", json={"query": f"question {i}"})) for i in range(n_chats)]
+            # Probes are due on a fixed schedule; latency counts from when each was due,
+            # so time spent waiting for a blocked event loop is included
+            latencies = []
+            start = time.perf_counter()
+            for k in range(HEALTH_PROBES):
+                due = start + k * PROBE_INTERVAL
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+                await client.get("/health")
+                latencies.append((time.perf_counter() - due) * 1000)
+            await asyncio.gather(*chats)
+    finally:
+        chatbot_service.get_chat_response_stream = threaded
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+async def main():
+    settings.PLACEMENT_VERSION_CHECK_SECONDS = 10**6
+    placement_store._swap(PlacementTable([]), 0)
+    delay_ms = CHUNK_DELAY * 1000
+    chatbot_service.backend = SimulatedBackend(ttft_ms=delay_ms, token_delay_ms=delay_ms, tokens=CHUNKS, failure_rate=0)
+    print(f"each chat: {CHUNKS} chunks x {CHUNK_DELAY * 1000:.0f} ms; stream cap {settings.CHAT_MAX_CONCURRENT_STREAMS}")
+    print(f"{'mode':>9} {'chats':>6} {'/health p50 ms':>15} {'/health p99 ms':>15}")
+    for mode in ("inline", "threaded"):
+        for n in (0, 4, 16):
+            p50, p99 = await run(n, mode)
+            print(f"{mode:>9} {n:>6} {p50:>15.2f} {p99:>15.2f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+# Run from backend/: python -m benchmarks.bench_cohort_scoring [--mongo]
+# Runs the cohort scoring job over N seeded students and reports rows/s, comparing it
+# with scoring one student at a time (what calling /predict_placement per student
+# amounts to), then checks the stored probabilities match MLService.
+# By default students live in a dict-backed stand-in for the collection, so the
+# numbers are the job's own cost; --mongo seeds a scratch bench_cohort database at
+# MONGO_URI instead and includes real cursor and bulk_write round trips.
+# Needs model/placement_model.pkl (python model/train_model.py).
+import asyncio
+import sys
+import time
+import numpy as np
+from bson import ObjectId
+from app.core.config import settings
+from app.services.cohort_scoring import CohortScorer, SCORE_FIELD
+from app.services.ml_service import ml_service, student_features
+from benchmarks.bench_predict_batch import make_cohort
+
+COHORT_SIZES = (1000, 10000, 50000)
+ONE_BY_ONE_LIMIT = 2000
+
+class MemoryCursor:
+    def __init__(self, docs, projection):
+        self.docs, self.fields = docs, [f for f, on in projection.items() if on]
+
+    def batch_size(self, n):
+        return self
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield {'_id': doc['_id'], **{f: doc[f] for f in self.fields if f in doc}}
+
+class MemoryStudents:
+    def __init__(self):
+        self.by_id = {}
+
+    async def insert_many(self, docs):
+        for doc in docs:
+            self.by_id[doc.setdefault('_id', ObjectId())] = doc
+
+    async def create_index(self, keys):
+        return keys
+
+    def find(self, query, projection):
+        return MemoryCursor(list(self.by_id.values()), projection)
+
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            self.by_id[op._filter['_id']].update(op._doc['$set'])
+
+    async def drop(self):
+        self.by_id.clear()
+
+    async def stored(self):
+        return list(self.by_id.values())
+
+def make_students(n):
+    return [
+        {
+            "email": f"student{i}@example.edu",
+            "full_name": f"Student {i}",
+            "college_cgpa": s["cgpa"],
+            "tenth_percentage": s["tenth_score"],
+            "twelfth_percentage": s["twelfth_score"],
+            "amcat_score": s["amcat_score"],
+        }
+        for i, s in enumerate(make_cohort(n, seed=n))
+    ]
+
+def database():
+    if "--mongo" in sys.argv:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        return AsyncIOMotorClient(settings.MONGODB_URL)["bench_cohort"]
+    return {"students": MemoryStudents()}
+
+async def stored_docs(students):
+    if isinstance(students, MemoryStudents):
+        return await students.stored()
+    return await students.find({}).to_list(None)
+
+async def one_by_one(docs):
+    # One validated prediction per student, as the per-request endpoint does
+    start = time.perf_counter()
+    for doc in docs:
+        ml_service.cache.clear()
+        ml_service.predict(student_features(doc))
+    return len(docs) / (time.perf_counter() - start)
+
+async def main():
+    if ml_service.model is None:
+        print("No model loaded; run python model/train_model.py first")
+        return
+    scorer = CohortScorer(ml_service, settings.COHORT_SCORING_BATCH_SIZE)
+    print(f"batch size {scorer.batch_size}, {'MongoDB' if '--mongo' in sys.argv else 'in-memory collection'}")
+    print(f"{'students':>9} {'job rows/s':>11} {'seconds':>8} {'one-by-one rows/s':>18} {'matches':>8}")
+    for n in COHORT_SIZES:
+        db = database()
+        students = db["students"]
+        await students.drop()
+        await students.insert_many(make_students(n))
+        stats = await scorer.run(db)
+
+        docs = await stored_docs(students)
+        single = await one_by_one(docs[:ONE_BY_ONE_LIMIT])
+        expected = [ml_service.predict(student_features(d))['placement_probability'] for d in docs[:ONE_BY_ONE_LIMIT]]
+        stored = [d[SCORE_FIELD]["probability"] for d in docs[:ONE_BY_ONE_LIMIT]]
+        matches = bool(np.allclose(stored, expected)) and all(SCORE_FIELD in d for d in docs)
+        print(f"{n:>9} {stats['rows_per_second']:>11.0f} {stats['seconds']:>8.2f} {single:>18.0f} {matches!s:>8}")
+        await students.drop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
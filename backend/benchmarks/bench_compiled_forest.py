@@ -0,0 +1,48 @@
+# Run from backend/: python -m benchmarks.bench_compiled_forest
+# Per-call latency of sklearn's predict_proba vs CompiledForest for batch sizes 1, 10
+# and 1000, plus the equivalence check: probabilities must match sklearn's exactly on
+# random rows (including rows sitting on split thresholds) and on a synthetic cohort.
+# MLService only takes the compiled path up to ML_COMPILED_MAX_ROWS rows per call.
+# Needs model/placement_model.pkl (python model/train_model.py).
+import time
+import numpy as np
+import pandas as pd
+from app.services.compiled_forest import CompiledForest, probe_matrix
+from app.services.ml_service import ml_service, FEATURE_NAMES, build_feature_matrix
+from benchmarks.bench_predict_batch import make_cohort
+
+BATCH_SIZES = (1, 10, 1000)
+
+def timed(fn, X, min_seconds=0.5):
+    fn(X)
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        fn(X)
+        calls += 1
+    return (time.perf_counter() - start) / calls * 1000
+
+def main():
+    model = ml_service.model
+    if model is None:
+        print("No model loaded; run python model/train_model.py first")
+        return
+    compiled = CompiledForest(model)
+    sklearn_proba = lambda X: model.predict_proba(pd.DataFrame(X, columns=FEATURE_NAMES))
+
+    cohort = build_feature_matrix(make_cohort(2000))
+    for name, X in (("threshold probes", probe_matrix(compiled, 4096)), ("student cohort", cohort)):
+        diff = np.abs(sklearn_proba(X) - compiled.predict_proba(X)).max()
+        same_labels = (sklearn_proba(X).argmax(axis=1) == compiled.predict_proba(X).argmax(axis=1)).all()
+        print(f"equivalence on {len(X)} {name}: max |dp| = {diff:.2e}, labels identical: {same_labels}")
+
+    print(f"{len(compiled.roots)} trees, {len(compiled.feature)} nodes")
+    print(f"{'batch':>6} {'sklearn ms':>11} {'compiled ms':>12} {'speedup':>8} {'MLService ms':>13}")
+    for n in BATCH_SIZES:
+        X = np.resize(cohort, (n, cohort.shape[1]))
+        a, b = timed(sklearn_proba, X), timed(compiled.predict_proba, X)
+        # What the service actually runs: compiled up to ML_COMPILED_MAX_ROWS, sklearn beyond
+        served = timed(ml_service.predict_matrix, X)
+        print(f"{n:>6} {a:>11.3f} {b:>12.3f} {a / b:>7.1f}x {served:>13.3f}")
+
+if __name__ == "__main__":
+    main()
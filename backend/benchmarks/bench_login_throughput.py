@@ -0,0 +1,85 @@
+# Run from backend/: python -m benchmarks.bench_login_throughput
+# Fires N concurrent /api/login requests while timing /health on the same event loop.
+# "inline" hashes on the event loop (the old handlers); "pool-1" and "pool-N" go
+# through PasswordHasher with 1 and N threads (N = PASSWORD_HASH_WORKERS, the core
+# count by default), so logins/s should scale with cores while /health stays fast.
+# Users live in an in-memory mongomock-motor database; a quarter of them start with
+# an old pbkdf2 hash, which the first login upgrades to PASSWORD_HASH_METHOD.
+import asyncio
+import os
+import statistics
+import time
+import httpx
+from mongomock_motor import AsyncMongoMockClient
+from werkzeug.security import generate_password_hash
+from app.core.config import settings
+from app.db import mongodb
+from app.main import app
+from app.services.password_hasher import password_hasher, PasswordHasher
+
+USERS = 64
+CONCURRENCY = (1, 16, 64)
+HEALTH_PROBES = 40
+PROBE_INTERVAL = 0.01
+PASSWORD = "correct horse battery"
+
+async def seed():
+    db = AsyncMongoMockClient()["bench_login"]
+    current, legacy = generate_password_hash(PASSWORD, settings.PASSWORD_HASH_METHOD), generate_password_hash(PASSWORD, "pbkdf2:sha256:600000")
+    await db["students"].insert_many([
+        {"email": f"student{i}@example.edu", "full_name": f"Student {i}", "role": "student",
+         "password": legacy if i % 4 == 0 else current}
+        for i in range(USERS)
+    ])
+    return db
+
+def use(hasher):
+    # The auth routes import the singleton, so swap its pool in place
+    password_hasher._executor = hasher._executor
+    password_hasher.workers = hasher.workers
+
+async def inline_submit(fn, *args):
+    # Pre-change handlers: werkzeug ran right here on the event loop
+    return fn(*args)
+
+async def run(n):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        async def one(i):
+            r = await client.post("/api/login", json={"email": f"student{i % USERS}@example.edu", "password": PASSWORD})
+            assert r.status_code == 200, r.text
+            return time.perf_counter()
+        logins = [asyncio.create_task(one(i)) for i in range(n)]
+        latencies = []
+        for k in range(HEALTH_PROBES):
+            due = start + k * PROBE_INTERVAL
+            await asyncio.sleep(max(due - time.perf_counter(), 0))
+            await client.get("/health")
+            latencies.append((time.perf_counter() - due) * 1000)
+        elapsed = max(await asyncio.gather(*logins)) - start
+    latencies.sort()
+    return n / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+async def main():
+    mongodb.db.db = await seed()
+    workers = settings.PASSWORD_HASH_WORKERS
+    print(f"{os.cpu_count()} cores, method {password_hasher.prefix}")
+    print(f"{'mode':>8} {'concurrent':>11} {'logins/s':>9} {'/health p50 ms':>15} {'/health p99 ms':>15}")
+    submit = password_hasher._submit
+    modes = [("inline", None), ("pool-1", 1)] + ([(f"pool-{workers}", workers)] if workers > 1 else [])
+    for mode, threads in modes:
+        if threads is None:
+            password_hasher._submit = inline_submit
+        else:
+            password_hasher._submit = submit
+            use(PasswordHasher(settings.PASSWORD_HASH_METHOD, threads, settings.PASSWORD_HASH_MAX_QUEUED))
+        for n in CONCURRENCY:
+            throughput, p50, p99 = await run(n)
+            print(f"{mode:>8} {n:>11} {throughput:>9.1f} {p50:>15.2f} {p99:>15.2f}")
+    password_hasher._submit = submit
+    legacy = await mongodb.db.db["students"].count_documents({"password": {"$regex": "^pbkdf2"}})
+    print(f"legacy hashes left: {legacy} of {USERS // 4}")
+    print("hasher:", password_hasher.stats())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+# Run from backend/: python -m benchmarks.bench_predict_batch
+# Scores a cohort through /api/predict_placement one student per request (what the
+# admin panel would have to do today) and through /api/predict_placement/batch in a
+# single request, and checks that both give the same answers.
+# Needs model/placement_model.pkl (python model/train_model.py).
+import asyncio
+import time
+import httpx
+import numpy as np
+from app.api.deps import require_admin
+from app.main import app
+from app.services.ml_service import ml_service
+
+COHORT_SIZES = (10, 100, 500)
+
+def make_cohort(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "cgpa": round(float(np.clip(rng.normal(7.5, 1.2), 5, 10)), 2),
+            "tenth_score": round(float(np.clip(rng.normal(80, 10), 50, 99)), 1),
+            "twelfth_score": round(float(np.clip(rng.normal(78, 10), 50, 99)), 1),
+            "amcat_score": round(float(np.clip(rng.normal(70, 15), 30, 99)), 1),
+            "internships": int(rng.choice(4)),
+            "backlogs": int(rng.choice(3)),
+            "projects": int(rng.integers(0, 5)),
+        }
+        for _ in range(n)
+    ]
+
+async def main():
+    if ml_service.model is None:
+        print("No model loaded; run python model/train_model.py first")
+        return
+    # The batch route is admin-only; the benchmark skips the token check
+    app.dependency_overrides[require_admin] = lambda: {"role": "admin"}
+    print(f"{'students':>9} {'single req/s':>13} {'batch rows/s':>13} {'speedup':>8} {'identical':>10}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for n in COHORT_SIZES:
+            cohort = make_cohort(n)
+
+            start = time.perf_counter()
+            single = [(await client.post("/api/predict_placement", json=s)).json() for s in cohort]
+            single_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = (await client.post("/api/predict_placement/batch", json={"students": cohort})).json()["results"]
+            batch_s = time.perf_counter() - start
+
+            identical = all(
+                a["placement_prediction"] == b["placement_prediction"]
+                and abs(a["placement_probability"] - b["placement_probability"]) < 1e-12
+                for a, b in zip(single, batch)
+            )
+            print(f"{n:>9} {n / single_s:>13.0f} {n / batch_s:>13.0f} {single_s / batch_s:>7.1f}x {str(identical):>10}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
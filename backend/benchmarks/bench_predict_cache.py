@@ -0,0 +1,60 @@
+# Run from backend/: python -m benchmarks.bench_predict_cache
+# Replays slider-style traffic through /api/predict_placement: a few students each
+# nudging one field back and forth, so the same feature rows keep coming back.
+# Compares request latency with the prediction cache disabled and enabled, checks
+# both give identical answers, and prints the cache's hit rate.
+# Needs model/placement_model.pkl (python model/train_model.py).
+import asyncio
+import statistics
+import time
+import httpx
+import numpy as np
+from app.main import app
+from app.services.ml_service import ml_service
+from benchmarks.bench_predict_batch import make_cohort
+
+STUDENTS = 20
+REQUESTS = 2000
+
+def slider_traffic(n, seed=0):
+    rng = np.random.default_rng(seed)
+    base = make_cohort(STUDENTS, seed)
+    steps = {"cgpa": 0.1, "amcat_score": 1.0, "projects": 1}
+    traffic = []
+    for _ in range(n):
+        student = dict(base[rng.integers(STUDENTS)])
+        field = rng.choice(list(steps))
+        student[field] = round(student[field] + steps[field] * int(rng.integers(-3, 4)), 2)
+        traffic.append(student)
+    return traffic
+
+async def run(client, traffic):
+    latencies, answers = [], []
+    for student in traffic:
+        start = time.perf_counter()
+        answers.append((await client.post("/api/predict_placement", json=student)).json())
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return answers, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+async def main():
+    if ml_service.model is None:
+        print("No model loaded; run python model/train_model.py first")
+        return
+    traffic = slider_traffic(REQUESTS)
+    print(f"{REQUESTS} requests over {len({tuple(s.values()) for s in traffic})} distinct inputs")
+    print(f"{'cache':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    size = ml_service.cache.max_entries
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        results = {}
+        for label, max_entries in (("off", 0), ("on", size)):
+            ml_service.cache.max_entries = max_entries
+            ml_service.cache.clear()
+            ml_service.cache.hits = ml_service.cache.misses = 0
+            results[label], p50, p99 = await run(client, traffic)
+            print(f"{label:>6} {p50:>8.3f} {p99:>8.3f}")
+    print("identical answers:", results["off"] == results["on"])
+    print("cache:", ml_service.cache.stats())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+# Run from backend/: python -m benchmarks.bench_predict_concurrency
+# Fires N concurrent single-student requests at /api/predict_placement while timing
+# /health on the same event loop. "inline" scores each request on the event loop
+# (the old handler); "batched" goes through InferenceBatcher. The prediction cache is
+# off for both modes, since both send the same students and the second mode would
+# otherwise be served from the cache (see bench_predict_cache.py for that).
+# Needs model/placement_model.pkl (python model/train_model.py).
+import asyncio
+import statistics
+import time
+import httpx
+from app.main import app
+from app.services.inference_batcher import inference_batcher
+from app.services.ml_service import ml_service
+from benchmarks.bench_predict_batch import make_cohort
+
+CONCURRENCY = (1, 16, 64, 256)
+HEALTH_PROBES = 40
+PROBE_INTERVAL = 0.01
+
+async def inline_predict(data):
+    # Pre-change handler: sklearn runs right here on the event loop
+    return ml_service.predict(data)
+
+async def run(n, mode):
+    batched = inference_batcher.predict
+    if mode == "inline":
+        inference_batcher.predict = inline_predict
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            start = time.perf_counter()
+            async def one(student):
+                await client.post("/api/predict_placement", json=student)
+                return time.perf_counter()
+            requests = [asyncio.create_task(one(s)) for s in make_cohort(n, seed=n)]
+            # Probes are due on a fixed schedule; latency counts from when each was due
+            latencies = []
+            for k in range(HEALTH_PROBES):
+                due = start + k * PROBE_INTERVAL
+                await asyncio.sleep(max(due - time.perf_counter(), 0))
+                await client.get("/health")
+                latencies.append((time.perf_counter() - due) * 1000)
+            elapsed = max(await asyncio.gather(*requests)) - start
+    finally:
+        inference_batcher.predict = batched
+    latencies.sort()
+    return n / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+async def main():
+    if ml_service.model is None:
+        print("No model loaded; run python model/train_model.py first")
+        return
+    ml_service.cache.clear()
+    ml_service.cache.max_entries = 0
+    print(f"max batch {inference_batcher.max_batch}, max wait {inference_batcher.max_wait * 1000:.0f} ms")
+    print(f"{'mode':>8} {'concurrent':>11} {'predictions/s':>14} {'/health p50 ms':>15} {'/health p99 ms':>15}")
+    for mode in ("inline", "batched"):
+        for n in CONCURRENCY:
+            throughput, p50, p99 = await run(n, mode)
+            print(f"{mode:>8} {n:>11} {throughput:>14.0f} {p50:>15.2f} {p99:>15.2f}")
+    stats = inference_batcher.stats()
+    print("batcher:", stats)
+    assert stats['batches'] > 0, "batched mode never reached the batcher"
+
+if __name__ == "__main__":
+    asyncio.run(main())
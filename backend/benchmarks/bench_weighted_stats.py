@@ -0,0 +1,44 @@
+# Run from backend/: python -m benchmarks.bench_weighted_stats
+# Compares the old "repeat each salary once per hire" median with WeightedStats.
+# The number of records stays fixed while hires per record grow, so the weighted
+# engine should stay flat while the expanded list grows with total hires.
+import time
+import numpy as np
+from app.services.weighted_stats import WeightedStats
+
+N_RECORDS = 150
+REPEATS = 20
+
+def expanded_stats(salaries, hires):
+    sal_list = []
+    for s, h in zip(salaries, hires):
+        if h > 0: sal_list.extend([s] * h)
+    sal_list.sort()
+    n = len(sal_list)
+    median = sal_list[n//2] if n % 2 == 1 else (sal_list[n//2 - 1] + sal_list[n//2]) / 2
+    return sum(sal_list) / n, median, sal_list[-1]
+
+def weighted_stats(salaries, hires):
+    ws = WeightedStats(salaries, hires)
+    return ws.mean, ws.median, ws.max
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000, result
+
+def main():
+    rng = np.random.default_rng(42)
+    salaries = np.round(rng.uniform(3.5, 45.0, N_RECORDS), 2).tolist()
+    print(f"{N_RECORDS} records, {REPEATS} repeats")
+    print(f"{'max hires/record':>17} {'total hires':>12} {'expanded ms':>12} {'weighted ms':>12}")
+    for max_hires in (10, 100, 1000, 5000):
+        hires = rng.integers(0, max_hires + 1, N_RECORDS).tolist()
+        t_old, old = timed(expanded_stats, salaries, hires)
+        t_new, new = timed(weighted_stats, salaries, hires)
+        assert np.allclose(old, new), (old, new)
+        print(f"{max_hires:>17} {sum(hires):>12} {t_old:>12.3f} {t_new:>12.3f}")
+
+if __name__ == "__main__":
+    main()
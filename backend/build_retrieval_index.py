@@ -0,0 +1,47 @@
+"""
+Build the chat retrieval index offline.
+Reads placement_records, interview_experience and company_feedback, writes a new
+BM25 index version (plus embedding vectors when RETRIEVAL_EMBEDDING_MODEL is set)
+under RETRIEVAL_INDEX_DIR and points CURRENT at it. Workers pick it up on restart;
+posts made since then are folded in and dropped from delta.jsonl.
+"""
+import json
+import os
+import sys
+from pymongo import MongoClient
+from dotenv import load_dotenv
+from app.core.config import settings
+from app.services.placement_stats import STATS_COLLECTION, META_ID
+from app.services.retrieval_index import build_index, load_embedder, placement_doc, experience_doc, feedback_doc
+
+def build():
+    load_dotenv()
+    mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+    try:
+        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=10000)
+        client.admin.command('ping')
+    except Exception as e:
+        print(f"ERROR: Cannot connect to MongoDB: {e}")
+        sys.exit(1)
+
+    db = client['saarthi_nexus']
+    docs = [placement_doc(r) for r in db['placement_records'].find()]
+    docs += [experience_doc(r) for r in db['interview_experience'].find()]
+    docs += [feedback_doc(r) for r in db['company_feedback'].find()]
+    meta = db[STATS_COLLECTION].find_one({'_id': META_ID}) or {}
+
+    os.makedirs(settings.RETRIEVAL_INDEX_DIR, exist_ok=True)
+    version_dir = build_index(docs, settings.RETRIEVAL_INDEX_DIR, meta.get('version', 0),
+                              load_embedder(settings.RETRIEVAL_EMBEDDING_MODEL))
+    built = {d['id'] for d in docs}
+    delta_path = os.path.join(settings.RETRIEVAL_INDEX_DIR, 'delta.jsonl')
+    if os.path.exists(delta_path):
+        with open(delta_path, encoding='utf-8') as f:
+            pending = [line for line in f if line.strip() and json.loads(line)['id'] not in built]
+        with open(delta_path, 'w', encoding='utf-8') as f:
+            f.writelines(pending)
+    print(f"Indexed {len(docs)} documents into {version_dir}")
+    client.close()
+
+if __name__ == "__main__":
+    build()
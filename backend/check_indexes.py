@@ -0,0 +1,50 @@
+"""
+Check that every hot query is served by an index.
+Creates any missing indexes declared in app/db/indexes.py, then runs explain() on
+each query shape in QUERY_SHAPES and prints the winning plan's stages. Exits with
+status 1 if any plan contains a COLLSCAN, so it can run as a deploy/CI check.
+
+Usage: python check_indexes.py [--no-create]
+"""
+import os
+import sys
+from pymongo import MongoClient
+from dotenv import load_dotenv
+from app.core.config import settings
+from app.db.indexes import INDEXES, QUERY_SHAPES, plan_stages
+
+def check():
+    load_dotenv()
+    mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+    try:
+        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=10000)
+        client.admin.command('ping')
+    except Exception as e:
+        print(f"ERROR: Cannot connect to MongoDB: {e}")
+        sys.exit(1)
+
+    db = client[settings.DATABASE_NAME]
+    if '--no-create' not in sys.argv:
+        for collection, models in INDEXES.items():
+            db[collection].create_indexes(models)
+
+    failures = []
+    for name, collection, query, sort in QUERY_SHAPES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = cursor.explain().get('queryPlanner', {}).get('winningPlan', {})
+        stages = list(plan_stages(plan))
+        status = "COLLSCAN" if 'COLLSCAN' in stages else "ok"
+        if status != "ok":
+            failures.append(name)
+        print(f"{status:>8}  {name} ({collection}): {' <- '.join(stages)}")
+
+    client.close()
+    if failures:
+        print(f"\n{len(failures)} query shape(s) fall back to a collection scan: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\nAll {len(QUERY_SHAPES)} query shapes use an index.")
+
+if __name__ == "__main__":
+    check()
@@ -3,6 +3,8 @@ import pdfplumber
 import pandas as pd
 from pymongo import MongoClient
 import glob
+from app.services.placement_normalize import normalize_record
+from app.services.placement_stats import rebuild_year_snapshots_sync
 
 # -----------------------------
 # CONFIGURATION
@@ -124,7 +126,7 @@ def extract_data_from_pdf(pdf_path, academic_year):
                         
                         # Only add if valid company and stats
                         if doc['company_name']: 
-                            records.append(doc)
+                            records.append(normalize_record(doc))
                             
                     except Exception as e:
                         # print(f"Skipping row in {academic_year} due to error: {e}")
@@ -141,7 +143,8 @@ def main():
     db = client[DATABASE_NAME]
     collection = db[COLLECTION_NAME]
     
-    # 1. Clear Collection
+    # 1. Clear Collection (remember its years so their stats snapshots get rebuilt)
+    touched_years = set(collection.distinct('academic_year'))
     collection.delete_many({})
     print("Cleared existing 'placement_records' collection.")
 
@@ -168,6 +171,7 @@ def main():
                     collection.insert_many(data, ordered=False)
                     print(f"  -> Inserted {len(data)} records for {year}")
                     total_inserted += len(data)
+                    touched_years.add(year)
                 except Exception as e:
                     print(f"  -> Partial insertion error for {year}: {e}")
             else:
@@ -176,6 +180,10 @@ def main():
         except Exception as e:
             print(f"Error processing {filename}: {e}")
 
+    # 3. Rebuild the materialized stats of every touched year
+    version = rebuild_year_snapshots_sync(db, touched_years)
+    print(f"Rebuilt placement stats for {len(touched_years)} years (v{version}).")
+
     print(f"SUCCESS: Extracted and inserted {total_inserted} total records.")
 
 if __name__ == "__main__":
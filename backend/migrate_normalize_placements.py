@@ -0,0 +1,50 @@
+"""
+Normalize existing placement_records in place.
+Rewrites every document that predates the current schema with typed fields
+(float salary, datetime visit date, numeric CGPA + PPO flag, branch list),
+then rebuilds the placement stats so running workers reload. Safe to re-run.
+"""
+import os
+import sys
+from pymongo import MongoClient, ReplaceOne
+from dotenv import load_dotenv
+from app.services.placement_normalize import SCHEMA_VERSION, normalize_record
+from app.services.placement_stats import rebuild_year_snapshots_sync
+
+BATCH_SIZE = 500
+
+def migrate():
+    load_dotenv()
+    mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+    try:
+        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=10000)
+        client.admin.command('ping')
+    except Exception as e:
+        print(f"ERROR: Cannot connect to MongoDB: {e}")
+        sys.exit(1)
+
+    db = client['saarthi_nexus']
+    collection = db['placement_records']
+    stale = {'$or': [{'schema_version': {'$exists': False}}, {'schema_version': {'$lt': SCHEMA_VERSION}}]}
+
+    touched_years = set()
+    ops = []
+    migrated = 0
+    for doc in collection.find(stale):
+        normalized = normalize_record(doc)
+        ops.append(ReplaceOne({'_id': doc['_id']}, normalized))
+        touched_years.update([doc.get('academic_year'), normalized['academic_year']])
+        if len(ops) >= BATCH_SIZE:
+            migrated += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        migrated += collection.bulk_write(ops, ordered=False).modified_count
+
+    print(f"Normalized {migrated} placement records.")
+    if touched_years:
+        version = rebuild_year_snapshots_sync(db, touched_years)
+        print(f"Rebuilt placement stats for {len(touched_years - {None})} years (v{version}).")
+    client.close()
+
+if __name__ == "__main__":
+    migrate()
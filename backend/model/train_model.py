@@ -1,91 +1,179 @@
-import pandas as pd
+"""
+Train the placement model and publish it to the model registry.
+
+    python model/train_model.py                          # 5000 synthetic students
+    python model/train_model.py --samples 500000         # larger synthetic run
+    python model/train_model.py --source students        # labelled records from MongoDB
+
+Prints the time spent in each stage, saves model/placement_model.pkl (the fallback
+MLService loads when the registry is empty) and publishes the model with its metrics
+as the next registry version, which running workers swap to automatically.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
 import numpy as np
+import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
+from sklearn.metrics import accuracy_score, roc_auc_score
 import joblib
-import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.services import model_registry
+from app.services.placement_features import FEATURE_NAMES, STUDENT_FIELDS, student_features, valid_feature_matrix
+
+timings = {}
+
+@contextlib.contextmanager
+def stage(name):
+    print(f"{name}...", flush=True)
+    start = time.perf_counter()
+    yield
+    timings[name] = round(time.perf_counter() - start, 3)
+    print(f"  {name} took {timings[name]:.2f}s")
+
+def label_placement(df, rng):
+    """Placement labels from rules based on the PDF reports, evaluated for all rows at once.
+
+    Report Analysis:
+    - Mass Recruiters (TCS, Accenture): ~6.0-6.5 CGPA, allow 1 backlog
+    - Niche/Dream (Barclays, Deutsche Bank): ~7.0-8.0 CGPA, No backlogs, Good 10th/12th
+    - Super Dream (PhonePe, Goldman Sachs): ~8.5+ CGPA, Internships important
+    """
+    cgpa, tenth, amcat = df['cgpa'].to_numpy(), df['tenth_score'].to_numpy(), df['amcat_score'].to_numpy()
+
+    # Company tiers; a student counts for the highest tier they clear
+    # Super Dream (>12 LPA): PhonePe (8.5), Goldman Sachs (7.5+), Deutsche Bank (8.0)
+    super_dream = (cgpa >= 8.5) & (tenth >= 80) & (df['internships'].to_numpy() >= 1)
+    # Dream (6-12 LPA): Barclays (7.0), Oracle (7.0), Veritas (6.82)
+    dream = ~super_dream & (cgpa >= 7.0) & (tenth >= 70)
+    # Mass Recruiter (<6 LPA): TCS (6.0), Accenture (6.5), Capgemini (6.8)
+    mass = ~super_dream & ~dream & (cgpa >= 6.0) & (amcat >= 60)
+
+    prob = 0.1 + np.select([super_dream, dream, mass], [0.8, 0.6, 0.4], default=0.0)
+    # Skills boost (proxied by projects/internships)
+    prob += df['projects'].to_numpy() * 0.05 + amcat * 0.002
+    # Cap at 0.95 (uncertainty always exists)
+    placed = rng.random(len(df)) < np.minimum(prob, 0.95)
+    # Eligibility gate: most companies reject > 1 active backlog
+    placed &= df['backlogs'].to_numpy() <= 1
+    return placed.astype(np.int64)
 
 # Create dummy data for placement prediction
-def create_dummy_data(n_samples=5000):
-    np.random.seed(42)
-    
+def create_dummy_data(n_samples=5000, seed=42):
+    rng = np.random.default_rng(seed)
+
     # Generate realistic student profiles
-    data = {
-        'cgpa': np.random.normal(7.5, 1.2, n_samples).clip(5.0, 10.0),
-        'tenth_score': np.random.normal(80, 10, n_samples).clip(50, 99),
-        'twelfth_score': np.random.normal(78, 10, n_samples).clip(50, 99),
-        'amcat_score': np.random.normal(70, 15, n_samples).clip(30, 99),
-        'internships': np.random.choice([0, 1, 2, 3], p=[0.4, 0.3, 0.2, 0.1], size=n_samples),
-        'backlogs': np.random.choice([0, 1, 2], p=[0.7, 0.2, 0.1], size=n_samples),
-        'projects': np.random.randint(0, 5, n_samples)
-    }
-    
-    df = pd.DataFrame(data)
-    
-    # Define Placement Rules based on PDF Reports
-    # Report Analysis:
-    # - Mass Recruiters (TCS, Accenture): ~6.0-6.5 CGPA, allow 1 backlog
-    # - Niche/Dream (Barclays, Deutsche Bank): ~7.0-8.0 CGPA, No backlogs, Good 10th/12th
-    # - Super Dream (PhonePe, Goldman Sachs): ~8.5+ CGPA, Internships important
-    
-    def determine_placement(row):
-        # Base probability
-        prob = 0.1
-        
-        # 1. Eligibility Gates (The "Cutoffs")
-        if row['backlogs'] > 1:
-            return 0 # Most companies reject > 1 active backlog
-            
-        # 2. Company Tier Logic
-        
-        # Super Dream Criteria (>12 LPA)
-        # Companies: PhonePe (8.5), Goldman Sachs (7.5+), Deutsche Bank (8.0)
-        if row['cgpa'] >= 8.5 and row['tenth_score'] >= 80 and row['internships'] >= 1:
-            prob += 0.8
-            
-        # Dream Criteria (6-12 LPA)
-        # Companies: Barclays (7.0), Oracle (7.0), Veritas (6.82)
-        elif row['cgpa'] >= 7.0 and row['tenth_score'] >= 70:
-            prob += 0.6
-            
-        # Mass Recruiter Criteria (<6 LPA)
-        # Companies: TCS (6.0), Accenture (6.5), Capgemini (6.8)
-        elif row['cgpa'] >= 6.0 and row['amcat_score'] >= 60:
-            prob += 0.4
-            
-        # 3. skills boost (Proxied by projects/internships)
-        prob += (row['projects'] * 0.05)
-        prob += (row['amcat_score'] * 0.002)
-        
-        # Cap at 0.95 (uncertainty always exists)
-        return 1 if np.random.random() < min(prob, 0.95) else 0
-
-    df['placed'] = df.apply(determine_placement, axis=1)
-    
+    df = pd.DataFrame({
+        'cgpa': rng.normal(7.5, 1.2, n_samples).clip(5.0, 10.0),
+        'tenth_score': rng.normal(80, 10, n_samples).clip(50, 99),
+        'twelfth_score': rng.normal(78, 10, n_samples).clip(50, 99),
+        'amcat_score': rng.normal(70, 15, n_samples).clip(30, 99),
+        'internships': rng.choice([0, 1, 2, 3], p=[0.4, 0.3, 0.2, 0.1], size=n_samples),
+        'backlogs': rng.choice([0, 1, 2], p=[0.7, 0.2, 0.1], size=n_samples),
+        'projects': rng.integers(0, 5, n_samples)
+    })
+    df['placed'] = label_placement(df, rng)
     return df
 
-def train_model():
-    print("Generaring synthetic training data...")
-    df = create_dummy_data()
-    
-    X = df.drop('placed', axis=1)
+def load_student_records(label_field='placed', chunk_size=10000):
+    """Streams labelled students from MongoDB in cursor batches of `chunk_size`.
+
+    Only students with a numeric CGPA and a 0/1 `label_field` are used; profile
+    fields that are missing count as 0, as they do at prediction time.
+    """
+    from pymongo import MongoClient
+    from dotenv import load_dotenv
+    load_dotenv()
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/'), serverSelectionTimeoutMS=10000)
+    query = {label_field: {'$in': [0, 1, True, False]}, 'college_cgpa': {'$type': 'number'}}
+    projection = {'_id': 0, label_field: 1, **{field: 1 for field in STUDENT_FIELDS.values()}}
+    cursor = client['saarthi_nexus']['students'].find(query, projection).batch_size(chunk_size)
+
+    features, labels, skipped = [], [], 0
+    chunk = []
+    def flush():
+        nonlocal skipped
+        X, keep = valid_feature_matrix([student_features(doc) for doc in chunk])
+        skipped += int((~keep).sum())
+        features.append(X)
+        labels.append(np.array([int(doc[label_field]) for doc in chunk], dtype=np.int64)[keep])
+        chunk.clear()
+
+    for doc in cursor:
+        chunk.append(doc)
+        if len(chunk) >= chunk_size: flush()
+    if chunk: flush()
+    client.close()
+    if skipped:
+        print(f"  skipped {skipped} students with non-numeric profile fields")
+    if not features:
+        return pd.DataFrame(columns=FEATURE_NAMES + ['placed'])
+    df = pd.DataFrame(np.vstack(features), columns=FEATURE_NAMES)
+    df['placed'] = np.concatenate(labels)
+    return df
+
+def train_model(source='synthetic', samples=5000, n_estimators=100, n_jobs=-1,
+                chunk_size=10000, label_field='placed', publish=True):
+    with stage("load data"):
+        if source == 'students':
+            df = load_student_records(label_field, chunk_size)
+        else:
+            df = create_dummy_data(samples)
+    print(f"  {len(df)} rows, {df['placed'].mean() if len(df) else 0:.1%} placed")
+    if len(df) < 10 or df['placed'].nunique() < 2:
+        print("ERROR: Need at least 10 rows covering both placed and not placed students")
+        sys.exit(1)
+
+    X = df[FEATURE_NAMES]
     y = df['placed']
-    
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    print("Training Random Forest Classifier...")
-    clf = RandomForestClassifier(n_estimators=100, random_state=42)
-    clf.fit(X_train, y_train)
-    
-    y_pred = clf.predict(X_test)
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"Model Accuracy: {accuracy:.2f}")
-    
-    # Save the model
-    model_path = os.path.join(os.path.dirname(__file__), 'placement_model.pkl')
-    joblib.dump(clf, model_path)
+
+    with stage("train"):
+        clf = RandomForestClassifier(n_estimators=n_estimators, random_state=42, n_jobs=n_jobs)
+        clf.fit(X_train, y_train)
+        # Cores are for fitting; serving already runs on the inference worker pool
+        clf.set_params(n_jobs=None)
+
+    with stage("evaluate"):
+        proba = clf.predict_proba(X_test)
+        y_pred = clf.classes_.take(np.argmax(proba, axis=1))
+        metrics = {
+            "accuracy": round(float(accuracy_score(y_test, y_pred)), 4),
+            "roc_auc": round(float(roc_auc_score(y_test, proba[:, list(clf.classes_).index(1)])), 4),
+            "train_rows": len(X_train),
+            "test_rows": len(X_test),
+            "source": source,
+            "n_estimators": n_estimators
+        }
+    print(f"Model Accuracy: {metrics['accuracy']:.2f} (ROC AUC {metrics['roc_auc']:.3f})")
+
+    with stage("save"):
+        model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'placement_model.pkl')
+        joblib.dump(clf, model_path)
+        metrics["timings_seconds"] = dict(timings)
+        manifest = None
+        if publish:
+            manifest = model_registry.publish(clf, FEATURE_NAMES, metrics=metrics, source=f"train_model.py --source {source}")
     print(f"Model saved to {model_path}")
+    if manifest:
+        print(f"Published {manifest['version']} to the model registry")
+    print(json.dumps({"timings_seconds": timings, "metrics": {k: v for k, v in metrics.items() if k != "timings_seconds"}}, indent=2))
+    return clf, metrics
 
 if __name__ == "__main__":
-    train_model()
+    parser = argparse.ArgumentParser(description="Train the placement prediction model.")
+    parser.add_argument('--source', choices=('synthetic', 'students'), default='synthetic')
+    parser.add_argument('--samples', type=int, default=5000, help="synthetic rows to generate")
+    parser.add_argument('--n-estimators', type=int, default=100)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="cores used to fit trees (-1 = all)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="students fetched per cursor batch")
+    parser.add_argument('--label-field', default='placed', help="0/1 placement outcome field on student records")
+    parser.add_argument('--no-publish', action='store_true', help="only write placement_model.pkl")
+    args = parser.parse_args()
+    train_model(args.source, args.samples, args.n_estimators, args.n_jobs,
+                args.chunk_size, args.label_field, not args.no_publish)
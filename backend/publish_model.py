@@ -0,0 +1,31 @@
+"""
+Publish a trained placement model to the model registry.
+Copies the estimator (uncompressed, so workers can memory-map it), its compiled
+flat-array forest and a manifest into the next version under ML_REGISTRY_DIR and
+points CURRENT at it. Running workers swap to it within ML_MODEL_CHECK_SECONDS,
+or immediately via POST /api/admin/models/reload.
+
+Usage: python publish_model.py [model/placement_model.pkl] [--no-activate]
+"""
+import json
+import os
+import sys
+import joblib
+from app.core.config import settings
+from app.services import model_registry
+from app.services.placement_features import FEATURE_NAMES
+
+def publish(path, make_active=True):
+    if not os.path.exists(path):
+        print(f"ERROR: {path} not found")
+        sys.exit(1)
+    model = joblib.load(path)
+    manifest = model_registry.publish(model, FEATURE_NAMES, source=os.path.abspath(path), make_active=make_active)
+    print(json.dumps(manifest, indent=2))
+    state = "active" if make_active else "inactive"
+    print(f"Published {manifest['version']} ({state}) to {settings.ML_REGISTRY_DIR}")
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    default = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model', 'placement_model.pkl')
+    publish(args[0] if args else default, make_active='--no-activate' not in sys.argv)
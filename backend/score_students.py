@@ -0,0 +1,34 @@
+"""
+Score every registered student with the active placement model.
+Streams students from MongoDB in batches of COHORT_SCORING_BATCH_SIZE, scores each
+batch in one pass and writes probability, prediction, model_version and scored_at
+to students.placement_score. The admin at-risk list (GET /api/admin/predictions)
+reads those fields. Meant to run nightly, e.g. from cron:
+
+    0 2 * * * cd /path/to/backend && python score_students.py
+"""
+import asyncio
+import json
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from app.services.cohort_scoring import cohort_scorer
+
+async def main():
+    client = AsyncIOMotorClient(settings.MONGODB_URL, serverSelectionTimeoutMS=10000)
+    try:
+        await client.admin.command('ping')
+    except Exception as e:
+        print(f"ERROR: Cannot connect to MongoDB: {e}")
+        sys.exit(1)
+    try:
+        stats = await cohort_scorer.run(client[settings.DATABASE_NAME])
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    finally:
+        client.close()
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
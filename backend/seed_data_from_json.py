@@ -3,6 +3,8 @@ import json
 import glob
 from pymongo import MongoClient
 from dotenv import load_dotenv
+from app.services.placement_normalize import normalize_record
+from app.services.placement_stats import rebuild_year_snapshots_sync
 
 def seed_data():
     try:
@@ -13,7 +15,8 @@ def seed_data():
         db = client['saarthi_nexus']
         collection = db['placement_records']
         
-        # Clear existing collection
+        # Clear existing collection (its years need their stats snapshot rebuilt too)
+        touched_years = set(collection.distinct('academic_year'))
         collection.delete_many({})
         print("Cleared 'placement_records' collection.")
         
@@ -34,11 +37,16 @@ def seed_data():
                 data = json.load(f)
                 
             if isinstance(data, list) and len(data) > 0:
+                # Store typed fields so the API never re-parses strings on read
+                data = [normalize_record(r) for r in data]
                 # Add unique ID if not present or just let MongoDB handle it
                 collection.insert_many(data)
                 print(f"Inserted {len(data)} records from {os.path.basename(file_path)}")
                 total_records += len(data)
+                touched_years.update(r.get('academic_year') for r in data)
         
+        version = rebuild_year_snapshots_sync(db, touched_years)
+        print(f"Rebuilt placement stats for {len(touched_years)} years (v{version}).")
         print(f"SUCCESS: Seeded {total_records} total records into MongoDB.")
         
     except Exception as e:
@@ -11,6 +11,7 @@ const Chatbot = () => {
     ]);
     const [input, setInput] = useState('');
     const [loading, setLoading] = useState(false);
+    const chatUser = JSON.parse(localStorage.getItem('user') || '{}');
     const messagesEndRef = useRef(null);
 
     const scrollToBottom = () => {
@@ -33,9 +34,16 @@ const Chatbot = () => {
             const response = await fetch(`${API_URL}/api/chat`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ query: userMsg })
+                // The backend queues chats fairly per user, so tell it who is asking
+                body: JSON.stringify({ query: userMsg, user: chatUser.email || chatUser.idNumber })
             });
 
+            if (response.status === 429 || response.status === 503) {
+                const retryAfter = response.headers.get('Retry-After');
+                setMessages(prev => [...prev, { type: 'bot', text: `Saarthi is answering a lot of questions right now. Please try again${retryAfter ? ` in ${retryAfter} seconds` : ' shortly'}.` }]);
+                setLoading(false);
+                return;
+            }
             if (!response.body) throw new Error('No response body');
 
             // Add placeholder for bot message
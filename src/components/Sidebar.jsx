@@ -14,6 +14,7 @@ import {
   Bell,
   X
 } from 'lucide-react';
+import { endSession } from '../config';
 import './Sidebar.css';
 
 const Sidebar = ({ isOpen, onClose }) => {
@@ -72,8 +73,7 @@ const Sidebar = ({ isOpen, onClose }) => {
         <button
           className="nav-item logout-btn"
           onClick={() => {
-            localStorage.removeItem('user');
-            localStorage.removeItem('isAuthenticated');
+            endSession();
             navigate('/login');
           }}
           style={{ marginTop: '1rem', width: '100%', justifyContent: 'flex-start', color: '#ef4444', background: 'transparent', border: 'none', cursor: 'pointer', padding: '0.75rem 1rem' }}
@@ -1,6 +1,7 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
 import { User, LogOut, Settings, Shield, ChevronDown } from 'lucide-react';
+import { endSession } from '../config';
 import '../styles/Topbar.css';
 
 const Topbar = () => {
@@ -21,8 +22,7 @@ const Topbar = () => {
     }, []);
 
     const handleLogout = () => {
-        localStorage.removeItem('user');
-        localStorage.removeItem('isAuthenticated');
+        endSession();
         navigate('/login');
     };
 
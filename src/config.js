@@ -14,3 +14,19 @@ const getApiUrl = () => {
 };
 
 export const API_URL = getApiUrl();
+
+// Bearer token issued by /api/login; protected endpoints (/api/profile, /api/admin/*) require it
+export const authHeaders = (headers = {}) => {
+    const token = localStorage.getItem('token');
+    return token ? { ...headers, Authorization: `Bearer ${token}` } : headers;
+};
+
+// Revokes the token server-side (best effort) and forgets the session locally
+export const endSession = () => {
+    if (localStorage.getItem('token')) {
+        fetch(`${API_URL}/api/logout`, { method: 'POST', headers: authHeaders(), keepalive: true }).catch(() => {});
+    }
+    localStorage.removeItem('token');
+    localStorage.removeItem('user');
+    localStorage.removeItem('isAuthenticated');
+};
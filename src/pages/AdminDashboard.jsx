@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useMemo } from 'react';
+import React, { useState, useEffect } from 'react';
 import {
     Users,
     ShieldCheck,
@@ -35,7 +35,7 @@ import {
 } from 'chart.js';
 import { Line, Bar, Pie } from 'react-chartjs-2';
 import '../styles/AdminDashboard.css';
-import { API_URL } from '../config';
+import { API_URL, authHeaders, endSession } from '../config';
 
 ChartJS.register(
     CategoryScale,
@@ -49,6 +49,8 @@ ChartJS.register(
     Legend
 );
 
+const STUDENT_PAGE_SIZE = 50;
+
 const AdminDashboard = () => {
     const [activeTab, setActiveTab] = useState('overview');
     const [yearlyData, setYearlyData] = useState(null);
@@ -90,7 +92,7 @@ const AdminDashboard = () => {
     const [existingFeedbacks, setExistingFeedbacks] = useState([]);
     const [editingFeedbackId, setEditingFeedbackId] = useState(null);
 
-    // Recent registrations state
+    // Recent registrations state (newest students, for the overview)
     const [recentUsers, setRecentUsers] = useState([]);
     const [sidebarOpen, setSidebarOpen] = useState(false);
     const [broadcastedNotifications, setBroadcastedNotifications] = useState([]);
@@ -101,29 +103,52 @@ const AdminDashboard = () => {
     const [studentSortDir, setStudentSortDir] = useState('desc');
     const [selectedStudent, setSelectedStudent] = useState(null);
     const [studentSearch, setStudentSearch] = useState('');
+    const [studentDept, setStudentDept] = useState('');
+    const [studentMinCgpa, setStudentMinCgpa] = useState('');
+    const [students, setStudents] = useState([]);
+    const [studentCursor, setStudentCursor] = useState(null);
+    const [studentTotal, setStudentTotal] = useState(0);
+    const [studentsLoading, setStudentsLoading] = useState(false);
+
+    // Student records are filtered, sorted and paged by the server; pass a cursor to append the next page
+    const fetchStudentPage = async (cursor = null) => {
+        const params = new URLSearchParams({
+            limit: STUDENT_PAGE_SIZE,
+            sort: studentSortKey || 'created_at',
+            order: studentSortDir
+        });
+        if (studentSearch.trim()) params.set('q', studentSearch.trim());
+        if (studentDept) params.set('dept', studentDept);
+        if (studentMinCgpa !== '') params.set('min_cgpa', studentMinCgpa);
+        if (cursor) params.set('cursor', cursor);
 
-    // Sorted & filtered students
-    const sortedStudents = useMemo(() => {
-        let list = [...recentUsers];
-        // Filter by search
-        if (studentSearch.trim()) {
-            const q = studentSearch.toLowerCase();
-            list = list.filter(s =>
-                (s.name || '').toLowerCase().includes(q) ||
-                (s.email || '').toLowerCase().includes(q) ||
-                (s.dept || '').toLowerCase().includes(q)
-            );
-        }
-        // Sort
-        if (studentSortKey) {
-            list.sort((a, b) => {
-                const aVal = parseFloat(a[studentSortKey]) || 0;
-                const bVal = parseFloat(b[studentSortKey]) || 0;
-                return studentSortDir === 'asc' ? aVal - bVal : bVal - aVal;
-            });
+        setStudentsLoading(true);
+        try {
+            const response = await fetch(`${API_URL}/api/admin/students?${params}`, { headers: authHeaders() });
+            if (response.status === 401) {
+                endSession();
+                window.location.href = '/#/login/admin';
+                return;
+            }
+            if (response.ok) {
+                const data = await response.json();
+                setStudents(prev => cursor ? [...prev, ...data.students] : data.students);
+                setStudentCursor(data.next_cursor);
+                if (data.total !== null) setStudentTotal(data.total);
+            }
+        } catch (err) {
+            console.error('Failed to fetch students', err);
+        } finally {
+            setStudentsLoading(false);
         }
-        return list;
-    }, [recentUsers, studentSortKey, studentSortDir, studentSearch]);
+    };
+
+    // Reload from the first page whenever a filter or the sort changes (debounced while typing)
+    useEffect(() => {
+        if (activeTab !== 'students') return;
+        const timer = setTimeout(() => fetchStudentPage(), 300);
+        return () => clearTimeout(timer);
+    }, [activeTab, studentSortKey, studentSortDir, studentSearch, studentDept, studentMinCgpa]);
 
     const handleStudentSort = (key) => {
         if (studentSortKey === key) {
@@ -163,8 +188,13 @@ const AdminDashboard = () => {
 
         const fetchStudents = async () => {
             try {
-                const response = await fetch(`${API_URL}/api/admin/students`);
-                if (response.ok) { setRecentUsers(await response.json()); }
+                const response = await fetch(`${API_URL}/api/admin/students?limit=10`, { headers: authHeaders() });
+                if (response.ok) { setRecentUsers((await response.json()).students); }
+                else if (response.status === 401) {
+                    // Token expired or revoked: sign in again
+                    endSession();
+                    window.location.href = '/#/login/admin';
+                }
             } catch (err) { console.error('Failed to fetch students', err); }
         };
 
@@ -358,7 +388,7 @@ const AdminDashboard = () => {
         try {
             const response = await fetch(`${API_URL}/api/admin/broadcast`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: authHeaders({ 'Content-Type': 'application/json' }),
                 body: JSON.stringify({
                     message,
                     adminName: user.fullName || 'TNP Admin'
@@ -383,7 +413,8 @@ const AdminDashboard = () => {
         if (!window.confirm('Are you sure you want to delete this notification?')) return;
         try {
             const response = await fetch(`${API_URL}/api/notifications/${id}`, {
-                method: 'DELETE'
+                method: 'DELETE',
+                headers: authHeaders()
             });
             if (response.ok) {
                 setBroadcastedNotifications(broadcastedNotifications.filter(n => n._id !== id));
@@ -402,7 +433,7 @@ const AdminDashboard = () => {
         try {
             const response = await fetch(`${API_URL}/api/notifications/${notif._id}`, {
                 method: 'PUT',
-                headers: { 'Content-Type': 'application/json' },
+                headers: authHeaders({ 'Content-Type': 'application/json' }),
                 body: JSON.stringify({ message: newMessage })
             });
 
@@ -485,6 +516,7 @@ const AdminDashboard = () => {
                     <button
                         className="admin-nav-item logout-red"
                         onClick={() => {
+                            endSession();
                             localStorage.clear();
                             window.location.href = '/#/login/admin';
                         }}
@@ -692,6 +724,7 @@ const AdminDashboard = () => {
                                             <span>Broadcast</span>
                                         </button>
                                         <button className="quick-action-btn logout" onClick={() => {
+                                            endSession();
                                             localStorage.clear();
                                             window.location.href = '/#/login/admin';
                                         }}>
@@ -709,13 +742,37 @@ const AdminDashboard = () => {
                         <div className="admin-panel glass">
                             <div className="panel-header">
                                 <h2>Student Records</h2>
-                                <div className="student-search-box">
-                                    <Search size={16} />
+                                <div style={{ display: 'flex', gap: '0.75rem', alignItems: 'center', flexWrap: 'wrap' }}>
+                                    <div className="student-search-box">
+                                        <Search size={16} />
+                                        <input
+                                            type="text"
+                                            placeholder="Name or email starts with..."
+                                            value={studentSearch}
+                                            onChange={(e) => setStudentSearch(e.target.value)}
+                                        />
+                                    </div>
+                                    <select
+                                        value={studentDept}
+                                        onChange={(e) => setStudentDept(e.target.value)}
+                                        style={{ color: 'inherit', background: 'transparent' }}
+                                    >
+                                        <option style={{ color: '#333' }} value="">All Departments</option>
+                                        <option style={{ color: '#333' }} value="CE">CE</option>
+                                        <option style={{ color: '#333' }} value="IT">IT</option>
+                                        <option style={{ color: '#333' }} value="AI&DS">AI&DS</option>
+                                        <option style={{ color: '#333' }} value="E&CE(Electronics & Computer Engineering)">E&CE</option>
+                                        <option style={{ color: '#333' }} value="E&TC">E&TC</option>
+                                    </select>
                                     <input
-                                        type="text"
-                                        placeholder="Search by name, email, or department..."
-                                        value={studentSearch}
-                                        onChange={(e) => setStudentSearch(e.target.value)}
+                                        type="number"
+                                        min="0"
+                                        max="10"
+                                        step="0.1"
+                                        placeholder="Min CGPA"
+                                        value={studentMinCgpa}
+                                        onChange={(e) => setStudentMinCgpa(e.target.value)}
+                                        style={{ width: '6.5rem', color: 'inherit', background: 'transparent' }}
                                     />
                                 </div>
                             </div>
@@ -725,7 +782,9 @@ const AdminDashboard = () => {
                                         <thead>
                                             <tr>
                                                 <th>#</th>
-                                                <th>Name</th>
+                                                <th className="sortable-th" onClick={() => handleStudentSort('name')}>
+                                                    Name <SortIcon colKey="name" />
+                                                </th>
                                                 <th>Email</th>
                                                 <th>Department</th>
                                                 <th className="sortable-th" onClick={() => handleStudentSort('tenth_percentage')}>
@@ -744,7 +803,7 @@ const AdminDashboard = () => {
                                             </tr>
                                         </thead>
                                         <tbody>
-                                            {sortedStudents.length > 0 ? sortedStudents.map((s, i) => (
+                                            {students.length > 0 ? students.map((s, i) => (
                                                 <tr key={s.id || i}>
                                                     <td>{i + 1}</td>
                                                     <td>
@@ -774,7 +833,7 @@ const AdminDashboard = () => {
                                             )) : (
                                                 <tr>
                                                     <td colSpan="9" style={{ textAlign: 'center', opacity: 0.5, padding: '2rem' }}>
-                                                        {studentSearch ? 'No students match your search.' : 'No students found.'}
+                                                        {studentsLoading ? 'Loading students...' : (studentSearch || studentDept || studentMinCgpa) ? 'No students match your filters.' : 'No students found.'}
                                                     </td>
                                                 </tr>
                                             )}
@@ -782,7 +841,12 @@ const AdminDashboard = () => {
                                     </table>
                                 </div>
                                 <div className="student-count-footer">
-                                    Showing {sortedStudents.length} of {recentUsers.length} students
+                                    Showing {students.length} of {studentTotal} students
+                                    {studentCursor && (
+                                        <button className="clear-sort-btn" disabled={studentsLoading} onClick={() => fetchStudentPage(studentCursor)}>
+                                            {studentsLoading ? 'Loading...' : 'Load More'}
+                                        </button>
+                                    )}
                                     {studentSortKey && (
                                         <button className="clear-sort-btn" onClick={() => { setStudentSortKey(''); setStudentSortDir('desc'); }}>
                                             Clear Sort
@@ -50,6 +50,7 @@ const AdminLogin = () => {
             const data = await response.json();
 
             if (response.ok) {
+                localStorage.setItem('token', data.token);
                 localStorage.setItem('user', JSON.stringify(data.user));
                 localStorage.setItem('isAuthenticated', 'true');
 
@@ -200,7 +200,7 @@ const CompanyRecords = () => {
                                                         </p>
                                                     )}
                                                     <p className="criteria-text" style={{ marginBottom: '0.8rem' }}>
-                                                        <strong>Criteria:</strong> {h.criteria.min_cgpa} CGPA {h.criteria.eligible_branches ? `(${h.criteria.eligible_branches})` : ''}
+                                                        <strong>Criteria:</strong> {h.criteria.ppo ? 'PPO' : (h.criteria.min_cgpa != null ? `${h.criteria.min_cgpa} CGPA` : 'No CGPA cutoff')} {h.criteria.eligible_branches?.length ? `(${h.criteria.eligible_branches.join(', ')})` : ''}
                                                     </p>
                                                     <div className="details-grid" style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fit, minmax(140px, 1fr))', gap: '1rem' }}>
                                                         <div className="gender-stats">
@@ -8,6 +8,7 @@ const Help = () => {
         { type: 'bot', text: 'Hello! I am SAARTHI AI. Ask me anything about placements, companies, or skills.' }
     ]);
     const [isTyping, setIsTyping] = useState(false);
+    const chatUser = JSON.parse(localStorage.getItem('user') || '{}');
 
     const predefinedQuestions = [
         "Which companies require DSA?",
@@ -28,9 +29,16 @@ const Help = () => {
             const response = await fetch('http://127.0.0.1:5000/api/chat', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ query: text })
+                // The backend queues chats fairly per user, so tell it who is asking
+                body: JSON.stringify({ query: text, user: chatUser.email || chatUser.idNumber })
             });
 
+            if (response.status === 429 || response.status === 503) {
+                const retryAfter = response.headers.get('Retry-After');
+                setHistory(prev => [...prev, { type: 'bot', text: `Saarthi is answering a lot of questions right now. Please try again${retryAfter ? ` in ${retryAfter} seconds` : ' shortly'}.` }]);
+                setIsTyping(false);
+                return;
+            }
             if (!response.body) throw new Error('No response body');
 
             // Add placeholder for bot message
@@ -51,6 +51,7 @@ const Login = () => {
 
             if (response.ok) {
                 // Store user session
+                localStorage.setItem('token', data.token);
                 localStorage.setItem('user', JSON.stringify(data.user));
                 localStorage.setItem('isAuthenticated', 'true');
 
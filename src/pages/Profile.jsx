@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { User, Lock, Mail, Hash, BookOpen, AlertCircle, CheckCircle2, LogOut, GraduationCap, Save } from 'lucide-react';
-import { API_URL } from '../config';
+import { API_URL, authHeaders, endSession } from '../config';
 import '../styles/Profile.css';
 
 const Profile = () => {
@@ -30,7 +30,13 @@ const Profile = () => {
                 return;
             }
             try {
-                const res = await fetch(`${API_URL}/api/profile?email=${encodeURIComponent(user.email)}`);
+                const res = await fetch(`${API_URL}/api/profile`, { headers: authHeaders() });
+                if (res.status === 401) {
+                    // Token expired or revoked: sign in again
+                    endSession();
+                    navigate('/login');
+                    return;
+                }
                 const data = await res.json();
                 if (res.ok) {
                     setTenthPercentage(data.tenth_percentage ?? '');
@@ -48,6 +54,7 @@ const Profile = () => {
     }, []);
 
     const handleLogout = () => {
+        endSession();
         localStorage.clear();
         navigate('/login');
     };
@@ -77,6 +84,8 @@ const Profile = () => {
             const data = await response.json();
 
             if (response.ok) {
+                // Older sessions are signed out; keep this one going with the new token
+                if (data.token) localStorage.setItem('token', data.token);
                 setMessage({ type: 'success', text: 'Password updated successfully!' });
                 setCurrentPassword('');
                 setNewPassword('');
@@ -120,7 +129,7 @@ const Profile = () => {
         try {
             const response = await fetch(`${API_URL}/api/profile`, {
                 method: 'PUT',
-                headers: { 'Content-Type': 'application/json' },
+                headers: authHeaders({ 'Content-Type': 'application/json' }),
                 body: JSON.stringify({
                     email: user.email,
                     tenth_percentage: tenthPercentage,